@@ -0,0 +1,131 @@
+"""
+阻塞调用卸载工具
+
+路由处理函数中的 pymongo / redis 等同步客户端调用会阻塞事件循环，
+这里提供一个有界线程池，将阻塞调用移出事件循环，并为每个路由设置超时。
+
+【使用方式】
+@router.get("/statistics")
+@offload_blocking(timeout=10)
+def get_statistics(...):
+    ...  # 函数体保持同步写法，在线程池中执行
+
+result = await run_blocking(manager.query, arg1, timeout=5)
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger("api_blocking")
+
+# 未显式指定超时时使用配置中的默认值；传入 None 表示不限时
+_DEFAULT_TIMEOUT = object()
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_POOL_MAX_WORKERS,
+    thread_name_prefix="api-blocking"
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "in_flight": 0,
+    "completed": 0,
+    "failed": 0,
+    "timed_out": 0,
+}
+
+
+def _run_tracked(func: Callable, *args, **kwargs):
+    """在线程池中执行并维护计数"""
+    with _stats_lock:
+        _stats["in_flight"] += 1
+    try:
+        result = func(*args, **kwargs)
+    except BaseException:
+        with _stats_lock:
+            _stats["failed"] += 1
+        raise
+    else:
+        with _stats_lock:
+            _stats["completed"] += 1
+        return result
+    finally:
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+
+
+async def run_blocking(func: Callable, *args, timeout: Any = _DEFAULT_TIMEOUT, **kwargs):
+    """
+    在有界线程池中执行阻塞调用
+
+    Args:
+        func: 阻塞函数
+        *args, **kwargs: 传给 func 的参数
+        timeout: 超时秒数，默认使用 BLOCKING_CALL_TIMEOUT_SECONDS，None 表示不限时
+
+    Returns:
+        func 的返回值
+
+    Raises:
+        HTTPException(504): 超时。线程中的调用无法被强制终止，会在后台继续完成
+    """
+    if timeout is _DEFAULT_TIMEOUT:
+        timeout = settings.BLOCKING_CALL_TIMEOUT_SECONDS
+
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, _run_tracked, func, *args, **kwargs)
+    future = loop.run_in_executor(_executor, call)
+
+    if not timeout:
+        return await future
+
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        with _stats_lock:
+            _stats["timed_out"] += 1
+        name = getattr(func, "__qualname__", repr(func))
+        logger.warning(f"⏱️ 阻塞调用超时: {name}，超时时间 {timeout}秒")
+        raise HTTPException(status_code=504, detail=f"请求处理超时（{timeout}秒），请稍后重试")
+
+
+def offload_blocking(timeout: Any = _DEFAULT_TIMEOUT):
+    """
+    路由装饰器：将同步路由函数放到有界线程池中执行
+
+    保留原函数签名（FastAPI 通过 __wrapped__ 解析参数），
+    放在 @router.get/post 等装饰器之下使用。
+
+    Args:
+        timeout: 该路由的超时秒数，默认使用 BLOCKING_CALL_TIMEOUT_SECONDS，None 表示不限时
+    """
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run_blocking(func, *args, timeout=timeout, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_blocking_pool_stats() -> Dict[str, Any]:
+    """获取线程池运行统计"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["max_workers"] = settings.BLOCKING_POOL_MAX_WORKERS
+    stats["default_timeout_seconds"] = settings.BLOCKING_CALL_TIMEOUT_SECONDS
+    return stats
+
+
+def shutdown_blocking_pool():
+    """关闭线程池（应用退出时调用）"""
+    _executor.shutdown(wait=False, cancel_futures=True)
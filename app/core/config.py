@@ -140,6 +140,13 @@ class Settings(BaseSettings):
     # 监控配置
     METRICS_ENABLED: bool = Field(default=True)
     HEALTH_CHECK_INTERVAL: int = Field(default=60)  # 60秒
+    # 事件循环延迟采样间隔（秒）与告警阈值（毫秒）
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = Field(default=0.5)
+    EVENT_LOOP_LAG_WARN_MS: float = Field(default=200.0)
+
+    # 路由阻塞调用线程池：最大线程数与默认超时（秒）
+    BLOCKING_POOL_MAX_WORKERS: int = Field(default=32)
+    BLOCKING_CALL_TIMEOUT_SECONDS: float = Field(default=30.0)
 
 
     # 配置真相来源（方案A）：file|db|hybrid
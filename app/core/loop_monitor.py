@@ -0,0 +1,106 @@
+"""
+事件循环延迟监控
+
+周期性地让出事件循环并测量实际唤醒时间与预期时间的差值，
+差值即为事件循环被阻塞的时长，用于验证路由中没有残留的阻塞调用。
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger("api_loop_monitor")
+
+
+class EventLoopLagMonitor:
+    """事件循环延迟监控器"""
+
+    # 延迟分布统计的桶上界（毫秒）
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(self, interval: float = 0.5, warn_threshold_ms: float = 200.0):
+        """
+        Args:
+            interval: 采样间隔（秒）
+            warn_threshold_ms: 单次延迟超过该阈值时记录警告
+        """
+        self.interval = interval
+        self.warn_threshold_ms = warn_threshold_ms
+        self._task: Optional[asyncio.Task] = None
+        self._reset()
+
+    def _reset(self):
+        self.samples = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.avg_lag_ms = 0.0
+        self.slow_samples = 0
+        self.histogram = {bucket: 0 for bucket in self.BUCKETS_MS}
+        self.histogram_overflow = 0
+
+    def _record(self, lag_ms: float):
+        self.samples += 1
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        # 指数加权移动平均，反映近期状态
+        self.avg_lag_ms = lag_ms if self.samples == 1 else self.avg_lag_ms * 0.9 + lag_ms * 0.1
+
+        for bucket in self.BUCKETS_MS:
+            if lag_ms <= bucket:
+                self.histogram[bucket] += 1
+                break
+        else:
+            self.histogram_overflow += 1
+
+        if lag_ms >= self.warn_threshold_ms:
+            self.slow_samples += 1
+            logger.warning(f"⚠️ 事件循环阻塞 {lag_ms:.1f}ms（阈值 {self.warn_threshold_ms:.0f}ms）")
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self._record(lag_ms)
+
+    def start(self):
+        """在当前事件循环中启动监控"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"✅ 事件循环延迟监控已启动，采样间隔 {self.interval}秒")
+
+    async def stop(self):
+        """停止监控"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取延迟统计"""
+        histogram = {f"le_{bucket}ms": count for bucket, count in self.histogram.items()}
+        histogram["gt_2500ms"] = self.histogram_overflow
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "avg_lag_ms": round(self.avg_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "slow_samples": self.slow_samples,
+            "warn_threshold_ms": self.warn_threshold_ms,
+            "histogram": histogram,
+        }
+
+
+# 全局实例
+loop_lag_monitor = EventLoopLagMonitor(
+    interval=settings.EVENT_LOOP_LAG_INTERVAL_SECONDS,
+    warn_threshold_ms=settings.EVENT_LOOP_LAG_WARN_MS
+)
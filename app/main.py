@@ -29,6 +29,8 @@ import asyncio
 
 from app.core.config import settings
 from app.core.startup_validator import validate_startup_config
+from app.core.blocking import shutdown_blocking_pool
+from app.core.loop_monitor import loop_lag_monitor
 from app.routers import health, analysis, reports, notifications, websocket, model_usage
 from app.routers import config as config_router
 from app.routers import operation_logs, stock_data, backtest, cache, favorite_stocks, cursor_usage
@@ -67,9 +69,15 @@ async def lifespan(app: FastAPI):
             
             handler.engine.set_broadcast_callback(broadcast_wrapper)
             logging.info("已注册WebSocket广播回调到消息引擎")
+    
+    # 启动事件循环延迟监控
+    if settings.METRICS_ENABLED:
+        loop_lag_monitor.start()
             
     yield
     # Shutdown
+    await loop_lag_monitor.stop()
+    shutdown_blocking_pool()
 
 app = FastAPI(
     title="TradingAgents API",
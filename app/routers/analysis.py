@@ -6,6 +6,7 @@ import datetime
 import asyncio
 import time
 
+from app.core.blocking import offload_blocking
 from tradingagents.tasks import get_task_manager, TaskStatus
 from tradingagents.utils.logging_manager import get_logger
 from tradingagents.storage.mongodb.tasks_state_machine_helper import tasks_state_machine_helper
@@ -61,7 +62,8 @@ class BatchAnalysisResponse(BaseModel):
 
 
 @router.post("/start", response_model=AnalysisResponse)
-async def start_analysis(request: AnalysisRequest):
+@offload_blocking()
+def start_analysis(request: AnalysisRequest):
     task_manager = get_task_manager()
     
     task_params = {
@@ -86,7 +88,8 @@ async def start_analysis(request: AnalysisRequest):
 
 
 @router.post("/start/batch-same-params", response_model=BatchAnalysisResponse)
-async def start_batch_analysis_same_params(request: BatchSameParamsRequest):
+@offload_blocking()
+def start_batch_analysis_same_params(request: BatchSameParamsRequest):
     """批量启动分析任务 - 多个股票代码使用相同的任务参数
     
     为多个股票代码启动分析任务，所有任务使用相同的分析参数。
@@ -139,7 +142,8 @@ async def start_batch_analysis_same_params(request: BatchSameParamsRequest):
 
 
 @router.post("/start/batch", response_model=BatchAnalysisResponse)
-async def start_batch_analysis(requests: List[AnalysisRequest]):
+@offload_blocking()
+def start_batch_analysis(requests: List[AnalysisRequest]):
     """批量启动分析任务 - 每个任务使用独立的参数
     
     为多个分析任务启动，每个任务可以有独立的股票代码和分析参数。
@@ -192,7 +196,8 @@ async def start_batch_analysis(requests: List[AnalysisRequest]):
 
 
 @router.get("/{analysis_id}/status")
-async def get_analysis_status(analysis_id: str):
+@offload_blocking()
+def get_analysis_status(analysis_id: str):
     """获取分析任务状态（统一使用任务状态机）"""
     task_manager = get_task_manager()
     current_state = task_manager.get_task_status(analysis_id)
@@ -203,7 +208,8 @@ async def get_analysis_status(analysis_id: str):
     return current_state
 
 @router.get("/{analysis_id}/result")
-async def get_analysis_result(analysis_id: str):
+@offload_blocking()
+def get_analysis_result(analysis_id: str):
     """获取分析结果（从任务状态机读取）"""
     task_manager = get_task_manager()
     current_state = task_manager.get_task_status(analysis_id)
@@ -220,7 +226,8 @@ async def get_analysis_result(analysis_id: str):
     return current_state.get('result')
 
 @router.post("/{analysis_id}/pause", response_model=AnalysisResponse)
-async def pause_analysis(analysis_id: str):
+@offload_blocking()
+def pause_analysis(analysis_id: str):
     """暂停分析任务"""
     task_manager = get_task_manager()
     
@@ -235,7 +242,8 @@ async def pause_analysis(analysis_id: str):
     }
 
 @router.post("/{analysis_id}/resume", response_model=AnalysisResponse)
-async def resume_analysis(analysis_id: str):
+@offload_blocking()
+def resume_analysis(analysis_id: str):
     """恢复分析任务"""
     task_manager = get_task_manager()
     
@@ -250,7 +258,8 @@ async def resume_analysis(analysis_id: str):
     }
 
 @router.post("/{analysis_id}/stop", response_model=AnalysisResponse)
-async def stop_analysis(analysis_id: str):
+@offload_blocking()
+def stop_analysis(analysis_id: str):
     """停止分析任务"""
     task_manager = get_task_manager()
     
@@ -268,7 +277,8 @@ async def stop_analysis(analysis_id: str):
 
 
 @router.get("/{analysis_id}/current_step")
-async def get_task_current_step(analysis_id: str):
+@offload_blocking()
+def get_task_current_step(analysis_id: str):
     """获取任务当前步骤（从状态机获取）"""
     task_manager = get_task_manager()
     step = task_manager.get_task_current_step(analysis_id)
@@ -280,7 +290,8 @@ async def get_task_current_step(analysis_id: str):
 
 
 @router.get("/{analysis_id}/history")
-async def get_task_history_states(analysis_id: str):
+@offload_blocking()
+def get_task_history_states(analysis_id: str):
     """获取任务历史步骤（从状态机获取）
     
     Args:
@@ -318,7 +329,8 @@ class PlannedStepsResponse(BaseModel):
     steps: List[PlannedStep]
 
 @router.get("/{analysis_id}/planned_steps", response_model=PlannedStepsResponse)
-async def get_planned_steps(analysis_id: str):
+@offload_blocking()
+def get_planned_steps(analysis_id: str):
     """获取任务计划执行的所有步骤"""
     task_manager = get_task_manager()
     task_status = task_manager.get_task_status(analysis_id)
@@ -377,7 +389,8 @@ class TaskDetailResponse(BaseModel):
 
 
 @router.get("/management/count", response_model=TaskCountResponse)
-async def get_task_count(
+@offload_blocking()
+def get_task_count(
     task_id: Optional[str] = Query(None, description="任务ID筛选（支持部分匹配）"),
     analysis_date: Optional[str] = Query(None, description="分析日期筛选（精确匹配）"),
     status: Optional[str] = Query(None, description="运行状态筛选（精确匹配）"),
@@ -422,7 +435,8 @@ async def get_task_count(
 
 
 @router.get("/management/list", response_model=TaskListResponse)
-async def get_task_list(
+@offload_blocking()
+def get_task_list(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页数量"),
     task_id: Optional[str] = Query(None, description="任务ID筛选（支持部分匹配）"),
@@ -510,7 +524,8 @@ async def get_task_list(
 
 
 @router.get("/management/{analysis_id}", response_model=TaskDetailResponse)
-async def get_task_detail(analysis_id: str):
+@offload_blocking()
+def get_task_detail(analysis_id: str):
     """
     根据analysis_id获取任务的详细信息
     
@@ -9,6 +9,8 @@ from typing import Optional, List, Dict
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from app.core.blocking import offload_blocking
+
 from tradingagents.utils.logging_manager import get_logger
 from app.services.backtest_service import backtest_service
 
@@ -54,7 +56,8 @@ class ReportBatchBacktestResponse(BaseModel):
     summary="研报批量回测",
     tags=["backtest"],
 )
-async def start_report_batch_backtest(request: ReportBatchBacktestRequest):
+@offload_blocking(timeout=None)
+def start_report_batch_backtest(request: ReportBatchBacktestRequest):
     """
     启动研报批量回测任务
 
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import time
 
+from app.core.blocking import offload_blocking
 from tradingagents.utils.logging_manager import get_logger
 from tradingagents.storage.redis.connection import REDIS_AVAILABLE
 from tradingagents.storage.redis.cache_manager import redis_cache_manager
@@ -54,7 +55,8 @@ class CacheDetailResponse(BaseModel):
 
 
 @router.get("/count", response_model=CacheCountResponse)
-async def get_cache_count():
+@offload_blocking()
+def get_cache_count():
     """
     获取所有缓存记录的总数
     
@@ -94,7 +96,8 @@ async def get_cache_count():
 
 
 @router.get("/list", response_model=CacheListResponse)
-async def get_cache_list(
+@offload_blocking()
+def get_cache_list(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页数量"),
     task_id: Optional[str] = Query(None, description="任务ID筛选（支持部分匹配）"),
@@ -271,7 +274,8 @@ async def get_cache_list(
 
 
 @router.get("/{analysis_id}", response_model=CacheDetailResponse)
-async def get_cache_detail(analysis_id: str):
+@offload_blocking()
+def get_cache_detail(analysis_id: str):
     """
     根据analysis_id获取缓存记录的详细信息
     
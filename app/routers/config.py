@@ -3,6 +3,8 @@ from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.core.blocking import offload_blocking
+
 from tradingagents.config.config_manager import config_manager
 from tradingagents.utils.logging_manager import get_logger
 
@@ -125,7 +127,8 @@ def _normalize_config_types(config_types: Optional[Any]) -> List[str]:
 
 
 @router.get("/system", response_model=SystemConfigResponse)
-async def get_system_config(
+@offload_blocking()
+def get_system_config(
     config_types: Optional[str] = Query(
         None,
         description="逗号分隔的配置类型，可选值：'models', 'pricing', 'settings'。不传默认只返回 'settings'"
@@ -155,7 +158,8 @@ async def get_system_config(
 
 
 @router.put("/system", response_model=SystemConfigResponse)
-async def update_system_config(request: UpdateSystemConfigRequest):
+@offload_blocking()
+def update_system_config(request: UpdateSystemConfigRequest):
     """
     更新系统配置并持久化
     
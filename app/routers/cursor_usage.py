@@ -7,6 +7,8 @@ from typing import Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from app.core.blocking import offload_blocking
+
 from tradingagents.utils.logging_manager import get_logger
 from tradingagents.storage.toolkits.cursor_usage import CursorUsageAnalyzer
 
@@ -42,7 +44,8 @@ class StatisticsResponse(BaseModel):
 # ==================== API 接口 ====================
 
 @router.get("/dates", response_model=DateListResponse)
-async def get_available_dates(
+@offload_blocking()
+def get_available_dates(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -80,7 +83,8 @@ async def get_available_dates(
 
 
 @router.get("/statistics/total", response_model=StatisticsResponse)
-async def get_total_statistics(
+@offload_blocking()
+def get_total_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -118,7 +122,8 @@ async def get_total_statistics(
 
 
 @router.get("/statistics/daily", response_model=StatisticsResponse)
-async def get_daily_statistics(
+@offload_blocking()
+def get_daily_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -151,7 +156,8 @@ async def get_daily_statistics(
 
 
 @router.get("/statistics/kind", response_model=StatisticsResponse)
-async def get_kind_statistics(
+@offload_blocking()
+def get_kind_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -184,7 +190,8 @@ async def get_kind_statistics(
 
 
 @router.get("/statistics/model", response_model=StatisticsResponse)
-async def get_model_statistics(
+@offload_blocking()
+def get_model_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -217,7 +224,8 @@ async def get_model_statistics(
 
 
 @router.get("/statistics/cost", response_model=StatisticsResponse)
-async def get_cost_statistics(
+@offload_blocking()
+def get_cost_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -253,7 +261,8 @@ async def get_cost_statistics(
 
 
 @router.get("/statistics/hourly", response_model=StatisticsResponse)
-async def get_hourly_statistics(
+@offload_blocking()
+def get_hourly_statistics(
     account_name: Optional[str] = Query(None, description="账户名称"),
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)")
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.core.blocking import offload_blocking
 from tradingagents.utils.logging_manager import get_logger
 from tradingagents.storage.mongodb.favorite_stocks_manager import favorite_stocks_manager
 
@@ -84,7 +85,8 @@ class FavoriteStockBatchCreateResponse(BaseModel):
 # ==================== API接口 ====================
 
 @router.post("", response_model=FavoriteStockResponse)
-async def create_favorite_stock(stock_data: FavoriteStockCreate):
+@offload_blocking()
+def create_favorite_stock(stock_data: FavoriteStockCreate):
     """
     创建自选股记录
     
@@ -156,7 +158,8 @@ async def create_favorite_stock(stock_data: FavoriteStockCreate):
 
 
 @router.get("", response_model=FavoriteStockListResponse)
-async def get_favorite_stocks(
+@offload_blocking()
+def get_favorite_stocks(
     user_id: Optional[str] = Query("guest", description="用户ID，默认'guest'"),
     stock_code: Optional[str] = Query(None, description="股票代码（可选，用于精确查询）"),
     category: Optional[str] = Query(None, description="分类（可选）"),
@@ -231,7 +234,8 @@ async def get_favorite_stocks(
 
 
 @router.get("/{stock_code}", response_model=FavoriteStockResponse)
-async def get_favorite_stock(
+@offload_blocking()
+def get_favorite_stock(
     stock_code: str,
     user_id: Optional[str] = Query("guest", description="用户ID"),
     category: Optional[str] = Query(None, description="分类（可选）")
@@ -275,7 +279,8 @@ async def get_favorite_stock(
 
 
 @router.put("/{stock_code}", response_model=FavoriteStockResponse)
-async def update_favorite_stock(
+@offload_blocking()
+def update_favorite_stock(
     stock_code: str,
     update_data: FavoriteStockUpdate,
     user_id: Optional[str] = Query("guest", description="用户ID"),
@@ -358,7 +363,8 @@ async def update_favorite_stock(
 
 
 @router.delete("/{stock_code}", response_model=FavoriteStockResponse)
-async def delete_favorite_stock(
+@offload_blocking()
+def delete_favorite_stock(
     stock_code: str,
     user_id: Optional[str] = Query("guest", description="用户ID"),
     category: Optional[str] = Query(None, description="分类（可选，用于定位要删除的记录）")
@@ -420,7 +426,8 @@ async def delete_favorite_stock(
 
 
 @router.get("/statistics/summary", response_model=FavoriteStockStatisticsResponse)
-async def get_favorite_stocks_statistics(
+@offload_blocking()
+def get_favorite_stocks_statistics(
     user_id: Optional[str] = Query("guest", description="用户ID")
 ):
     """
@@ -454,7 +461,8 @@ async def get_favorite_stocks_statistics(
 
 
 @router.post("/batch", response_model=FavoriteStockBatchCreateResponse)
-async def batch_create_favorite_stocks(batch_data: FavoriteStockBatchCreateRequest):
+@offload_blocking()
+def batch_create_favorite_stocks(batch_data: FavoriteStockBatchCreateRequest):
     """
     批量创建自选股记录
     
@@ -1,6 +1,13 @@
 from fastapi import APIRouter
 import time
 
+from app.core.blocking import get_blocking_pool_stats
+from app.core.loop_monitor import loop_lag_monitor
+from tradingagents.graph.graph_pool import get_graph_pool
+from tradingagents.utils.http_client import get_http_client_stats
+from tradingagents.utils.rate_limiter import get_rate_limiter_stats
+from tradingagents.utils.single_flight import get_single_flight_stats
+
 router = APIRouter()
 
 def get_version() -> str:
@@ -13,3 +20,34 @@ async def health():
         "version": get_version(),
         "timestamp": int(time.time())
     }
+
+
+@router.get("/health/runtime")
+async def runtime_metrics():
+    """运行时指标：事件循环延迟、阻塞调用线程池状态、数据源限流等待、分析引擎池、AKShare调用、HTTP连接池、证券主数据、工具执行器、数据预取、请求合并、辩论提示词预算、LLM响应缓存、逐token推送与港股名称缓存"""
+    # 延迟导入，避免健康检查模块加载整个数据流层
+    from tradingagents.dataflows.akshare_utils import get_akshare_call_stats
+    from tradingagents.dataflows.security_master import get_security_master
+    from tradingagents.agents.utils.tool_executor import get_tool_executor_stats
+    from tradingagents.agents.utils.tool_prefetch import get_tool_prefetch_stats
+    from tradingagents.agents.utils.prompt_budget import get_prompt_budget_stats
+    from tradingagents.llm_adapters.response_cache import get_llm_response_cache_stats
+    from tradingagents.messaging.business.token_stream import get_token_stream_stats
+    from tradingagents.dataflows.hk_name_store import get_hk_name_store_stats
+    return {
+        "event_loop_lag": loop_lag_monitor.get_metrics(),
+        "blocking_pool": get_blocking_pool_stats(),
+        "rate_limiters": get_rate_limiter_stats(),
+        "graph_pool": get_graph_pool().get_stats(),
+        "akshare_calls": get_akshare_call_stats(),
+        "http_client": get_http_client_stats(),
+        "security_master": get_security_master().get_stats(),
+        "tool_executor": get_tool_executor_stats(),
+        "tool_prefetch": get_tool_prefetch_stats(),
+        "single_flight": get_single_flight_stats(),
+        "prompt_budget": get_prompt_budget_stats(),
+        "llm_response_cache": get_llm_response_cache_stats(),
+        "token_stream": get_token_stream_stats(),
+        "hk_name_cache": get_hk_name_store_stats(),
+        "timestamp": int(time.time())
+    }
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from app.core.blocking import offload_blocking
+
 from tradingagents.utils.logging_manager import get_logger
 
 
@@ -205,7 +207,8 @@ class CleanupResponse(BaseModel):
 # ==================== API 接口 ====================
 
 @router.get("/records", response_model=UsageRecordsListResponse)
-async def get_usage_records(
+@offload_blocking()
+def get_usage_records(
     limit: int = Query(100, ge=1, le=10000, description="返回记录数限制"),
     days: Optional[int] = Query(None, ge=1, description="最近N天的记录"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
@@ -279,7 +282,8 @@ async def get_usage_records(
 
 
 @router.get("/statistics", response_model=UsageStatisticsResponse)
-async def get_usage_statistics(
+@offload_blocking()
+def get_usage_statistics(
     days: Optional[int] = Query(None, ge=1, le=365, description="统计最近N天的数据"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
     end_date: Optional[str] = Query(None, description="结束日期 (ISO格式)"),
@@ -335,7 +339,8 @@ async def get_usage_statistics(
 
 
 @router.get("/statistics/providers", response_model=UsageStatisticsResponse)
-async def get_provider_statistics(
+@offload_blocking()
+def get_provider_statistics(
     days: Optional[int] = Query(None, ge=1, le=365, description="统计最近N天的数据"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
     end_date: Optional[str] = Query(None, description="结束日期 (ISO格式)")
@@ -386,7 +391,8 @@ async def get_provider_statistics(
 
 
 @router.get("/statistics/models", response_model=UsageStatisticsResponse)
-async def get_model_statistics(
+@offload_blocking()
+def get_model_statistics(
     days: Optional[int] = Query(None, ge=1, le=365, description="统计最近N天的数据"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
     end_date: Optional[str] = Query(None, description="结束日期 (ISO格式)"),
@@ -441,7 +447,8 @@ async def get_model_statistics(
 
 
 @router.get("/count", response_model=UsageCountResponse)
-async def get_records_count(
+@offload_blocking()
+def get_records_count(
     days: Optional[int] = Query(None, ge=1, description="统计最近N天的记录"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
     end_date: Optional[str] = Query(None, description="结束日期 (ISO格式)"),
@@ -455,7 +462,7 @@ async def get_records_count(
     - days: 统计最近N天的记录
     - start_date + end_date: 指定日期区间
     
-    返回符合条件的记录总数
+    返回符合条件的记录总数（启用汇总时为汇总的请求数，按天粒度过滤）
     """
     try:
         manager = get_usage_manager()
@@ -488,7 +495,8 @@ async def get_records_count(
 
 
 @router.post("/records", response_model=InsertRecordResponse)
-async def create_usage_record(record: UsageRecordCreate):
+@offload_blocking()
+def create_usage_record(record: UsageRecordCreate):
     """
     添加单个使用记录
     
@@ -539,7 +547,8 @@ async def create_usage_record(record: UsageRecordCreate):
 
 
 @router.post("/records/batch", response_model=BatchInsertResponse)
-async def create_usage_records_batch(records: List[UsageRecordCreate]):
+@offload_blocking()
+def create_usage_records_batch(records: List[UsageRecordCreate]):
     """
     批量添加使用记录
     
@@ -590,7 +599,8 @@ async def create_usage_records_batch(records: List[UsageRecordCreate]):
 
 
 @router.get("/statistics/daily", response_model=UsageStatisticsResponse)
-async def get_daily_statistics(
+@offload_blocking()
+def get_daily_statistics(
     days: Optional[int] = Query(None, ge=1, le=365, description="统计最近N天的数据"),
     start_date: Optional[str] = Query(None, description="开始日期 (ISO格式)"),
     end_date: Optional[str] = Query(None, description="结束日期 (ISO格式)"),
@@ -656,13 +666,15 @@ async def get_daily_statistics(
 
 
 @router.delete("/records/cleanup", response_model=CleanupResponse)
-async def cleanup_old_records(
+@offload_blocking()
+def cleanup_old_records(
     days: int = Query(90, ge=1, le=365, description="删除N天前的记录")
 ):
     """
     清理旧记录
     
     删除指定天数之前的历史记录，用于数据清理和空间管理
+    （原始记录另有 MODEL_USAGE_RAW_TTL_DAYS 自动过期，统计汇总不受清理影响）
     
     注意：此操作不可逆，请谨慎使用
     """
@@ -687,8 +699,43 @@ async def cleanup_old_records(
         raise HTTPException(status_code=500, detail=f"清理旧记录失败: {e}")
 
 
+@router.post("/rollups/rebuild", response_model=Dict[str, Any])
+@offload_blocking(timeout=None)
+def rebuild_usage_rollups(
+    days: Optional[int] = Query(None, ge=1, le=3650, description="只重新计算最近N天，不传则全部重新计算")
+):
+    """
+    重新计算使用汇总
+
+    统计接口读取按 (日期, 供应商, 模型) 预聚合的汇总数据，
+    可通过此接口从原始记录回填或校正汇总
+    """
+    try:
+        manager = get_usage_manager()
+        
+        if not manager.is_connected():
+            raise HTTPException(status_code=503, detail="MongoDB 连接不可用")
+        
+        rollup_count = manager.rebuild_rollups(days=days)
+        if rollup_count < 0:
+            raise HTTPException(status_code=500, detail="重新计算使用汇总失败")
+        
+        return {
+            "success": True,
+            "rollup_count": rollup_count,
+            "message": f"成功重新计算 {rollup_count} 条使用汇总"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"重新计算使用汇总失败: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"重新计算使用汇总失败: {e}")
+
+
 @router.get("/health", response_model=Dict[str, Any])
-async def check_usage_service_health():
+@offload_blocking()
+def check_usage_service_health():
     """
     检查使用记录服务健康状态
     
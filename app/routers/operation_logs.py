@@ -7,6 +7,8 @@ from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 
+from app.core.blocking import offload_blocking
+
 router = APIRouter()
 
 # 导入系统日志管理器
@@ -19,18 +21,23 @@ class LogsResponse(BaseModel):
     total: int
     filtered_total: int
     message: str
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
 
 
 @router.get("/query", response_model=LogsResponse)
-async def get_operation_logs(
+@offload_blocking()
+def get_operation_logs(
     start_date: Optional[str] = Query(None, description="开始日期 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)"),
     days: Optional[int] = Query(None, description="近N天"),
-    keyword: Optional[str] = Query(None, description="关键字搜索"),
+    keyword: Optional[str] = Query(None, description="关键字搜索（子串匹配，英文单词按前缀匹配）"),
     level: Optional[str] = Query(None, description="日志级别过滤 (INFO, WARNING, ERROR)"),
     logger: Optional[str] = Query(None, description="Logger名称过滤"),
     limit: Optional[int] = Query(1000, description="返回结果数量限制", ge=1, le=10000),
-    skip: Optional[int] = Query(0, description="跳过的记录数（用于分页）", ge=0)
+    skip: Optional[int] = Query(0, description="跳过的记录数（用于分页）", ge=0),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页返回的 next_cursor，提供时忽略 skip"),
+    count_mode: str = Query("exact", description="总数统计模式 (exact, capped, estimated)")
 ):
     """
     获取操作日志（从MongoDB）
@@ -38,17 +45,19 @@ async def get_operation_logs(
     支持：
     - 日期区间筛选（start_date和end_date）
     - 近N天筛选（days参数）
-    - 关键字搜索（在message, module, function, logger字段中搜索）
-    - 日志级别过滤
-    - Logger名称过滤
-    - 分页支持（skip和limit）
+    - 关键字搜索（子串匹配message, module, function, logger字段；英文单词按前缀匹配，
+      如 "analy" 命中 "analysis"，但 "lysis" 不命中）
+    - 日志级别精确过滤
+    - Logger名称精确过滤
+    - 分页支持（skip和limit，或 cursor 游标分页）
+    - 总数统计模式（capped/estimated 下 total_is_estimate 为 true 时总数为下限或估算值）
     """
     try:
         # 获取系统日志管理器
         logs_manager = get_system_logs_manager()
         
         # 查询日志
-        logs, total_count = logs_manager.query_logs(
+        page = logs_manager.query_logs_page(
             start_date=start_date,
             end_date=end_date,
             days=days,
@@ -56,23 +65,30 @@ async def get_operation_logs(
             level=level,
             logger_name=logger,
             limit=limit,
-            skip=skip
+            skip=skip,
+            cursor=cursor,
+            count_mode=count_mode
         )
         
         return LogsResponse(
             success=True,
-            data=logs,
-            total=total_count,
-            filtered_total=len(logs),
-            message="获取日志成功"
+            data=page["logs"],
+            total=page["total"],
+            filtered_total=len(page["logs"]),
+            message="获取日志成功",
+            total_is_estimate=page["total_is_estimate"],
+            next_cursor=page["next_cursor"]
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取日志失败: {str(e)}")
 
 
 @router.get("/stats")
-async def get_logs_stats():
+@offload_blocking()
+def get_logs_stats():
     """获取日志统计信息（从MongoDB）"""
     try:
         # 获取系统日志管理器
@@ -94,3 +110,20 @@ async def get_logs_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取日志统计失败: {str(e)}")
 
+
+@router.post("/search_index/rebuild")
+@offload_blocking(timeout=None)
+def rebuild_search_index(
+    batch_size: int = Query(1000, description="每批更新的记录数", ge=100, le=10000)
+):
+    """为缺少搜索词元或词元版本过旧的历史日志（重新）生成搜索词元（新写入的日志自动生成）"""
+    try:
+        logs_manager = get_system_logs_manager()
+        updated = logs_manager.backfill_search_tokens(batch_size=batch_size)
+        return {
+            "success": True,
+            "data": {"updated_count": updated},
+            "message": f"已为 {updated} 条日志补充搜索词元"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"补充搜索词元失败: {str(e)}")
@@ -8,6 +8,7 @@ from fastapi.responses import FileResponse
 from pathlib import Path
 from datetime import datetime
 
+from app.core.blocking import offload_blocking
 from app.schemas.report import (
     ReportGenerateRequest,
     ReportGenerateResponse,
@@ -27,7 +28,8 @@ logger = get_logger("reports_router")
 
 
 @router.get("/formatted-decisions", response_model=FormattedDecisionsResponse)
-async def get_formatted_decisions(
+@offload_blocking()
+def get_formatted_decisions(
     start_date: str = Query(..., description="开始日期，格式 YYYY-MM-DD"),
     end_date: str = Query(..., description="结束日期，格式 YYYY-MM-DD"),
     stock_code: Optional[str] = Query(None, description="按股票代码筛选"),
@@ -103,7 +105,8 @@ async def get_formatted_decisions(
 
 
 @router.get("/list", response_model=ReportsListResponse)
-async def get_reports_list(
+@offload_blocking()
+def get_reports_list(
     page: int = Query(1, ge=1, le=100, description="页码"), 
     page_size: int = Query(10, ge=1, le=10, description="每页大小（最大10）")
 ):
@@ -162,7 +165,8 @@ async def get_reports_list(
 
 
 @router.post("/generate", response_model=ReportGenerateResponse)
-async def generate_report(request: ReportGenerateRequest):
+@offload_blocking(timeout=300)
+def generate_report(request: ReportGenerateRequest):
     """
     生成分析报告
     
@@ -259,7 +263,8 @@ async def generate_report(request: ReportGenerateRequest):
 
 
 @router.get("/{report_id}")
-async def download_report(report_id: str):
+@offload_blocking()
+def download_report(report_id: str):
     """
     下载报告文件
     
@@ -304,7 +309,8 @@ async def download_report(report_id: str):
 
 
 @router.get("/{analysis_id}/reports", response_model=ReportResponse)
-async def get_analysis_reports(analysis_id: str, stage: Optional[str] = Query(None, description="Filter reports by stage")):
+@offload_blocking()
+def get_analysis_reports(analysis_id: str, stage: Optional[str] = Query(None, description="Filter reports by stage")):
     """获取分析任务的报告列表"""
     try:
         # reports = get_reports_from_fs(analysis_id, stage)
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import json
 
+from app.core.blocking import offload_blocking
 from tradingagents.utils.logging_manager import get_logger
 from tradingagents.dataflows.stock_data_service import get_stock_data_service
 from tradingagents.storage.mongodb.stock_history_manager import stock_history_manager
@@ -159,7 +160,8 @@ def _normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
 
 
 @router.get("/basic-info/{stock_code}", response_model=StockBasicInfoResponse)
-async def get_stock_basic_info(stock_code: str):
+@offload_blocking()
+def get_stock_basic_info(stock_code: str):
     """
     从MongoDB的 stock_dict 集合中获取股票基本信息
     
@@ -204,7 +206,8 @@ async def get_stock_basic_info(stock_code: str):
 
 
 @router.get("/list", response_model=StockListResponse)
-async def get_all_stocks():
+@offload_blocking()
+def get_all_stocks():
     """
     获取所有股票列表
     """
@@ -241,7 +244,8 @@ async def get_all_stocks():
 
 
 @router.get("/historical-data/{stock_code}", response_model=StockHistoricalDataResponse)
-async def get_stock_historical_data(
+@offload_blocking()
+def get_stock_historical_data(
     stock_code: str,
     start_date: str = Query(..., description="开始日期 (YYYY-MM-DD)"),
     end_date: str = Query(..., description="结束日期 (YYYY-MM-DD)"),
@@ -376,7 +380,8 @@ async def get_stock_historical_data(
 
 
 @router.get("/analysis-reports/{stock_code}")
-async def get_analysis_reports_by_stock(
+@offload_blocking()
+def get_analysis_reports_by_stock(
     stock_code: str,
     limit: int = Query(100, ge=1, le=1000, description="最大返回数量"),
     start_date: Optional[str] = Query(
@@ -486,7 +491,8 @@ def _get_stock_sectors_data(stock_code: str) -> Dict[str, Any]:
 
 
 @router.get("/sectors_by_id/{stock_id}", response_model=StockSectorsResponse)
-async def get_stock_sectors_by_id(stock_id: str):
+@offload_blocking()
+def get_stock_sectors_by_id(stock_id: str):
     """
     根据股票代码查询所属板块
     
@@ -532,7 +538,8 @@ async def get_stock_sectors_by_id(stock_id: str):
 
 
 @router.get("/sectors_by_name/{company_name}", response_model=StockSectorsResponse)
-async def get_stock_sectors_by_name(company_name: str):
+@offload_blocking()
+def get_stock_sectors_by_name(company_name: str):
     """
     根据上市公司名称查询所属板块
     
@@ -595,7 +602,8 @@ class IndustryNamesRequest(BaseModel):
 
 
 @router.post("/sectors/industry/stocks", response_model=SectorStocksResponse)
-async def get_stocks_by_industries(request: IndustryNamesRequest = Body(...)):
+@offload_blocking()
+def get_stocks_by_industries(request: IndustryNamesRequest = Body(...)):
     """
     根据指定的行业板块名称列表，返回每个行业板块的股票列表
     
@@ -654,7 +662,8 @@ class ConceptNamesRequest(BaseModel):
 
 
 @router.post("/sectors/concept/stocks", response_model=SectorStocksResponse)
-async def get_stocks_by_concepts(request: ConceptNamesRequest = Body(...)):
+@offload_blocking()
+def get_stocks_by_concepts(request: ConceptNamesRequest = Body(...)):
     """
     根据指定的概念板块名称列表，返回每个概念板块的股票列表
     
@@ -708,7 +717,8 @@ async def get_stocks_by_concepts(request: ConceptNamesRequest = Body(...)):
 
 
 @router.post("/sectors/update", response_model=SectorUpdateResponse)
-async def update_sectors(
+@offload_blocking(timeout=None)
+def update_sectors(
     update_concept: bool = Query(True, description="是否更新概念板块"),
     update_industry: bool = Query(True, description="是否更新行业板块")
 ):
@@ -805,7 +815,8 @@ async def update_sectors(
 
 
 @router.post("/sectors/concept/update", response_model=SectorUpdateResponse)
-async def update_specific_concept_sectors(request: ConceptNamesUpdateRequest):
+@offload_blocking(timeout=None)
+def update_specific_concept_sectors(request: ConceptNamesUpdateRequest):
     """
     更新指定的概念板块列表
     
@@ -846,7 +857,8 @@ async def update_specific_concept_sectors(request: ConceptNamesUpdateRequest):
 
 
 @router.post("/sectors/industry/update", response_model=SectorUpdateResponse)
-async def update_specific_industry_sectors(request: IndustryNamesUpdateRequest):
+@offload_blocking(timeout=None)
+def update_specific_industry_sectors(request: IndustryNamesUpdateRequest):
     """
     更新指定的行业板块列表
     
@@ -887,7 +899,8 @@ async def update_specific_industry_sectors(request: IndustryNamesUpdateRequest):
 
 
 @router.get("/sectors/concept/list", response_model=SectorListResponse)
-async def get_concept_list(
+@offload_blocking()
+def get_concept_list(
     limit: Optional[int] = Query(None, ge=1, le=10000, description="最大返回数量"),
     skip: Optional[int] = Query(0, ge=0, description="跳过记录数（用于分页）")
 ):
@@ -926,7 +939,8 @@ async def get_concept_list(
 
 
 @router.get("/sectors/industry/list", response_model=SectorListResponse)
-async def get_industry_list(
+@offload_blocking()
+def get_industry_list(
     limit: Optional[int] = Query(None, ge=1, le=10000, description="最大返回数量"),
     skip: Optional[int] = Query(0, ge=0, description="跳过记录数（用于分页）")
 ):
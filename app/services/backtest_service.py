@@ -15,6 +15,7 @@ from tradingagents.utils.logging_manager import get_logger
 from tradingagents.storage.mongodb.system_config_manager import SystemConfigManager
 from tradingagents.storage.mongodb.report_manager import mongodb_report_manager
 from tradingagents.storage.mongodb.stock_dict_manager import stock_dict_manager
+from tradingagents.dataflows.security_master import get_security_master
 from tradingagents.storage.mongodb.stock_history_manager import stock_history_manager
 from tradingagents.storage.mongodb.index_history_manager import index_history_manager
 
@@ -152,6 +153,11 @@ class BacktestService:
         Returns:
             str: 公司名称，如果获取失败则返回股票代码
         """
+        # 优先查内存证券主数据，避免逐条报告查询 stock_dict
+        security = get_security_master().get(stock_symbol)
+        if security:
+            return security.name
+
         if not stock_dict_manager or not stock_dict_manager.connected:
             logger.warning("stock_dict 未连接，无法获取公司名称")
             return stock_symbol
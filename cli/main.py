@@ -37,6 +37,7 @@ from cli.utils import (
 )
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.graph_pool import get_graph_pool
 from tradingagents.utils.logging_manager import get_logger
 
 # 加载环境变量
@@ -1074,10 +1075,10 @@ def run_analysis():
     # Initialize the graph
     ui.show_progress("正在初始化分析系统...")
     try:
-        graph = TradingAgentsGraph(
-            [analyst.value for analyst in selections["analysts"]], config=config, debug=True
+        graph = get_graph_pool().acquire(
+            [analyst.value for analyst in selections["analysts"]], config, debug=True
         )
-        ui.show_success("分析系统初始化完成")
+        ui.show_success(f"分析系统初始化完成 ({graph.init_seconds:.2f}s)")
     except ImportError as e:
         ui.show_error(f"模块导入失败 | Module import failed: {str(e)}")
         ui.show_warning("💡 请检查依赖安装 | Please check dependencies installation")
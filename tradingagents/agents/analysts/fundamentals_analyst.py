@@ -16,6 +16,7 @@ logger = get_logger("default")
 
 # 导入Google工具调用处理器
 from tradingagents.agents.utils.google_tool_handler import GoogleToolCallHandler
+from tradingagents.agents.utils.tool_executor import build_tool_map, invoke_tool
 
 # 模块级变量：基本面分析的时间窗口大小（天数）
 FUNDAMENTALS_ANALYSIS_WINDOW_DAYS = 60
@@ -34,18 +35,11 @@ def _get_company_name_for_fundamentals(ticker: str, market_info: dict) -> str:
     """
     try:
         if market_info['is_china']:
-            # 中国A股：使用统一接口获取股票信息
-            from tradingagents.dataflows.interface import get_china_stock_info_unified
-            stock_info = get_china_stock_info_unified(ticker)
-
-            # 解析股票名称
-            if "股票名称:" in stock_info:
-                company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
-                logger.debug(f"📊 [基本面分析师] 从统一接口获取中国股票名称: {ticker} -> {company_name}")
-                return company_name
-            else:
-                logger.warning(f"⚠️ [基本面分析师] 无法从统一接口解析股票名称: {ticker}")
-                return f"股票代码{ticker}"
+            # 中国A股：从内存证券主数据获取（未命中时经统一接口获取并回填）
+            from tradingagents.dataflows.security_master import resolve_china_company_name
+            company_name = resolve_china_company_name(ticker)
+            logger.debug(f"📊 [基本面分析师] 从证券主数据获取中国股票名称: {ticker} -> {company_name}")
+            return company_name
 
         elif market_info['is_hk']:
             # 港股：使用改进的港股工具
@@ -552,20 +546,10 @@ def create_fundamentals_analyst(llm, toolkit):
                 try:
                     logger.debug(f"📊 [DEBUG] 强制调用 get_stock_fundamentals_unified...")
                     # 安全地查找统一基本面分析工具
-                    unified_tool = None
-                    for tool in tools:
-                        tool_name = None
-                        if hasattr(tool, 'name'):
-                            tool_name = tool.name
-                        elif hasattr(tool, '__name__'):
-                            tool_name = tool.__name__
-
-                        if tool_name == 'get_stock_fundamentals_unified':
-                            unified_tool = tool
-                            break
+                    unified_tool = build_tool_map(tools).get('get_stock_fundamentals_unified')
                     if unified_tool:
                         logger.debug(f"🔍 [股票代码追踪] 强制调用统一工具，传入ticker: '{ticker}'")
-                        combined_data = unified_tool.invoke({
+                        combined_data = invoke_tool(unified_tool, {
                             'ticker': ticker,
                             'start_date': start_date,
                             'end_date': current_date,
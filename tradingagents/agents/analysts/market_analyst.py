@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import traceback
 
@@ -11,6 +12,9 @@ logger = get_logger("default")
 # 导入Google工具调用处理器
 from tradingagents.agents.utils.google_tool_handler import GoogleToolCallHandler
 
+# 模块级变量：市场分析的时间窗口大小（天数），数据预取使用相同窗口
+MARKET_ANALYSIS_WINDOW_DAYS = 30
+
 
 def _get_company_name(ticker: str, market_info: dict) -> str:
     """
@@ -25,18 +29,11 @@ def _get_company_name(ticker: str, market_info: dict) -> str:
     """
     try:
         if market_info['is_china']:
-            # 中国A股：使用统一接口获取股票信息
-            from tradingagents.dataflows.interface import get_china_stock_info_unified
-            stock_info = get_china_stock_info_unified(ticker)
-
-            # 解析股票名称
-            if "股票名称:" in stock_info:
-                company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
-                logger.debug(f"📊 [DEBUG] 从统一接口获取中国股票名称: {ticker} -> {company_name}")
-                return company_name
-            else:
-                logger.warning(f"⚠️ [DEBUG] 无法从统一接口解析股票名称: {ticker}")
-                return f"股票代码{ticker}"
+            # 中国A股：从内存证券主数据获取（未命中时经统一接口获取并回填）
+            from tradingagents.dataflows.security_master import resolve_china_company_name
+            company_name = resolve_china_company_name(ticker)
+            logger.debug(f"📊 [DEBUG] 从证券主数据获取中国股票名称: {ticker} -> {company_name}")
+            return company_name
 
         elif market_info['is_hk']:
             # 港股：使用改进的港股工具
@@ -84,7 +81,15 @@ def create_market_analyst(llm, toolkit):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
-        logger.debug(f"📈 [DEBUG] 输入参数: ticker={ticker}, date={current_date}")
+        # 基于 current_date 向前推窗口天数，明确传给工具（与数据预取的参数一致）
+        try:
+            start_date = (datetime.strptime(current_date, '%Y-%m-%d')
+                          - timedelta(days=MARKET_ANALYSIS_WINDOW_DAYS)).strftime('%Y-%m-%d')
+        except Exception as e:
+            logger.warning(f"⚠️ [市场分析师] 日期解析失败，使用默认窗口: {e}")
+            start_date = (datetime.now() - timedelta(days=MARKET_ANALYSIS_WINDOW_DAYS)).strftime('%Y-%m-%d')
+
+        logger.debug(f"📈 [DEBUG] 输入参数: ticker={ticker}, date={current_date}, start_date={start_date}")
         logger.debug(f"📈 [DEBUG] 当前状态中的消息数量: {len(state.get('messages', []))}")
         logger.debug(f"📈 [DEBUG] 现有市场报告: {state.get('market_report', 'None')}")
 
@@ -132,6 +137,7 @@ def create_market_analyst(llm, toolkit):
 
 **工具调用指令：**
 你有一个工具叫做get_stock_market_data_unified，你必须立即调用这个工具来获取{company_name}（{ticker}）的市场数据。
+参数：ticker='{ticker}', start_date='{start_date}', end_date='{current_date}'
 不要说你将要调用工具，直接调用工具。
 
 **分析要求：**
@@ -236,49 +242,11 @@ def create_market_analyst(llm, toolkit):
 
                 try:
                     # 执行工具调用
-                    from langchain_core.messages import ToolMessage, HumanMessage
-
-                    tool_messages = []
-                    for tool_call in result.tool_calls:
-                        tool_name = tool_call.get('name')
-                        tool_args = tool_call.get('args', {})
-                        tool_id = tool_call.get('id')
-
-                        logger.debug(f"📊 [DEBUG] 执行工具: {tool_name}, 参数: {tool_args}")
-
-                        # 找到对应的工具并执行
-                        tool_result = None
-                        for tool in tools:
-                            # 安全地获取工具名称进行比较
-                            current_tool_name = None
-                            if hasattr(tool, 'name'):
-                                current_tool_name = tool.name
-                            elif hasattr(tool, '__name__'):
-                                current_tool_name = tool.__name__
-
-                            if current_tool_name == tool_name:
-                                try:
-                                    if tool_name == "get_china_stock_data":
-                                        # 中国股票数据工具
-                                        tool_result = tool.invoke(tool_args)
-                                    else:
-                                        # 其他工具
-                                        tool_result = tool.invoke(tool_args)
-                                    logger.debug(f"📊 [DEBUG] 工具执行成功，结果长度: {len(str(tool_result))}")
-                                    break
-                                except Exception as tool_error:
-                                    logger.error(f"❌ [DEBUG] 工具执行失败: {tool_error}")
-                                    tool_result = f"工具执行失败: {str(tool_error)}"
-
-                        if tool_result is None:
-                            tool_result = f"未找到工具: {tool_name}"
-
-                        # 创建工具消息
-                        tool_message = ToolMessage(
-                            content=str(tool_result),
-                            tool_call_id=tool_id
-                        )
-                        tool_messages.append(tool_message)
+                    from langchain_core.messages import HumanMessage
+                    from tradingagents.agents.utils.tool_executor import execute_tool_calls
+
+                    # 并发执行工具调用，结果顺序与调用顺序一致
+                    tool_messages = execute_tool_calls(result.tool_calls, tools)
 
                     # 基于工具结果生成完整分析报告
                     analysis_prompt = f"""现在请基于上述工具获取的数据，生成详细的技术分析报告。
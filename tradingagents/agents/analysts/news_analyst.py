@@ -66,18 +66,11 @@ def create_news_analyst(llm, toolkit):
             """根据股票代码获取公司名称"""
             try:
                 if market_info['is_china']:
-                    # 中国A股：使用统一接口获取股票信息
-                    from tradingagents.dataflows.interface import get_china_stock_info_unified
-                    stock_info = get_china_stock_info_unified(ticker)
-                    
-                    # 解析股票名称
-                    if "股票名称:" in stock_info:
-                        company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
-                        logger.debug(f"📊 [DEBUG] 从统一接口获取中国股票名称: {ticker} -> {company_name}")
-                        return company_name
-                    else:
-                        logger.warning(f"⚠️ [DEBUG] 无法从统一接口解析股票名称: {ticker}")
-                        return f"股票代码{ticker}"
+                    # 中国A股：从内存证券主数据获取（未命中时经统一接口获取并回填）
+                    from tradingagents.dataflows.security_master import resolve_china_company_name
+                    company_name = resolve_china_company_name(ticker)
+                    logger.debug(f"📊 [DEBUG] 从证券主数据获取中国股票名称: {ticker} -> {company_name}")
+                    return company_name
                         
                 elif market_info['is_hk']:
                     # 港股：使用改进的港股工具
@@ -7,6 +7,7 @@ logger = get_logger("default")
 
 # 导入消息装饰器（优先使用消息模式）
 from tradingagents.messaging.decorators.message_decorators import message_analysis_module
+from tradingagents.agents.utils.prompt_budget import fit_debate_inputs, record_prompt
 
 
 def create_research_manager(llm, memory):
@@ -33,6 +34,10 @@ def create_research_manager(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        prompt_history, market_research_report, sentiment_report, news_report, fundamentals_report = fit_debate_inputs(
+            history, market_research_report, sentiment_report, news_report, fundamentals_report
+        )
+
         prompt = f"""作为投资组合经理和辩论主持人，您的职责是批判性地评估这轮辩论并做出明确决策：支持看跌分析师、看涨分析师，或者仅在基于所提出论点有强有力理由时选择持有。
 
 简洁地总结双方的关键观点，重点关注最有说服力的证据或推理。您的建议——买入、卖出或持有——必须明确且可操作。避免仅仅因为双方都有有效观点就默认选择持有；要基于辩论中最强有力的论点做出承诺。
@@ -67,9 +72,10 @@ def create_research_manager(llm, memory):
 
 以下是辩论：
 辩论历史：
-{history}
+{prompt_history}
 
 请用中文撰写所有分析内容和建议。"""
+        record_prompt("research_manager", prompt)
         response = llm.invoke(prompt)
 
         new_investment_debate_state = {
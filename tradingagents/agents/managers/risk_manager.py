@@ -7,6 +7,7 @@ logger = get_logger("default")
 
 # 导入消息装饰器（优先使用消息模式）
 from tradingagents.messaging.decorators.message_decorators import message_analysis_module
+from tradingagents.agents.utils.prompt_budget import compact_debate_history, record_prompt
 
 
 def create_risk_manager(llm, memory):
@@ -36,6 +37,9 @@ def create_risk_manager(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        # 提示词中的辩论历史按 token 预算压缩，状态中仍保存完整历史
+        prompt_history = compact_debate_history(history)
+
         prompt = f"""作为风险管理委员会主席和辩论主持人，您的目标是评估三位风险分析师——激进、中性和安全/保守——之间的辩论，并确定交易员的最佳行动方案。您的决策必须产生明确的建议：买入、卖出或持有。只有在有具体论据强烈支持时才选择持有，而不是在所有方面都似乎有效时作为后备选择。力求清晰和果断。
 
 决策指导原则：
@@ -51,12 +55,14 @@ def create_risk_manager(llm, memory):
 ---
 
 **分析师辩论历史：**
-{history}
+{prompt_history}
 
 ---
 
 专注于可操作的见解和持续改进。建立在过去经验教训的基础上，批判性地评估所有观点，确保每个决策都能带来更好的结果。请用中文撰写所有分析内容和建议。"""
 
+        record_prompt("risk_manager", prompt)
+
         # 增强的LLM调用，包含错误处理和重试机制
         max_retries = 3
         retry_count = 0
@@ -8,6 +8,7 @@ logger = get_logger("default")
 
 # 导入消息装饰器（优先使用消息模式）
 from tradingagents.messaging.decorators.message_decorators import message_analysis_module
+from tradingagents.agents.utils.prompt_budget import fit_debate_inputs, record_prompt
 
 
 def create_bear_researcher(llm, memory):
@@ -47,6 +48,10 @@ def create_bear_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        prompt_history, market_research_report, sentiment_report, news_report, fundamentals_report = fit_debate_inputs(
+            history, market_research_report, sentiment_report, news_report, fundamentals_report
+        )
+
         prompt = f"""你是一位看跌分析师，负责论证不投资股票 {company_name} 的理由。
 
 ⚠️ 重要提醒：当前分析的是 {market_info['market_name']}，所有价格和估值请使用 {currency}（{currency_symbol}）作为单位。
@@ -67,7 +72,7 @@ def create_bear_researcher(llm, memory):
 社交媒体情绪报告：{sentiment_report}
 最新世界事务新闻：{news_report}
 公司基本面报告：{fundamentals_report}
-辩论对话历史：{history}
+辩论对话历史：{prompt_history}
 最后的看涨论点：{current_response}
 类似情况的反思和经验教训：{past_memory_str}
 
@@ -76,6 +81,7 @@ def create_bear_researcher(llm, memory):
 请确保所有回答都使用中文。
 """
 
+        record_prompt("bear_researcher", prompt)
         response = llm.invoke(prompt)
 
         argument = f"Bear Analyst: {response.content}"
@@ -8,6 +8,7 @@ logger = get_logger("default")
 
 # 导入消息装饰器（优先使用消息模式）
 from tradingagents.messaging.decorators.message_decorators import message_analysis_module
+from tradingagents.agents.utils.prompt_budget import fit_debate_inputs, record_prompt
 
 
 def create_bull_researcher(llm, memory):
@@ -58,6 +59,10 @@ def create_bull_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        prompt_history, market_research_report, sentiment_report, news_report, fundamentals_report = fit_debate_inputs(
+            history, market_research_report, sentiment_report, news_report, fundamentals_report
+        )
+
         prompt = f"""你是一位看涨分析师，负责为股票 {company_name} 的投资建立强有力的论证。
 
 ⚠️ 重要提醒：当前分析的是 {'中国A股' if is_china else '海外股票'}，所有价格和估值请使用 {currency}（{currency_symbol}）作为单位。
@@ -76,7 +81,7 @@ def create_bull_researcher(llm, memory):
 社交媒体情绪报告：{sentiment_report}
 最新世界事务新闻：{news_report}
 公司基本面报告：{fundamentals_report}
-辩论对话历史：{history}
+辩论对话历史：{prompt_history}
 最后的看跌论点：{current_response}
 类似情况的反思和经验教训：{past_memory_str}
 
@@ -85,6 +90,7 @@ def create_bull_researcher(llm, memory):
 请确保所有回答都使用中文。
 """
 
+        record_prompt("bull_researcher", prompt)
         response = llm.invoke(prompt)
 
         argument = f"Bull Analyst: {response.content}"
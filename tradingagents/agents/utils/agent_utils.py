@@ -564,16 +564,10 @@ class Toolkit:
         import re
         if re.match(r'^\d{6}$', str(ticker)):
             logger.debug(f"📊 [DEBUG] 检测到中国A股代码: {ticker}")
-            # 使用统一接口获取中国股票名称
+            # 从内存证券主数据获取中国股票名称
             try:
-                from tradingagents.dataflows.interface import get_china_stock_info_unified
-                stock_info = get_china_stock_info_unified(ticker)
-
-                # 解析股票名称
-                if "股票名称:" in stock_info:
-                    company_name = stock_info.split("股票名称:")[1].split("\n")[0].strip()
-                else:
-                    company_name = f"股票代码{ticker}"
+                from tradingagents.dataflows.security_master import resolve_china_company_name
+                company_name = resolve_china_company_name(ticker)
 
                 logger.debug(f"📊 [DEBUG] 中国股票名称映射: {ticker} -> {company_name}")
             except Exception as e:
@@ -12,6 +12,8 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.messages import HumanMessage, ToolMessage, AIMessage
 
+from tradingagents.agents.utils.tool_executor import execute_tool_calls
+
 logger = logging.getLogger(__name__)
 
 class GoogleToolCallHandler:
@@ -148,79 +150,24 @@ class GoogleToolCallHandler:
             
             logger.info(f"[{analyst_name}] 🔧 有效工具调用: {len(valid_tool_calls)}/{len(result.tool_calls)}")
             
-            for i, tool_call in enumerate(valid_tool_calls):
+            # 防止重复调用同一工具（特别是统一市场数据工具）
+            calls_to_execute = []
+            for tool_call in valid_tool_calls:
                 tool_name = tool_call.get('name')
                 tool_args = tool_call.get('args', {})
-                tool_id = tool_call.get('id')
-                
-                # 防止重复调用同一工具（特别是统一市场数据工具）
                 tool_signature = f"{tool_name}_{hash(str(tool_args))}"
                 if tool_signature in executed_tools:
                     logger.warning(f"[{analyst_name}] ⚠️ 跳过重复工具调用: {tool_name}")
                     continue
                 executed_tools.add(tool_signature)
-                
-                logger.info(f"[{analyst_name}] 🛠️ 执行工具 {i+1}/{len(valid_tool_calls)}: {tool_name}")
-                logger.info(f"[{analyst_name}] 参数: {tool_args}")
-                logger.debug(f"[{analyst_name}] 🔧 工具调用详情: {tool_call}")
-                
-                # 找到对应的工具并执行
-                tool_result = None
-                available_tools = []
-                
-                for tool in tools:
-                    current_tool_name = GoogleToolCallHandler._get_tool_name(tool)
-                    available_tools.append(current_tool_name)
-                    
-                    if current_tool_name == tool_name:
-                        try:
-                            logger.debug(f"[{analyst_name}] 🔧 找到工具: {tool.__class__.__name__}")
-                            logger.debug(f"[{analyst_name}] 🔧 工具类型检查...")
-                            
-                            # 检查工具类型并相应调用
-                            if hasattr(tool, 'invoke'):
-                                # LangChain工具，使用invoke方法
-                                logger.info(f"[{analyst_name}] 🚀 正在调用LangChain工具.invoke()...")
-                                tool_result = tool.invoke(tool_args)
-                                logger.info(f"[{analyst_name}] ✅ LangChain工具执行成功，结果长度: {len(str(tool_result))} 字符")
-                                logger.debug(f"[{analyst_name}] 🔧 工具结果类型: {type(tool_result)}")
-                            elif callable(tool):
-                                # 普通Python函数，直接调用
-                                logger.info(f"[{analyst_name}] 🚀 正在调用Python函数工具...")
-                                tool_result = tool(**tool_args)
-                                logger.info(f"[{analyst_name}] ✅ Python函数工具执行成功，结果长度: {len(str(tool_result))} 字符")
-                                logger.debug(f"[{analyst_name}] 🔧 工具结果类型: {type(tool_result)}")
-                            else:
-                                logger.error(f"[{analyst_name}] ❌ 工具类型不支持: {type(tool)}")
-                                tool_result = f"工具类型不支持: {type(tool)}"
-                            break
-                        except Exception as tool_error:
-                            logger.error(f"[{analyst_name}] ❌ 工具执行失败: {tool_error}")
-                            logger.error(f"[{analyst_name}] ❌ 异常类型: {type(tool_error).__name__}")
-                            logger.error(f"[{analyst_name}] ❌ 异常详情: {str(tool_error)}")
-                            
-                            # 记录详细的异常堆栈
-                            import traceback
-                            error_traceback = traceback.format_exc()
-                            logger.error(f"[{analyst_name}] ❌ 工具执行异常堆栈:\n{error_traceback}")
-                            
-                            tool_result = f"工具执行失败: {str(tool_error)}"
-                
-                logger.debug(f"[{analyst_name}] 🔧 可用工具列表: {available_tools}")
-                
-                if tool_result is None:
-                    tool_result = f"未找到工具: {tool_name}"
-                    logger.warning(f"[{analyst_name}] ⚠️ 未找到工具: {tool_name}")
-                    logger.debug(f"[{analyst_name}] ⚠️ 工具名称不匹配，期望: {tool_name}, 可用: {available_tools}")
-                
-                # 创建工具消息
-                tool_message = ToolMessage(
-                    content=str(tool_result),
-                    tool_call_id=tool_id
-                )
-                tool_messages.append(tool_message)
-                tool_results.append(tool_result)
-                logger.debug(f"[{analyst_name}] 🔧 创建工具消息，ID: {tool_message.tool_call_id}")
+                calls_to_execute.append(tool_call)
+                logger.info(f"[{analyst_name}] 🛠️ 执行工具 {len(calls_to_execute)}: {tool_name}, 参数: {tool_args}")
+
+            # 并发执行工具调用，结果顺序与调用顺序一致
+            tool_messages = execute_tool_calls(calls_to_execute, tools)
+            tool_results = [tool_message.content for tool_message in tool_messages]
+            for tool_message in tool_messages:
+                logger.debug(f"[{analyst_name}] 🔧 创建工具消息，ID: {tool_message.tool_call_id}，结果长度: {len(tool_message.content)} 字符")
             
             logger.info(f"[{analyst_name}] 🔧 工具调用完成，成功: {len(tool_results)}, 总计: {len(result.tool_calls)}")
             
@@ -4,12 +4,15 @@ from openai import OpenAI
 import dashscope
 from dashscope import TextEmbedding
 import os
+import json
+import time
 import threading
 import hashlib
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env, parse_str_env
 from tradingagents.utils.embedding_config import (
     get_dashscope_embedding_model, 
     call_dashscope_embedding, 
@@ -18,13 +21,34 @@ from tradingagents.utils.embedding_config import (
 logger = get_logger("agents.utils.memory")
 
 
+# 记忆库导入导出文件格式标识
+MEMORY_EXPORT_FORMAT = "tradingagents-memory"
+MEMORY_EXPORT_VERSION = 1
+
+# 分析引擎使用的五个记忆集合
+MEMORY_COLLECTION_NAMES = (
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+)
+
+
 class ChromaDBManager:
-    """单例ChromaDB管理器，避免并发创建集合的冲突"""
+    """
+    单例ChromaDB管理器，避免并发创建集合的冲突
+
+    持久化模式（MEMORY_PERSISTENT=true）下记忆写入 MEMORY_PERSIST_DIR，
+    HNSW 索引由 ChromaDB 在首次访问集合时从磁盘加载，进程重启后无需重新
+    调用 embedding 接口即可检索全部历史记忆。
+    """
 
     _instance = None
     _lock = threading.Lock()
     _collections: Dict[str, any] = {}
     _client = None
+    _compacted: set = set()
 
     def __new__(cls):
         if cls._instance is None:
@@ -36,12 +60,26 @@ class ChromaDBManager:
 
     def __init__(self):
         if not self._initialized:
+            # 持久化与压缩策略配置
+            self.persistent = parse_bool_env("MEMORY_PERSISTENT", False)
+            self.persist_dir = parse_str_env("MEMORY_PERSIST_DIR", "./data/chroma_memory")
+            self.ttl_days = parse_int_env("MEMORY_TTL_DAYS", 0)
+            self.max_items = parse_int_env("MEMORY_MAX_ITEMS", 0)
+
             try:
                 # 自动检测操作系统版本并使用最优配置
                 import platform
                 system = platform.system()
                 
-                if system == "Windows":
+                if self.persistent:
+                    os.makedirs(self.persist_dir, exist_ok=True)
+                    settings = Settings(
+                        allow_reset=True,
+                        anonymized_telemetry=False
+                    )
+                    self._client = chromadb.PersistentClient(path=self.persist_dir, settings=settings)
+                    logger.info(f"📚 [ChromaDB] 持久化模式初始化完成: {self.persist_dir}")
+                elif system == "Windows":
                     # 使用改进的Windows 11检测
                     from .chromadb_win11_config import is_windows_11
                     if is_windows_11():
@@ -67,7 +105,8 @@ class ChromaDBManager:
                 self._initialized = True
             except Exception as e:
                 logger.error(f"❌ [ChromaDB] 初始化失败: {e}")
-                # 使用最简单的配置作为备用
+                # 使用最简单的配置作为备用（回退为非持久化）
+                self.persistent = False
                 try:
                     settings = Settings(
                         allow_reset=True,
@@ -109,7 +148,170 @@ class ChromaDBManager:
 
             # 缓存集合
             self._collections[name] = collection
-            return collection
+
+        # 持久化集合首次加载时按 TTL / 容量上限压缩一次
+        if self.persistent and name not in self._compacted:
+            self._compacted.add(name)
+            self.compact_collection(name)
+        return collection
+
+    def compact_collection(self, name: str, ttl_days: Optional[int] = None,
+                           max_items: Optional[int] = None) -> int:
+        """
+        按 TTL 和容量上限压缩集合
+
+        Args:
+            name: 集合名称
+            ttl_days: 删除早于N天的记忆，None 使用 MEMORY_TTL_DAYS，0 表示不过期
+            max_items: 集合最多保留的记忆数，超出时删除最旧的，None 使用 MEMORY_MAX_ITEMS，0 表示不限
+
+        Returns:
+            删除的记忆数量
+        """
+        ttl_days = self.ttl_days if ttl_days is None else ttl_days
+        max_items = self.max_items if max_items is None else max_items
+        if ttl_days <= 0 and max_items <= 0:
+            return 0
+
+        collection = self.get_or_create_collection(name)
+        deleted = 0
+        try:
+            # 旧版本写入的记忆没有 created_at，不参与 TTL 过期
+            if ttl_days > 0:
+                cutoff = time.time() - ttl_days * 86400
+                expired = collection.get(where={"created_at": {"$lt": cutoff}}, include=[])
+                if expired["ids"]:
+                    collection.delete(ids=expired["ids"])
+                    deleted += len(expired["ids"])
+
+            if max_items > 0:
+                overflow = collection.count() - max_items
+                if overflow > 0:
+                    existing = collection.get(include=["metadatas"])
+                    ordered = sorted(
+                        zip(existing["ids"], existing["metadatas"]),
+                        key=lambda item: (item[1] or {}).get("created_at", 0)
+                    )
+                    oldest_ids = [doc_id for doc_id, _ in ordered[:overflow]]
+                    collection.delete(ids=oldest_ids)
+                    deleted += len(oldest_ids)
+
+            if deleted:
+                logger.info(f"🧹 [ChromaDB] 集合 {name} 压缩完成，删除 {deleted} 条记忆")
+        except Exception as e:
+            logger.warning(f"⚠️ [ChromaDB] 集合 {name} 压缩失败: {e}")
+        return deleted
+
+    def export_collection(self, name: str, path: str, embedding_model: Optional[str] = None) -> int:
+        """
+        导出集合到 JSONL 文件（含 embedding，导入时无需重新计算）
+
+        文件首行为头信息：format / version / collection / embedding_model / count，
+        之后每行一条记忆：id / document / metadata / embedding。
+
+        Returns:
+            导出的记忆数量
+        """
+        collection = self.get_or_create_collection(name)
+        data = collection.get(include=["documents", "metadatas", "embeddings"])
+        ids = data["ids"]
+        documents = data.get("documents") or [None] * len(ids)
+        metadatas = data.get("metadatas") or [None] * len(ids)
+        embeddings = data.get("embeddings")
+        if embeddings is None:
+            embeddings = [None] * len(ids)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            header = {
+                "format": MEMORY_EXPORT_FORMAT,
+                "version": MEMORY_EXPORT_VERSION,
+                "collection": name,
+                "embedding_model": embedding_model,
+                "count": len(ids),
+            }
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for doc_id, document, metadata, embedding in zip(ids, documents, metadatas, embeddings):
+                record = {
+                    "id": doc_id,
+                    "document": document,
+                    "metadata": metadata,
+                    "embedding": [float(x) for x in embedding] if embedding is not None else None,
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        logger.info(f"📤 [ChromaDB] 集合 {name} 导出 {len(ids)} 条记忆: {path}")
+        return len(ids)
+
+    def import_collection(self, name: str, path: str, embedding_model: Optional[str] = None,
+                          batch_size: int = 500) -> int:
+        """
+        从 export_collection 生成的 JSONL 文件导入记忆（按 id 覆盖写入）
+
+        Args:
+            name: 目标集合名称
+            path: 导入文件路径
+            embedding_model: 当前使用的 embedding 模型，与文件记录不一致时拒绝导入
+            batch_size: 每批写入数量
+
+        Returns:
+            导入的记忆数量
+        """
+        collection = self.get_or_create_collection(name)
+        imported = 0
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != MEMORY_EXPORT_FORMAT:
+                raise ValueError(f"不是有效的记忆导出文件: {path}")
+            file_model = header.get("embedding_model")
+            if embedding_model and file_model and file_model != embedding_model:
+                raise ValueError(
+                    f"embedding 模型不一致: 文件为 {file_model}，当前为 {embedding_model}"
+                )
+
+            batch: List[dict] = []
+
+            def _flush():
+                collection.upsert(
+                    ids=[r["id"] for r in batch],
+                    documents=[r["document"] for r in batch],
+                    metadatas=[r["metadata"] or {} for r in batch],
+                    embeddings=[r["embedding"] for r in batch],
+                )
+
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("embedding") is None:
+                    continue
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    _flush()
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                _flush()
+                imported += len(batch)
+
+        logger.info(f"📥 [ChromaDB] 集合 {name} 导入 {imported} 条记忆: {path}")
+        return imported
+
+    def export_all(self, directory: str, embedding_model: Optional[str] = None) -> Dict[str, int]:
+        """导出全部记忆集合到目录，每个集合一个 <name>.jsonl 文件"""
+        return {
+            name: self.export_collection(name, os.path.join(directory, f"{name}.jsonl"), embedding_model)
+            for name in MEMORY_COLLECTION_NAMES
+        }
+
+    def import_all(self, directory: str, embedding_model: Optional[str] = None) -> Dict[str, int]:
+        """从目录导入全部记忆集合，缺失的文件跳过"""
+        results = {}
+        for name in MEMORY_COLLECTION_NAMES:
+            path = os.path.join(directory, f"{name}.jsonl")
+            if os.path.exists(path):
+                results[name] = self.import_collection(name, path, embedding_model)
+        return results
 
 
 class FinancialSituationMemory:
@@ -323,6 +525,7 @@ class FinancialSituationMemory:
                 logger.warning(f"⚠️ 未找到OPENAI_API_KEY，记忆功能已禁用")
 
         # 使用单例ChromaDB管理器
+        self.name = name
         self.chroma_manager = ChromaDBManager()
         self.situation_collection = self.chroma_manager.get_or_create_collection(name)
 
@@ -529,22 +732,34 @@ class FinancialSituationMemory:
         advice = []
         ids = []
         embeddings = []
+        created_at = time.time()
 
-        offset = self.situation_collection.count()
-
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
+            # 以内容哈希作为ID：TTL删除后不会与新记忆冲突，重复写入同一情形时覆盖而非堆积
+            ids.append(hashlib.sha1(f"{situation}\x00{recommendation}".encode("utf-8")).hexdigest())
             embeddings.append(self.get_embedding(situation))
 
-        self.situation_collection.add(
+        self.situation_collection.upsert(
             documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
+            metadatas=[{"recommendation": rec, "created_at": created_at} for rec in advice],
             embeddings=embeddings,
             ids=ids,
         )
 
+    def compact(self, ttl_days: Optional[int] = None, max_items: Optional[int] = None) -> int:
+        """按 TTL / 容量上限压缩本记忆集合，返回删除数量"""
+        return self.chroma_manager.compact_collection(self.name, ttl_days, max_items)
+
+    def export_memories(self, path: str) -> int:
+        """导出本记忆集合（含 embedding）到 JSONL 文件"""
+        return self.chroma_manager.export_collection(self.name, path, self.embedding)
+
+    def import_memories(self, path: str) -> int:
+        """从 JSONL 文件导入记忆，不调用 embedding 接口"""
+        return self.chroma_manager.import_collection(self.name, path, self.embedding)
+
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using embeddings with smart truncation handling"""
         
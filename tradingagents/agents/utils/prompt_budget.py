@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+辩论提示词预算
+看涨/看跌研究员、风险辩论者和经理节点的提示词拼接完整的辩论历史和四份分析
+报告，历史每轮增长，轮数大于1时提示词 token 数（以及 LLM 延迟和费用）随轮数
+二次增长。本模块为这些提示词提供 token 预算：
+
+- estimate_tokens: 本地估算 token 数（中日韩字符按1个、其他字符按4个折合1个），无需分词器
+- compact_debate_history: 最近的发言原文保留，超出预算的较早发言替换为运行摘要；
+  每条发言的摘要按内容缓存，只计算一次，后续轮次和节点直接复用
+- fit_report: 单份分析报告超出预算时保留开头和结尾（结论、建议通常在结尾），省略中间部分
+- fit_debate_inputs: 辩论节点一次压缩辩论历史和各份分析报告
+- record_prompt: 按节点统计提示词 token 数，用于在吞吐与质量之间调优
+
+【使用方式】
+from tradingagents.agents.utils.prompt_budget import fit_debate_inputs, record_prompt
+prompt_history, market_research_report, news_report = fit_debate_inputs(history, market_research_report, news_report)
+record_prompt("bull_researcher", prompt)
+
+【配置】
+DEBATE_HISTORY_TOKEN_BUDGET    辩论历史的 token 预算，0 表示不限制（默认 6000）
+DEBATE_REPORT_TOKEN_BUDGET     单份分析报告的 token 预算，0 表示不限制（默认 6000）
+DEBATE_SUMMARY_TURN_CHARS      运行摘要中每条较早发言保留的字符数（默认 160）
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 辩论历史中每条发言的开头（各节点以 "<角色> Analyst: " 追加发言）
+_TURN_PATTERN = re.compile(r'\n(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst: )')
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+_SENTENCE_END = re.compile(r'(?<=[。！？!?；;])')
+
+# 发言摘要缓存上限（条）
+_SUMMARY_CACHE_SIZE = 2048
+
+# 截断报告时开头部分占预算的比例，其余留给结尾
+_REPORT_HEAD_RATIO = 0.4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """估算 token 数：中日韩字符约1个token，其余字符约4个折合1个token"""
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def split_turns(history: str) -> List[str]:
+    """按发言拆分辩论历史"""
+    return [turn.strip() for turn in _TURN_PATTERN.split(history or '') if turn.strip()]
+
+
+class PromptBudget:
+    """辩论提示词的 token 预算、发言摘要缓存与按节点统计"""
+
+    def __init__(self):
+        self.history_budget = max(0, parse_int_env("DEBATE_HISTORY_TOKEN_BUDGET", 6000))
+        self.report_budget = max(0, parse_int_env("DEBATE_REPORT_TOKEN_BUDGET", 6000))
+        self.summary_turn_chars = max(40, parse_int_env("DEBATE_SUMMARY_TURN_CHARS", 160))
+
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._node_stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._summary_hits = 0
+        self._summary_misses = 0
+
+    # ==================== 运行摘要 ====================
+
+    def _summarize_turn(self, turn: str) -> str:
+        """取发言的角色和开头几句作为摘要"""
+        speaker, _, content = turn.partition(': ')
+        content = re.sub(r'\s+', ' ', content).strip()
+        summary = ''
+        for sentence in _SENTENCE_END.split(content):
+            if summary and len(summary) + len(sentence) > self.summary_turn_chars:
+                break
+            summary += sentence
+        if len(summary) > self.summary_turn_chars:
+            summary = summary[:self.summary_turn_chars] + '…'
+        return f"- {speaker}: {summary}"
+
+    def summarize_turn(self, turn: str) -> str:
+        """获取单条发言的摘要，按内容缓存，每条发言只计算一次"""
+        key = hashlib.sha1(turn.encode('utf-8')).hexdigest()
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+                self._summary_hits += 1
+                return summary
+            self._summary_misses += 1
+
+        summary = self._summarize_turn(turn)
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > _SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def compact_history(self, history: str, budget: Optional[int] = None) -> str:
+        """
+        将辩论历史压缩到预算内：从最近的发言往前保留原文，其余发言替换为运行摘要
+
+        Args:
+            history: 完整辩论历史
+            budget: token 预算，None 时使用 DEBATE_HISTORY_TOKEN_BUDGET
+
+        Returns:
+            预算内的历史文本；未超出预算时原样返回
+        """
+        budget = self.history_budget if budget is None else budget
+        if not history or budget <= 0 or estimate_tokens(history) <= budget:
+            return history
+
+        turns = split_turns(history)
+        kept: List[str] = []
+        used = 0
+        # 至少保留最近一条发言原文，对方的最新论点必须完整可见
+        for turn in reversed(turns):
+            tokens = estimate_tokens(turn)
+            if kept and used + tokens > budget:
+                break
+            kept.insert(0, turn)
+            used += tokens
+
+        earlier = turns[:len(turns) - len(kept)]
+        if not earlier:
+            return history
+
+        summary_lines = [self.summarize_turn(turn) for turn in earlier]
+        # 摘要本身超出剩余预算时只保留最近的摘要行
+        remaining = max(budget - used, 0)
+        while len(summary_lines) > 1 and estimate_tokens('\n'.join(summary_lines)) > remaining:
+            summary_lines.pop(0)
+
+        logger.debug(f"✂️ [提示词预算] 辩论历史 {len(turns)} 条发言，{len(earlier)} 条较早发言以摘要代替")
+        return (
+            f"【较早发言摘要（共{len(earlier)}条）】\n" + '\n'.join(summary_lines)
+            + "\n\n【最近发言原文】\n" + '\n'.join(kept)
+        )
+
+    # ==================== 分析报告 ====================
+
+    @staticmethod
+    def _chars_within(text: str, budget: int, tokens: int) -> int:
+        """不超过预算的字符数：按 token 比例估算，再逐步收缩"""
+        cut = int(len(text) * budget / tokens)
+        while cut > 0 and estimate_tokens(text[:cut]) > budget:
+            cut = int(cut * 0.95)
+        return cut
+
+    def fit_report(self, report: str, budget: Optional[int] = None) -> str:
+        """单份分析报告超出预算时保留开头和结尾，省略中间部分"""
+        budget = self.report_budget if budget is None else budget
+        if not report or budget <= 0:
+            return report
+        tokens = estimate_tokens(report)
+        if tokens <= budget:
+            return report
+        head_budget = int(budget * _REPORT_HEAD_RATIO)
+        head = report[:self._chars_within(report, head_budget, tokens)]
+        reversed_report = report[::-1]
+        tail_chars = self._chars_within(reversed_report, budget - head_budget, tokens)
+        tail = report[len(report) - tail_chars:] if tail_chars else ''
+        return head + f"\n……（中间部分已省略，原文约{tokens}个token）……\n" + tail
+
+    # ==================== 统计 ====================
+
+    def record_prompt(self, node: str, prompt: str) -> int:
+        """记录节点提示词的 token 数"""
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            stats = self._node_stats.setdefault(node, {"calls": 0, "prompt_tokens": 0, "max_prompt_tokens": 0, "last_prompt_tokens": 0})
+            stats["calls"] += 1
+            stats["prompt_tokens"] += tokens
+            stats["max_prompt_tokens"] = max(stats["max_prompt_tokens"], tokens)
+            stats["last_prompt_tokens"] = tokens
+        logger.info(f"📏 [提示词预算] {node} 提示词约 {tokens} tokens")
+        return tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取预算配置、摘要缓存命中与按节点的提示词 token 统计"""
+        with self._lock:
+            nodes = {}
+            for node, stats in self._node_stats.items():
+                nodes[node] = dict(stats)
+                nodes[node]["avg_prompt_tokens"] = round(stats["prompt_tokens"] / stats["calls"]) if stats["calls"] else 0
+            return {
+                "history_budget": self.history_budget,
+                "report_budget": self.report_budget,
+                "summary_cache": {"size": len(self._summaries), "hits": self._summary_hits, "misses": self._summary_misses},
+                "nodes": nodes,
+            }
+
+
+prompt_budget: Optional[PromptBudget] = None
+_prompt_budget_lock = threading.Lock()
+
+
+def get_prompt_budget() -> PromptBudget:
+    """获取全局提示词预算（懒加载单例）"""
+    global prompt_budget
+    if prompt_budget is None:
+        with _prompt_budget_lock:
+            if prompt_budget is None:
+                prompt_budget = PromptBudget()
+    return prompt_budget
+
+
+def compact_debate_history(history: str) -> str:
+    """按 DEBATE_HISTORY_TOKEN_BUDGET 压缩辩论历史"""
+    return get_prompt_budget().compact_history(history)
+
+
+def fit_report(report: str) -> str:
+    """按 DEBATE_REPORT_TOKEN_BUDGET 截断单份分析报告"""
+    return get_prompt_budget().fit_report(report)
+
+
+def fit_debate_inputs(history: str, *reports: str) -> Tuple[str, ...]:
+    """
+    压缩辩论节点提示词的输入（状态中仍保存完整历史和报告）
+
+    Returns:
+        (压缩后的辩论历史, 各份截断后的报告...)
+    """
+    budget = get_prompt_budget()
+    return (budget.compact_history(history),) + tuple(budget.fit_report(report) for report in reports)
+
+
+def record_prompt(node: str, prompt: str) -> int:
+    """记录节点提示词的 token 数"""
+    return get_prompt_budget().record_prompt(node, prompt)
+
+
+def get_prompt_budget_stats() -> Dict[str, Any]:
+    """获取提示词预算统计，未初始化时返回空统计"""
+    if prompt_budget is None:
+        return {"nodes": {}}
+    return prompt_budget.get_stats()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+并发工具执行器
+模型一次返回多个 tool_calls 时，各工具（行情、新闻、财务数据等）彼此独立，
+逐个执行会使一轮分析的耗时等于所有工具耗时之和。本模块在共享的有界线程池中
+并发执行同一轮的工具调用：
+
+- 工具按名称建立字典，O(1) 查找，替代逐个遍历工具列表比较名称
+- 每个工具调用有独立超时，从调用开始执行时计时（线程池排队时间不计入），
+  超时的调用返回错误文本，不阻塞同一轮的其他结果；排队超过同样时长的调用直接取消
+- 线程池饱和（新调用需要排队）时记录日志并计数，便于调整 TOOL_EXECUTOR_MAX_WORKERS
+- 返回的 ToolMessage 顺序与 tool_calls 顺序一致，与执行完成的先后无关
+- ConcurrentToolNode 可替代 langgraph 的 ToolNode 作为图中的工具节点
+
+注意：线程无法被强制中止，超时只是不再等待结果，卡住的调用会一直占用线程池线程。
+工具内部的网络请求、数据库查询等 I/O 必须自行设置超时（如 requests 的 timeout 参数），
+TOOL_CALL_TIMEOUT 只是兜底。
+
+【使用方式】
+from tradingagents.agents.utils.tool_executor import build_tool_map, execute_tool_calls
+tool_map = build_tool_map(tools)
+tool_messages = execute_tool_calls(result.tool_calls, tool_map)
+
+【配置】
+TOOL_EXECUTOR_MAX_WORKERS   全局工具线程池大小（默认 8）
+TOOL_CALL_TIMEOUT           单个工具调用的超时秒数（默认 120）
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from tradingagents.agents.utils.tool_prefetch import lookup_prefetched
+from tradingagents.config.env_utils import parse_float_env, parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+ToolsType = Union[Mapping[str, Any], Iterable[Any]]
+
+
+def get_tool_name(tool: Any) -> str:
+    """获取工具名称（LangChain 工具取 name，普通函数取 __name__）"""
+    if hasattr(tool, 'name'):
+        return tool.name
+    if hasattr(tool, '__name__'):
+        return tool.__name__
+    return str(tool)
+
+
+def build_tool_map(tools: ToolsType) -> Dict[str, Any]:
+    """构建 名称 -> 工具 字典，已是字典时直接返回"""
+    if isinstance(tools, Mapping):
+        return dict(tools)
+    return {get_tool_name(tool): tool for tool in tools}
+
+
+def invoke_tool(tool: Any, tool_args: Dict[str, Any]) -> Any:
+    """执行单个工具：优先使用任务预取的结果，LangChain 工具使用 invoke，普通函数直接调用"""
+    prefetched = lookup_prefetched(get_tool_name(tool), tool_args)
+    if prefetched is not None:
+        return prefetched
+    if hasattr(tool, 'invoke'):
+        return tool.invoke(tool_args)
+    if callable(tool):
+        return tool(**tool_args)
+    return f"工具类型不支持: {type(tool)}"
+
+
+class _CallStart:
+    """记录工具调用的提交时间和开始执行时间"""
+
+    __slots__ = ("event", "submitted", "at")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.submitted = time.monotonic()
+        self.at = 0.0
+
+    def mark(self):
+        self.at = time.monotonic()
+        self.event.set()
+
+
+class ToolExecutor:
+    """在有界线程池中并发执行工具调用"""
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: Optional[float] = None):
+        """
+        Args:
+            max_workers: 线程池大小，所有分析任务共享
+            default_timeout: 单个工具调用的默认超时秒数
+        """
+        if max_workers is None:
+            max_workers = parse_int_env("TOOL_EXECUTOR_MAX_WORKERS", 8)
+        if default_timeout is None:
+            default_timeout = parse_float_env("TOOL_CALL_TIMEOUT", 120.0)
+
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = max(1.0, default_timeout)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ToolExecutor")
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0, "calls": 0, "errors": 0, "timeouts": 0, "not_found": 0,
+            "queue_timeouts": 0, "saturated": 0,
+        }
+        # 已提交未开始执行 / 正在执行的调用数
+        self._queued = 0
+        self._active = 0
+
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _count_active(self, value: int):
+        with self._lock:
+            self._active += value
+
+    def _wait_result(self, future: Future, call_start: _CallStart, tool_name: str, call_timeout: float) -> str:
+        """等待单个调用：排队最多 call_timeout 秒，开始执行后再计 call_timeout 秒"""
+        queue_deadline = call_start.submitted + call_timeout
+        while not call_start.event.wait(timeout=max(0.0, queue_deadline - time.monotonic())):
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+                    self._stats["queue_timeouts"] += 1
+                logger.error(f"⏰ [工具执行] {tool_name} 排队超时（{call_timeout:g}s），线程池已满")
+                return f"工具执行失败: {tool_name} 排队超时（{call_timeout:g}秒）"
+            # 取消失败说明调用刚开始执行，继续等待开始标记
+            queue_deadline = time.monotonic() + 1.0
+        try:
+            return future.result(timeout=max(0.0, call_start.at + call_timeout - time.monotonic()))
+        except FutureTimeoutError:
+            # 线程无法强制中止，超时的调用在后台结束后结果被丢弃
+            self._count("timeouts")
+            logger.error(f"⏰ [工具执行] {tool_name} 超时（{call_timeout:g}s）")
+            return f"工具执行失败: {tool_name} 执行超时（{call_timeout:g}秒）"
+
+    def _submit(self, tool: Any, tool_name: str, tool_args: Dict[str, Any], call_start: _CallStart) -> Future:
+        """提交单个调用，线程池已满时记录饱和"""
+        with self._lock:
+            active, queued = self._active, self._queued
+            self._queued += 1
+            saturated = active + queued >= self.max_workers
+            if saturated:
+                self._stats["saturated"] += 1
+        if saturated:
+            logger.warning(
+                f"⚠️ [工具执行] 线程池已满（{self.max_workers} 个线程），{tool_name} 需要排队，"
+                f"执行中 {active} 个，排队中 {queued} 个"
+            )
+        # 复制调用方上下文（当前任务、token 流等 contextvars），线程池线程默认不继承
+        context = contextvars.copy_context()
+        return self._pool.submit(context.run, self._run_one, tool, tool_name, tool_args, call_start)
+
+    def _run_one(self, tool: Any, tool_name: str, tool_args: Dict[str, Any], call_start: _CallStart) -> str:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        call_start.mark()
+        start = time.perf_counter()
+        try:
+            result = invoke_tool(tool, tool_args)
+        except Exception as e:
+            self._count("errors")
+            logger.error(f"❌ [工具执行] {tool_name} 执行失败: {e}")
+            return f"工具执行失败: {str(e)}"
+        finally:
+            self._count_active(-1)
+        logger.debug(
+            f"🔧 [工具执行] {tool_name} 完成，耗时 {time.perf_counter() - start:.2f}s，"
+            f"结果长度: {len(str(result))}"
+        )
+        return str(result)
+
+    def execute(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        tools: ToolsType,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Mapping[str, float]] = None,
+    ) -> List[ToolMessage]:
+        """
+        并发执行一轮工具调用
+
+        Args:
+            tool_calls: 模型返回的 tool_calls（含 name / args / id）
+            tools: 工具列表或 名称 -> 工具 字典
+            timeout: 本次调用的默认超时秒数，None 时使用执行器默认值
+            timeouts: 按工具名称覆盖的超时秒数
+
+        Returns:
+            List[ToolMessage]: 与 tool_calls 顺序一致的工具消息
+        """
+        tool_map = build_tool_map(tools)
+        default_timeout = timeout if timeout is not None else self.default_timeout
+        timeouts = timeouts or {}
+        self._count("batches")
+        self._count("calls", len(tool_calls))
+
+        start = time.monotonic()
+        pending: List[Union[Future, str]] = []
+        call_starts: List[Optional[_CallStart]] = []
+        for tool_call in tool_calls:
+            tool_name = tool_call.get('name')
+            tool = tool_map.get(tool_name)
+            if tool is None:
+                self._count("not_found")
+                logger.warning(f"⚠️ [工具执行] 未找到工具: {tool_name}，可用: {list(tool_map)}")
+                pending.append(f"未找到工具: {tool_name}")
+                call_starts.append(None)
+                continue
+            call_start = _CallStart()
+            pending.append(self._submit(tool, tool_name, tool_call.get('args', {}) or {}, call_start))
+            call_starts.append(call_start)
+
+        messages = []
+        for tool_call, item, call_start in zip(tool_calls, pending, call_starts):
+            tool_name = tool_call.get('name')
+            content = item
+            if isinstance(item, Future):
+                content = self._wait_result(item, call_start, tool_name, timeouts.get(tool_name, default_timeout))
+            messages.append(ToolMessage(content=content, tool_call_id=tool_call.get('id'), name=tool_name))
+
+        if len(tool_calls) > 1:
+            logger.info(
+                f"🔧 [工具执行] 并发执行 {len(tool_calls)} 个工具调用，"
+                f"总耗时 {time.monotonic() - start:.2f}s"
+            )
+        return messages
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取线程池配置与调用统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queued"] = self._queued
+            stats["active"] = self._active
+        stats["max_workers"] = self.max_workers
+        stats["default_timeout"] = self.default_timeout
+        return stats
+
+
+class ConcurrentToolNode:
+    """图中的工具节点：并发执行最后一条 AIMessage 的 tool_calls"""
+
+    def __init__(self, tools: ToolsType, timeout: Optional[float] = None,
+                 timeouts: Optional[Mapping[str, float]] = None):
+        self.tools_by_name = build_tool_map(tools)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, List[ToolMessage]]:
+        messages = state.get("messages", []) if isinstance(state, dict) else state
+        ai_message = next((msg for msg in reversed(messages) if isinstance(msg, AIMessage)), None)
+        if ai_message is None or not ai_message.tool_calls:
+            return {"messages": []}
+        return {
+            "messages": get_tool_executor().execute(
+                ai_message.tool_calls, self.tools_by_name, timeout=self.timeout, timeouts=self.timeouts
+            )
+        }
+
+
+tool_executor: Optional[ToolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """获取全局工具执行器（懒加载单例）"""
+    global tool_executor
+    if tool_executor is None:
+        with _tool_executor_lock:
+            if tool_executor is None:
+                tool_executor = ToolExecutor()
+    return tool_executor
+
+
+def execute_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools: ToolsType,
+    timeout: Optional[float] = None,
+    timeouts: Optional[Mapping[str, float]] = None,
+) -> List[ToolMessage]:
+    """使用全局执行器并发执行工具调用，参数同 ToolExecutor.execute"""
+    return get_tool_executor().execute(tool_calls, tools, timeout=timeout, timeouts=timeouts)
+
+
+def get_tool_executor_stats() -> Dict[str, Any]:
+    """获取全局工具执行器统计，未初始化时返回空统计"""
+    if tool_executor is None:
+        return {"calls": 0}
+    return tool_executor.get_stats()
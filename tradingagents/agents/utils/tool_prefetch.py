@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+分析任务数据预取
+分析师在引擎初始化完成、LLM 决定调用工具之后才开始获取数据，行情、基本面
+等数据获取被串行排在 LLM 思考时间之后。而给定市场与分析日期，分析师将调用的
+工具及其参数高度可预测，本模块在任务被 TaskManager 接受时即按所选分析师并发
+执行这些预期的工具调用：
+
+- 预取结果按 工具名称 + 参数 缓存，分析师实际调用参数一致时直接命中
+- 命中时若预取仍在进行，等待其完成而不是重复请求；等待超过 TOOL_PREFETCH_WAIT_SECONDS
+  时放弃预取结果，由调用方直接执行工具，卡住的数据源不会拖住分析师节点
+- 预取同时预热各数据源自身的缓存，参数不一致的调用也能受益
+- 任务结束时将预取命中率写入任务记录（prefetch 字段），命中只计入发起调用的任务
+
+【使用方式】
+from tradingagents.agents.utils.tool_prefetch import get_tool_prefetcher, prefetch_task_context
+get_tool_prefetcher().start(task_id, params)             # 任务接受时
+with prefetch_task_context(task_id):                      # 任务线程执行分析期间
+    result = get_tool_prefetcher().lookup(tool_name, args)    # 工具执行前，未命中返回 None
+
+【配置】
+TOOL_PREFETCH_ENABLED           是否启用预取（默认 true）
+TOOL_PREFETCH_MAX_WORKERS       预取线程池大小（默认 4）
+TOOL_PREFETCH_TTL_SECONDS       预取结果保留秒数（默认 900）
+TOOL_PREFETCH_WAIT_SECONDS      工具调用等待进行中预取的最长秒数（默认 30，应小于 TOOL_CALL_TIMEOUT）
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_bool_env, parse_float_env, parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 工具返回以下内容时视为获取失败，不作为预取结果提供
+_FAILURE_MARKERS = ("❌", "获取失败")
+
+
+# 当前执行分析的任务 ID，由 AnalysisTask 设置，用于按任务统计命中
+_current_task_id: contextvars.ContextVar = contextvars.ContextVar('tool_prefetch_task_id', default=None)
+
+
+@contextlib.contextmanager
+def prefetch_task_context(task_id: str):
+    """在任务执行期间标记当前任务，工具调用命中预取时只计入该任务"""
+    token = _current_task_id.set(task_id)
+    try:
+        yield
+    finally:
+        _current_task_id.reset(token)
+
+
+def make_call_key(tool_name: str, tool_args: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """生成 工具名称 + 参数 的缓存键（忽略值为空的参数，参数顺序无关）"""
+    args = tuple(sorted(
+        (str(key), str(value).strip())
+        for key, value in (tool_args or {}).items()
+        if value not in (None, '')
+    ))
+    return tool_name, args
+
+
+def _is_failed_result(result: Any) -> bool:
+    text = str(result or '')
+    return not text.strip() or any(marker in text for marker in _FAILURE_MARKERS)
+
+
+class PrefetchEntry:
+    """单个预取的工具调用"""
+
+    def __init__(self, tool_name: str, tool_args: Dict[str, Any], future: Future):
+        self.tool_name = tool_name
+        self.tool_args = tool_args
+        self.future = future
+        self.created_at = time.time()
+        self.task_ids = set()
+        self.hit_task_ids = set()
+
+    @property
+    def failed(self) -> bool:
+        """预取已结束且抛出异常或返回失败内容"""
+        if not self.future.done():
+            return False
+        return self.future.exception() is not None or _is_failed_result(self.future.result())
+
+
+class ToolPrefetcher:
+    """按所选分析师预取预期的工具调用结果"""
+
+    def __init__(self):
+        self.enabled = parse_bool_env("TOOL_PREFETCH_ENABLED", True)
+        self.max_workers = max(1, parse_int_env("TOOL_PREFETCH_MAX_WORKERS", 4))
+        self.ttl_seconds = max(60, parse_int_env("TOOL_PREFETCH_TTL_SECONDS", 900))
+        self.wait_seconds = max(0.0, parse_float_env("TOOL_PREFETCH_WAIT_SECONDS", 30.0))
+
+        # 独立线程池：工具执行线程可能等待预取结果，共用线程池会互相阻塞
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ToolPrefetch")
+        self._entries: Dict[Tuple, PrefetchEntry] = {}
+        self._task_keys: Dict[str, List[Tuple]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "shared": 0, "lookups": 0, "hits": 0, "wait_timeouts": 0}
+
+    # ==================== 预取计划 ====================
+
+    def plan(self, params: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        根据任务参数生成预期的工具调用
+
+        Args:
+            params: 任务参数（stock_symbol / market_type / analysis_date / analysts / extra_config）
+
+        Returns:
+            [(工具名称, 参数), ...]
+        """
+        from tradingagents.utils.analysis_helpers import format_stock_symbol
+
+        stock_symbol = params.get('stock_symbol')
+        if not stock_symbol:
+            return []
+        ticker = format_stock_symbol(stock_symbol, params.get('market_type', '美股'))
+        current_date = params.get('analysis_date') or datetime.now().strftime('%Y-%m-%d')
+        try:
+            current = datetime.strptime(current_date, '%Y-%m-%d')
+        except ValueError:
+            logger.warning(f"⚠️ [数据预取] 分析日期格式无效，跳过预取: {current_date}")
+            return []
+
+        # 结果复用模式下对应节点不会调用工具
+        extra_config = params.get('extra_config') or {}
+        reuse_mode = str(extra_config.get('cache_reuse_mode') or '').strip().lower()
+        if reuse_mode == 'true':
+            return []
+        reused_nodes = {node.strip() for node in reuse_mode.split(',') if node.strip()}
+
+        calls = []
+        for analyst in params.get('analysts', []):
+            if analyst in reused_nodes or f"{analyst}_analyst" in reused_nodes:
+                continue
+            if analyst == 'market':
+                from tradingagents.agents.analysts.market_analyst import MARKET_ANALYSIS_WINDOW_DAYS
+                start_date = (current - timedelta(days=MARKET_ANALYSIS_WINDOW_DAYS)).strftime('%Y-%m-%d')
+                calls.append(("get_stock_market_data_unified", {
+                    'ticker': ticker,
+                    'start_date': start_date,
+                    'end_date': current_date,
+                }))
+            elif analyst == 'fundamentals':
+                from tradingagents.agents.analysts.fundamentals_analyst import FUNDAMENTALS_ANALYSIS_WINDOW_DAYS
+                start_date = (current - timedelta(days=FUNDAMENTALS_ANALYSIS_WINDOW_DAYS)).strftime('%Y-%m-%d')
+                calls.append(("get_stock_fundamentals_unified", {
+                    'ticker': ticker,
+                    'start_date': start_date,
+                    'end_date': current_date,
+                    'curr_date': current_date,
+                }))
+        return calls
+
+    # ==================== 预取执行 ====================
+
+    @staticmethod
+    def _run_call(tool_name: str, tool_args: Dict[str, Any]) -> str:
+        from tradingagents.agents.utils.agent_utils import Toolkit
+
+        start = time.perf_counter()
+        result = str(getattr(Toolkit, tool_name).invoke(tool_args))
+        logger.info(f"⚡ [数据预取] {tool_name} 完成，耗时 {time.perf_counter() - start:.2f}s")
+        return result
+
+    def _purge_expired(self):
+        """清理过期的预取结果（调用方需持有锁）"""
+        now = time.time()
+        expired = [key for key, entry in self._entries.items()
+                   if entry.future.done() and now - entry.created_at > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+
+    def start(self, task_id: str, params: Dict[str, Any]) -> int:
+        """
+        为任务提交预取，立即返回
+
+        Returns:
+            int: 本次计划的预取调用数
+        """
+        if not self.enabled:
+            return 0
+        try:
+            calls = self.plan(params)
+        except Exception as e:
+            logger.warning(f"⚠️ [数据预取] 生成预取计划失败: {e}")
+            return 0
+
+        keys = []
+        with self._lock:
+            self._purge_expired()
+            for tool_name, tool_args in calls:
+                key = make_call_key(tool_name, tool_args)
+                entry = self._entries.get(key)
+                if entry is None or entry.failed:
+                    future = self._pool.submit(self._run_call, tool_name, tool_args)
+                    entry = self._entries[key] = PrefetchEntry(tool_name, tool_args, future)
+                    self._stats["submitted"] += 1
+                else:
+                    # 其他任务已预取相同的调用
+                    self._stats["shared"] += 1
+                entry.task_ids.add(task_id)
+                keys.append(key)
+            self._task_keys[task_id] = keys
+
+        if calls:
+            logger.info(f"⚡ [数据预取] 任务 {task_id} 提交 {len(calls)} 个预取: {[name for name, _ in calls]}")
+        return len(calls)
+
+    def lookup(self, tool_name: str, tool_args: Dict[str, Any], timeout: Optional[float] = None,
+               task_id: Optional[str] = None) -> Optional[str]:
+        """
+        查找预取结果，预取仍在进行时等待其完成
+
+        Args:
+            tool_name / tool_args: 工具名称与参数
+            timeout: 等待进行中预取的秒数，None 时使用 TOOL_PREFETCH_WAIT_SECONDS
+            task_id: 发起调用的任务，None 时取 prefetch_task_context 设置的当前任务
+
+        Returns:
+            预取的工具结果；未预取、预取失败或超时返回 None
+        """
+        key = make_call_key(tool_name, tool_args)
+        with self._lock:
+            self._stats["lookups"] += 1
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        wait_seconds = self.wait_seconds if timeout is None else timeout
+        try:
+            result = entry.future.result(timeout=wait_seconds)
+        except FutureTimeoutError:
+            with self._lock:
+                self._stats["wait_timeouts"] += 1
+            logger.warning(f"⏰ [数据预取] {tool_name} 预取 {wait_seconds:g}s 内未完成，直接执行工具")
+            return None
+        except Exception as e:
+            logger.debug(f"⚡ [数据预取] {tool_name} 预取结果不可用: {e}")
+            return None
+        if _is_failed_result(result):
+            return None
+
+        if task_id is None:
+            task_id = _current_task_id.get()
+        with self._lock:
+            self._stats["hits"] += 1
+            if task_id is not None:
+                entry.hit_task_ids.add(task_id)
+        logger.info(f"⚡ [数据预取] {tool_name} 命中预取结果")
+        return result
+
+    # ==================== 统计 ====================
+
+    def get_task_stats(self, task_id: str) -> Dict[str, Any]:
+        """获取任务的预取统计：计划数、完成数、失败数、被实际调用命中的数量与命中率"""
+        with self._lock:
+            entries = [self._entries[key] for key in self._task_keys.get(task_id, []) if key in self._entries]
+        planned = len(entries)
+        completed = sum(1 for entry in entries if entry.future.done())
+        failed = sum(1 for entry in entries if entry.failed)
+        hits = sum(1 for entry in entries if task_id in entry.hit_task_ids)
+        return {
+            "planned": planned,
+            "completed": completed,
+            "failed": failed,
+            "hits": hits,
+            "hit_rate": round(hits / planned, 3) if planned else 0.0,
+            "tools": {entry.tool_name: task_id in entry.hit_task_ids for entry in entries},
+        }
+
+    def finish(self, task_id: str) -> Dict[str, Any]:
+        """任务结束：返回最终统计并释放任务记录，预取结果保留至过期供其他任务复用"""
+        stats = self.get_task_stats(task_id)
+        with self._lock:
+            self._task_keys.pop(task_id, None)
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取全局预取统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_results"] = len(self._entries)
+            stats["active_tasks"] = len(self._task_keys)
+        stats["enabled"] = self.enabled
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        return stats
+
+
+tool_prefetcher: Optional[ToolPrefetcher] = None
+_tool_prefetcher_lock = threading.Lock()
+
+
+def get_tool_prefetcher() -> ToolPrefetcher:
+    """获取全局预取器（懒加载单例）"""
+    global tool_prefetcher
+    if tool_prefetcher is None:
+        with _tool_prefetcher_lock:
+            if tool_prefetcher is None:
+                tool_prefetcher = ToolPrefetcher()
+    return tool_prefetcher
+
+
+def lookup_prefetched(tool_name: str, tool_args: Dict[str, Any]) -> Optional[str]:
+    """查找预取结果，预取器未初始化（未提交过预取）时直接返回 None"""
+    if tool_prefetcher is None:
+        return None
+    return tool_prefetcher.lookup(tool_name, tool_args)
+
+
+def get_tool_prefetch_stats() -> Dict[str, Any]:
+    """获取全局预取统计，未初始化时返回空统计"""
+    if tool_prefetcher is None:
+        return {"lookups": 0}
+    return tool_prefetcher.get_stats()
@@ -9,12 +9,14 @@ import json
 import pickle
 import hashlib
 import logging
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 import pandas as pd
 
 from tradingagents.storage.manager import get_database_manager
+from tradingagents.dataflows.cache_codec import encode_dataframe, decode_payload
 
 class AdaptiveCacheSystem:
     """自适应缓存系统"""
@@ -66,19 +68,47 @@ class AdaptiveCacheSystem:
         expiry_time = cache_time + timedelta(seconds=ttl_seconds)
         return datetime.now() < expiry_time
     
+    def _is_fresh(self, cache_data: Dict) -> bool:
+        """检查缓存是否有效（仅对文件缓存，数据库缓存有自己的TTL机制）"""
+        if cache_data.get('backend') != 'file':
+            return True
+        symbol = cache_data['metadata'].get('symbol', '')
+        data_type = cache_data['metadata'].get('data_type', 'stock_data')
+        return self._is_cache_valid(cache_data['timestamp'], self._get_ttl_seconds(symbol, data_type))
+
+    # ==================== 文件缓存 ====================
+    # 新格式：{cache_key}.meta.json 保存元数据，{cache_key}.pkl 只保存数据；
+    # 旧格式：{cache_key}.pkl 保存 {'data', 'metadata', 'timestamp', 'backend'}
+    # 两个文件均先写临时文件再 os.replace，读取方不会看到写了一半的文件
+
+    _LEGACY_FILE_KEYS = {'data', 'metadata', 'timestamp'}
+
+    def _file_paths(self, cache_key: str):
+        return self.cache_dir / f"{cache_key}.meta.json", self.cache_dir / f"{cache_key}.pkl"
+
+    @staticmethod
+    def _write_file_atomic(path: Path, write, binary: bool):
+        """写入同目录的临时文件后原子替换目标文件"""
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb' if binary else 'w', **({} if binary else {'encoding': 'utf-8'})) as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def _save_to_file(self, cache_key: str, data: Any, metadata: Dict) -> bool:
         """保存到文件缓存"""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            cache_data = {
-                'data': data,
-                'metadata': metadata,
-                'timestamp': datetime.now(),
-                'backend': 'file'
-            }
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(cache_data, f)
+            meta_file, data_file = self._file_paths(cache_key)
+            self._write_file_atomic(data_file, lambda f: pickle.dump(data, f), binary=True)
+            # 数据写完后再写元数据，元数据存在即表示数据完整
+            meta = {'metadata': metadata, 'timestamp': datetime.now().isoformat()}
+            self._write_file_atomic(meta_file, lambda f: json.dump(meta, f, ensure_ascii=False), binary=False)
             
             self.logger.debug(f"文件缓存保存成功: {cache_key}")
             return True
@@ -87,15 +117,44 @@ class AdaptiveCacheSystem:
             self.logger.error(f"文件缓存保存失败: {e}")
             return False
     
+    def _load_file_metadata(self, cache_key: str) -> Optional[Dict]:
+        """
+        只读取文件缓存的元数据（旧格式缓存没有单独的元数据，整体加载）
+
+        只有数据文件、没有元数据的新格式缓存（并发首次写入或写入中断）视为未命中。
+        """
+        try:
+            meta_file, data_file = self._file_paths(cache_key)
+            if meta_file.exists():
+                with open(meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                return {
+                    'metadata': meta['metadata'],
+                    'timestamp': datetime.fromisoformat(meta['timestamp']),
+                    'backend': 'file'
+                }
+            if data_file.exists():
+                with open(data_file, 'rb') as f:
+                    legacy = pickle.load(f)
+                if isinstance(legacy, dict) and self._LEGACY_FILE_KEYS <= legacy.keys():
+                    return legacy
+            return None
+        except Exception as e:
+            self.logger.error(f"文件缓存元数据读取失败: {e}")
+            return None
+    
     def _load_from_file(self, cache_key: str) -> Optional[Dict]:
-        """从文件缓存加载"""
+        """从文件缓存加载，过期时不读取数据"""
+        cache_data = self._load_file_metadata(cache_key)
+        if not cache_data or 'data' in cache_data:
+            return cache_data
+        if not self._is_fresh(cache_data):
+            self.logger.debug(f"文件缓存已过期: {cache_key}")
+            return None
+        
         try:
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            if not cache_file.exists():
-                return None
-            
-            with open(cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
+            with open(self._file_paths(cache_key)[1], 'rb') as f:
+                cache_data['data'] = pickle.load(f)
             
             self.logger.debug(f"文件缓存加载成功: {cache_key}")
             return cache_data
@@ -104,22 +163,50 @@ class AdaptiveCacheSystem:
             self.logger.error(f"文件缓存加载失败: {e}")
             return None
     
+    # ==================== Redis缓存 ====================
+    # 新格式：{cache_key}:meta 保存元数据（JSON），{cache_key} 只保存数据（pickle），两者TTL相同；
+    # 旧格式：{cache_key} 保存 pickle 后的 {'data', 'metadata', 'timestamp', 'backend'}
+    # 数据库管理器的Redis客户端会把响应解码为字符串，pickle 数据经二进制客户端读写
+
+    @staticmethod
+    def _redis_meta_key(cache_key: str) -> str:
+        return f"{cache_key}:meta"
+
+    def _get_redis_binary_client(self):
+        """获取不解码响应的Redis客户端，Redis不可用时返回 None"""
+        if not self.db_manager.get_redis_client():
+            return None
+        from tradingagents.storage.redis.connection import get_redis_binary_client
+        return get_redis_binary_client()
+
+    @staticmethod
+    def _parse_redis_metadata(raw: Any) -> Dict:
+        meta = json.loads(raw)
+        return {
+            'metadata': meta['metadata'],
+            'timestamp': datetime.fromisoformat(meta['timestamp']),
+            'backend': 'redis'
+        }
+
+    @staticmethod
+    def _parse_redis_legacy(serialized_data: bytes) -> Dict:
+        cache_data = pickle.loads(serialized_data)
+        if isinstance(cache_data['timestamp'], str):
+            cache_data['timestamp'] = datetime.fromisoformat(cache_data['timestamp'])
+        return cache_data
+
     def _save_to_redis(self, cache_key: str, data: Any, metadata: Dict, ttl_seconds: int) -> bool:
         """保存到Redis缓存"""
-        redis_client = self.db_manager.get_redis_client()
-        if not redis_client:
+        binary_client = self._get_redis_binary_client()
+        if not binary_client:
             return False
         
         try:
-            cache_data = {
-                'data': data,
-                'metadata': metadata,
-                'timestamp': datetime.now().isoformat(),
-                'backend': 'redis'
-            }
-            
-            serialized_data = pickle.dumps(cache_data)
-            redis_client.setex(cache_key, ttl_seconds, serialized_data)
+            meta = {'metadata': metadata, 'timestamp': datetime.now().isoformat()}
+            pipeline = binary_client.pipeline()
+            pipeline.setex(cache_key, ttl_seconds, pickle.dumps(data))
+            pipeline.setex(self._redis_meta_key(cache_key), ttl_seconds, json.dumps(meta, ensure_ascii=False))
+            pipeline.execute()
             
             self.logger.debug(f"Redis缓存保存成功: {cache_key}")
             return True
@@ -128,22 +215,40 @@ class AdaptiveCacheSystem:
             self.logger.error(f"Redis缓存保存失败: {e}")
             return False
     
-    def _load_from_redis(self, cache_key: str) -> Optional[Dict]:
-        """从Redis缓存加载"""
+    def _load_redis_metadata(self, cache_key: str) -> Optional[Dict]:
+        """只读取Redis缓存的元数据"""
         redis_client = self.db_manager.get_redis_client()
         if not redis_client:
             return None
         
         try:
-            serialized_data = redis_client.get(cache_key)
+            raw_meta = redis_client.get(self._redis_meta_key(cache_key))
+            if raw_meta:
+                return self._parse_redis_metadata(raw_meta)
+            # 旧格式缓存没有单独的元数据，整体读取
+            binary_client = self._get_redis_binary_client()
+            serialized_data = binary_client.get(cache_key) if binary_client else None
+            return self._parse_redis_legacy(serialized_data) if serialized_data else None
+        except Exception as e:
+            self.logger.error(f"Redis缓存元数据读取失败: {e}")
+            return None
+    
+    def _load_from_redis(self, cache_key: str) -> Optional[Dict]:
+        """从Redis缓存加载（元数据与数据一次往返读取）"""
+        binary_client = self._get_redis_binary_client()
+        if not binary_client:
+            return None
+        
+        try:
+            raw_meta, serialized_data = binary_client.mget(self._redis_meta_key(cache_key), cache_key)
             if not serialized_data:
                 return None
             
-            cache_data = pickle.loads(serialized_data)
-            
-            # 转换时间戳
-            if isinstance(cache_data['timestamp'], str):
-                cache_data['timestamp'] = datetime.fromisoformat(cache_data['timestamp'])
+            if raw_meta:
+                cache_data = self._parse_redis_metadata(raw_meta)
+                cache_data['data'] = pickle.loads(serialized_data)
+            else:
+                cache_data = self._parse_redis_legacy(serialized_data)
             
             self.logger.debug(f"Redis缓存加载成功: {cache_key}")
             return cache_data
@@ -152,6 +257,10 @@ class AdaptiveCacheSystem:
             self.logger.error(f"Redis缓存加载失败: {e}")
             return None
     
+    # ==================== MongoDB缓存 ====================
+    # 数据以BSON二进制保存：DataFrame 使用 cache_codec 编码（Parquet），其他对象为 pickle；
+    # 旧格式：data_type 为 dataframe（to_json 文本）或 pickle（pickle 的十六进制字符串）
+
     def _save_to_mongodb(self, cache_key: str, data: Any, metadata: Dict, ttl_seconds: int) -> bool:
         """保存到MongoDB缓存"""
         mongodb_client = self.db_manager.get_mongodb_client()
@@ -164,11 +273,10 @@ class AdaptiveCacheSystem:
             
             # 序列化数据
             if isinstance(data, pd.DataFrame):
-                serialized_data = data.to_json()
-                data_type = 'dataframe'
+                serialized_data, data_type = encode_dataframe(data)
             else:
-                serialized_data = pickle.dumps(data).hex()
-                data_type = 'pickle'
+                serialized_data = pickle.dumps(data)
+                data_type = 'pickle_binary'
             
             cache_doc = {
                 '_id': cache_key,
@@ -189,30 +297,50 @@ class AdaptiveCacheSystem:
             self.logger.error(f"MongoDB缓存保存失败: {e}")
             return False
     
-    def _load_from_mongodb(self, cache_key: str) -> Optional[Dict]:
-        """从MongoDB缓存加载"""
+    def _find_mongodb_doc(self, cache_key: str, projection: Optional[Dict] = None) -> Optional[Dict]:
+        """查找未过期的MongoDB缓存文档，过期文档直接删除"""
         mongodb_client = self.db_manager.get_mongodb_client()
         if not mongodb_client:
             return None
         
+        collection = mongodb_client.tradingagents.cache
+        doc = collection.find_one({'_id': cache_key}, projection)
+        if not doc:
+            return None
+        
+        # 检查是否过期
+        if doc.get('expires_at') and doc['expires_at'] < datetime.now():
+            collection.delete_one({'_id': cache_key})
+            return None
+        return doc
+    
+    def _load_mongodb_metadata(self, cache_key: str) -> Optional[Dict]:
+        """只读取MongoDB缓存的元数据（不取回数据字段）"""
         try:
-            db = mongodb_client.tradingagents
-            collection = db.cache
-            
-            doc = collection.find_one({'_id': cache_key})
+            doc = self._find_mongodb_doc(cache_key, {'data': 0})
             if not doc:
                 return None
-            
-            # 检查是否过期
-            if doc.get('expires_at') and doc['expires_at'] < datetime.now():
-                collection.delete_one({'_id': cache_key})
+            return {'metadata': doc['metadata'], 'timestamp': doc['timestamp'], 'backend': 'mongodb'}
+        except Exception as e:
+            self.logger.error(f"MongoDB缓存元数据读取失败: {e}")
+            return None
+    
+    def _load_from_mongodb(self, cache_key: str) -> Optional[Dict]:
+        """从MongoDB缓存加载"""
+        try:
+            doc = self._find_mongodb_doc(cache_key)
+            if not doc:
                 return None
             
             # 反序列化数据
-            if doc['data_type'] == 'dataframe':
+            if doc['data_type'] == 'pickle_binary':
+                data = pickle.loads(doc['data'])
+            elif doc['data_type'] == 'dataframe':
                 data = pd.read_json(doc['data'])
-            else:
+            elif doc['data_type'] == 'pickle':
                 data = pickle.loads(bytes.fromhex(doc['data']))
+            else:
+                data = decode_payload(doc['data'], doc['data_type'])
             
             cache_data = {
                 'data': data,
@@ -268,6 +396,22 @@ class AdaptiveCacheSystem:
         
         return cache_key
     
+    def _load_metadata(self, cache_key: str) -> Optional[Dict]:
+        """只加载缓存元数据（不读取数据）"""
+        cache_data = None
+        
+        if self.primary_backend == "redis":
+            cache_data = self._load_redis_metadata(cache_key)
+        elif self.primary_backend == "mongodb":
+            cache_data = self._load_mongodb_metadata(cache_key)
+        elif self.primary_backend == "file":
+            cache_data = self._load_file_metadata(cache_key)
+        
+        if not cache_data and self.fallback_enabled:
+            cache_data = self._load_file_metadata(cache_key)
+        
+        return cache_data
+    
     def load_data(self, cache_key: str) -> Optional[Any]:
         """从缓存加载数据"""
         cache_data = None
@@ -288,29 +432,36 @@ class AdaptiveCacheSystem:
         if not cache_data:
             return None
         
-        # 检查缓存是否有效（仅对文件缓存，数据库缓存有自己的TTL机制）
-        if cache_data.get('backend') == 'file':
-            symbol = cache_data['metadata'].get('symbol', '')
-            data_type = cache_data['metadata'].get('data_type', 'stock_data')
-            ttl_seconds = self._get_ttl_seconds(symbol, data_type)
-            
-            if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
-                self.logger.debug(f"文件缓存已过期: {cache_key}")
-                return None
+        # 旧格式文件缓存整体加载，在此检查是否过期
+        if not self._is_fresh(cache_data):
+            self.logger.debug(f"文件缓存已过期: {cache_key}")
+            return None
         
         return cache_data['data']
     
     def find_cached_data(self, symbol: str, start_date: str = "", end_date: str = "", 
                         data_source: str = "default", data_type: str = "stock_data") -> Optional[str]:
-        """查找缓存的数据"""
+        """查找缓存的数据（只检查元数据，不读取数据）"""
         cache_key = self._get_cache_key(symbol, start_date, end_date, data_source, data_type)
         
         # 检查缓存是否存在且有效
-        if self.load_data(cache_key) is not None:
+        cache_data = self._load_metadata(cache_key)
+        if cache_data and self._is_fresh(cache_data):
             return cache_key
         
         return None
     
+    def get_if_fresh(self, symbol: str, start_date: str = "", end_date: str = "", 
+                     data_source: str = "default", data_type: str = "stock_data") -> Optional[Any]:
+        """
+        一次读取有效的缓存数据，代替 find_cached_data + load_data 的两次读取
+        
+        Returns:
+            缓存数据；不存在或已过期时返回 None
+        """
+        cache_key = self._get_cache_key(symbol, start_date, end_date, data_source, data_type)
+        return self.load_data(cache_key)
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
         stats = {
@@ -352,14 +503,15 @@ class AdaptiveCacheSystem:
         cleared_files = 0
         for cache_file in self.cache_dir.glob("*.pkl"):
             try:
-                with open(cache_file, 'rb') as f:
-                    cache_data = pickle.load(f)
-                
-                symbol = cache_data['metadata'].get('symbol', '')
-                data_type = cache_data['metadata'].get('data_type', 'stock_data')
-                ttl_seconds = self._get_ttl_seconds(symbol, data_type)
+                cache_key = cache_file.stem
+                cache_data = self._load_file_metadata(cache_key)
+                if cache_data is None:
+                    raise ValueError("无法读取缓存元数据")
                 
-                if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
+                if not self._is_fresh(cache_data):
+                    meta_file = self._file_paths(cache_key)[0]
+                    if meta_file.exists():
+                        meta_file.unlink()
                     cache_file.unlink()
                     cleared_files += 1
                     
@@ -5,15 +5,220 @@ AKShare数据源工具
 """
 
 import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import warnings
-from datetime import datetime
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, date
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.rate_limiter import rate_limit
+from tradingagents.utils.single_flight import single_flight
+from tradingagents.config.env_utils import parse_float_env, parse_int_env
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
+
+class AKShareCallExecutor:
+    """
+    AKShare 调用的有界执行器
+
+    原实现每次调用新建守护线程并 join(timeout)，超时后线程仍在运行并占用
+    socket，上游持续缓慢时会堆积大量僵尸线程和文件描述符。这里改为：
+    - 固定大小线程池，排队中的调用超时后直接取消
+    - socket 默认超时（AKSHARE_SOCKET_TIMEOUT）保证卡住的请求最终报错退出，
+      工作线程得以回收
+    - 在途调用达到上限（AKSHARE_MAX_IN_FLIGHT）时立即失败，把上游缓慢转化为快速失败
+    """
+
+    def __init__(self):
+        self.max_workers = max(1, parse_int_env("AKSHARE_MAX_WORKERS", 8))
+        self.max_in_flight = max(self.max_workers, parse_int_env("AKSHARE_MAX_IN_FLIGHT", self.max_workers * 2))
+        self.socket_timeout = parse_float_env("AKSHARE_SOCKET_TIMEOUT", 30.0)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="akshare")
+        self._lock = threading.Lock()
+        self._stats = {
+            'in_flight': 0,
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'cancelled': 0,
+            'rejected': 0,
+        }
+
+    def _on_done(self, future):
+        with self._lock:
+            self._stats['in_flight'] -= 1
+            if future.cancelled():
+                self._stats['cancelled'] += 1
+            elif future.exception() is not None:
+                self._stats['failed'] += 1
+            else:
+                self._stats['completed'] += 1
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        提交 AKShare 调用到线程池，配合 wait 使用以并发执行多个调用
+
+        Raises:
+            TimeoutError: 在途调用已达上限
+        """
+        with self._lock:
+            if self._stats['in_flight'] >= self.max_in_flight:
+                self._stats['rejected'] += 1
+                raise TimeoutError(f"AKShare在途调用已达上限({self.max_in_flight})，快速失败")
+            self._stats['in_flight'] += 1
+            self._stats['submitted'] += 1
+
+        # AKShare 内部的 requests 调用大多未设置超时，依赖 socket 默认超时兜底
+        if self.socket_timeout > 0 and socket.getdefaulttimeout() != self.socket_timeout:
+            socket.setdefaulttimeout(self.socket_timeout)
+
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def wait(self, future: Future, timeout: float = 60, name: str = ""):
+        """
+        等待已提交的调用完成
+
+        Raises:
+            TimeoutError: 调用超时
+            Exception: AKShare 调用本身抛出的异常
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # 尚未开始执行的调用直接取消；已在执行的调用由 socket 超时终止
+            future.cancel()
+            with self._lock:
+                self._stats['timed_out'] += 1
+            raise TimeoutError(f"AKShare调用超时（{timeout}秒）: {name}")
+
+    def call(self, func: Callable, *args, timeout: float = 60, **kwargs):
+        """
+        在线程池中执行 AKShare 调用
+
+        Raises:
+            TimeoutError: 调用超时，或在途调用已达上限
+            Exception: AKShare 调用本身抛出的异常
+        """
+        future = self.submit(func, *args, **kwargs)
+        return self.wait(future, timeout, getattr(func, '__name__', str(func)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取在途、超时等调用计数"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_workers'] = self.max_workers
+        stats['max_in_flight'] = self.max_in_flight
+        stats['socket_timeout'] = self.socket_timeout
+        return stats
+
+
+_call_executor: Optional[AKShareCallExecutor] = None
+_call_executor_lock = threading.Lock()
+
+
+def get_akshare_call_executor() -> AKShareCallExecutor:
+    """获取全局 AKShare 调用执行器（懒加载单例）"""
+    global _call_executor
+    if _call_executor is None:
+        with _call_executor_lock:
+            if _call_executor is None:
+                _call_executor = AKShareCallExecutor()
+    return _call_executor
+
+
+def get_akshare_call_stats() -> Dict[str, Any]:
+    """获取 AKShare 调用统计（在途、超时、拒绝等）"""
+    return get_akshare_call_executor().get_stats()
+
+# 财务报表：返回字段名 -> (AKShare接口名, 日志名称)
+FINANCIAL_STATEMENTS = {
+    'main_indicators': ('stock_financial_abstract', '主要财务指标'),
+    'balance_sheet': ('stock_balance_sheet_by_report_em', '资产负债表'),
+    'income_statement': ('stock_profit_sheet_by_report_em', '利润表'),
+    'cash_flow': ('stock_cash_flow_sheet_by_report_em', '现金流量表'),
+}
+
+
+def expected_report_period(today: Optional[date] = None) -> str:
+    """
+    按日历推算当前可能已披露的最新报告期（YYYYMMDD）
+
+    最近一个已结束季度的季末日即为可能披露的最新报告期，
+    跨过季末后报告期变化，对应的财务数据缓存随之失效。
+    """
+    today = today or date.today()
+    quarter_ends = [(3, 31), (6, 30), (9, 30), (12, 31)]
+    for month, day in reversed(quarter_ends):
+        if (today.month, today.day) > (month, day):
+            return f"{today.year}{month:02d}{day:02d}"
+    return f"{today.year - 1}1231"
+
+
+def latest_report_period(df: pd.DataFrame) -> Optional[str]:
+    """提取报表中最新的报告期（YYYYMMDD），无法识别时返回 None"""
+    if df is None or df.empty:
+        return None
+    if 'REPORT_DATE' in df.columns:
+        periods = df['REPORT_DATE'].dropna().astype(str).str[:10].str.replace('-', '')
+        return periods.max() if not periods.empty else None
+    # stock_financial_abstract 以报告期作为列名
+    periods = [str(col) for col in df.columns if str(col).isdigit() and len(str(col)) == 8]
+    return max(periods) if periods else None
+
+
+class FinancialStatementCache:
+    """
+    按 (股票代码, 报表) 缓存财务报表，以推算的最新报告期作为版本
+
+    - 推算报告期变化（跨过季末）时缓存失效
+    - 报表已包含推算的最新报告期时一直有效
+    - 报表尚未包含最新报告期（披露窗口期内）时，按 AKSHARE_FINANCIAL_RECHECK_HOURS 定期重新检查
+    """
+
+    def __init__(self):
+        self.max_entries = max(1, parse_int_env("AKSHARE_FINANCIAL_CACHE_SIZE", 512))
+        self.recheck_seconds = parse_float_env("AKSHARE_FINANCIAL_RECHECK_HOURS", 12.0) * 3600
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, statement: str, period: str) -> Optional[pd.DataFrame]:
+        key = (symbol, statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['period'] != period:
+                return None
+            latest = entry['latest_report']
+            if (latest is None or latest < period) and time.time() - entry['fetched_at'] > self.recheck_seconds:
+                return None
+            self._entries.move_to_end(key)
+            return entry['data']
+
+    def put(self, symbol: str, statement: str, period: str, data: pd.DataFrame):
+        key = (symbol, statement)
+        with self._lock:
+            self._entries[key] = {
+                'period': period,
+                'data': data,
+                'latest_report': latest_report_period(data),
+                'fetched_at': time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_financial_cache = FinancialStatementCache()
+
+
 class AKShareProvider:
     """AKShare数据提供器"""
 
@@ -39,8 +244,10 @@ class AKShareProvider:
             import requests
             import socket
 
-            # 设置更长的超时时间
-            socket.setdefaulttimeout(60)  # 60秒超时
+            # socket 默认超时由 AKShareCallExecutor 按 AKSHARE_SOCKET_TIMEOUT 统一设置
+            socket_timeout = get_akshare_call_executor().socket_timeout
+            if socket_timeout > 0:
+                socket.setdefaulttimeout(socket_timeout)
 
             # 如果AKShare使用requests，设置默认超时
             if hasattr(requests, 'adapters'):
@@ -60,12 +267,13 @@ class AKShareProvider:
                 session.mount("http://", adapter)
                 session.mount("https://", adapter)
 
-                logger.info(f"🔧 AKShare超时配置完成: 60秒超时，3次重试")
+                logger.info(f"🔧 AKShare超时配置完成: {socket_timeout}秒socket超时，3次重试")
 
         except Exception as e:
             logger.error(f"⚠️ AKShare超时配置失败: {e}")
             logger.info(f"🔧 使用默认超时设置")
     
+    @single_flight("akshare", "stock_data")
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
         """获取股票历史数据"""
         if not self.connected:
@@ -79,6 +287,7 @@ class AKShareProvider:
                 symbol = symbol.replace('.SZ', '').replace('.SS', '')
             
             # 获取数据
+            rate_limit("akshare")
             data = self.ak.stock_zh_a_hist(
                 symbol=symbol,
                 period="daily",
@@ -93,6 +302,7 @@ class AKShareProvider:
             logger.error(f"❌ AKShare获取股票数据失败: {e}")
             return None
     
+    @single_flight("akshare", "stock_info")
     def get_stock_info(self, symbol: str) -> Dict[str, Any]:
         """获取股票基本信息"""
         if not self.connected:
@@ -100,6 +310,7 @@ class AKShareProvider:
         
         try:
             # 获取股票基本信息
+            rate_limit("akshare")
             stock_list = self.ak.stock_info_a_code_name()
             stock_info = stock_list[stock_list['code'] == symbol]
             
@@ -137,47 +348,17 @@ class AKShareProvider:
 
         logger.debug(f"[东方财富新闻] 📰 准备调用AKShare API获取个股新闻: {symbol}")
 
-        # 使用线程超时包装（兼容Windows）
-        import threading
-        import time
-
-        result = [None]
-        exception = [None]
-
-        def fetch_news():
-            try:
-                logger.debug(f"[东方财富新闻] 线程开始执行 stock_news_em API调用: {symbol}")
-                thread_start = time.time()
-                result[0] = self.ak.stock_news_em(symbol=symbol)
-                thread_end = time.time()
-                logger.debug(f"[东方财富新闻] 线程执行完成，耗时: {thread_end - thread_start:.2f}秒")
-            except Exception as e:
-                logger.error(f"[东方财富新闻] 线程执行异常: {e}")
-                exception[0] = e
-
-        # 启动线程
-        thread = threading.Thread(target=fetch_news)
-        thread.daemon = True
-        logger.debug(f"[东方财富新闻] 启动线程获取新闻数据")
-        thread.start()
-
-        # 等待30秒
-        logger.debug(f"[东方财富新闻] 等待线程完成，最长等待30秒")
-        thread.join(timeout=30)
-
-        if thread.is_alive():
-            # 超时了
+        # 经有界执行器调用，最长等待30秒
+        try:
+            news_df = self._call_with_timeout(self.ak.stock_news_em, symbol=symbol, timeout=30)
+        except TimeoutError as e:
             elapsed_time = (datetime.now() - start_time).total_seconds()
-            logger.warning(f"[东方财富新闻] ⚠️ 获取超时（30秒）: {symbol}，总耗时: {elapsed_time:.2f}秒")
+            logger.warning(f"[东方财富新闻] ⚠️ 获取超时: {symbol}，{e}，总耗时: {elapsed_time:.2f}秒")
             return pd.DataFrame()
-        elif exception[0]:
-            # 有异常
+        except Exception as e:
             elapsed_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"[东方财富新闻] ❌ API调用异常: {exception[0]}，总耗时: {elapsed_time:.2f}秒")
+            logger.error(f"[东方财富新闻] ❌ API调用异常: {e}，总耗时: {elapsed_time:.2f}秒")
             return pd.DataFrame()
-        else:
-            # 成功
-            news_df = result[0]
 
         if news_df is not None and not news_df.empty:
             # 限制新闻数量为最新的max_news条
@@ -245,6 +426,7 @@ class AKShareProvider:
         return news_items
 
 
+    @single_flight("akshare", "hk_stock_data")
     def get_hk_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> Optional[pd.DataFrame]:
         """
         获取港股历史数据
@@ -272,41 +454,19 @@ class AKShareProvider:
             end_date_formatted = end_date.replace('-', '') if end_date else "20241231"
 
             # 使用AKShare获取港股历史数据（带超时保护）
-            import threading
-
-            result = [None]
-            exception = [None]
-
-            def fetch_hist_data():
-                try:
-                    result[0] = self.ak.stock_hk_hist(
-                        symbol=hk_symbol,
-                        period="daily",
-                        start_date=start_date_formatted,
-                        end_date=end_date_formatted,
-                        adjust=""
-                    )
-                except Exception as e:
-                    exception[0] = e
-
-            # 启动线程
-            thread = threading.Thread(target=fetch_hist_data)
-            thread.daemon = True
-            thread.start()
-
-            # 等待60秒
-            thread.join(timeout=60)
-
-            if thread.is_alive():
-                # 超时了
+            try:
+                data = self._call_with_timeout(
+                    self.ak.stock_hk_hist,
+                    symbol=hk_symbol,
+                    period="daily",
+                    start_date=start_date_formatted,
+                    end_date=end_date_formatted,
+                    adjust="",
+                    timeout=60
+                )
+            except TimeoutError:
                 logger.warning(f"⚠️ AKShare港股历史数据获取超时（60秒）: {symbol}")
-                raise Exception(f"AKShare港股历史数据获取超时（60秒）: {symbol}")
-            elif exception[0]:
-                # 有异常
-                raise exception[0]
-            else:
-                # 成功
-                data = result[0]
+                raise
 
             if not data.empty:
                 # 数据预处理
@@ -338,6 +498,7 @@ class AKShareProvider:
             logger.error(f"❌ AKShare获取港股数据失败: {e}")
             return None
 
+    @single_flight("akshare", "hk_stock_info")
     def get_hk_stock_info(self, symbol: str) -> Dict[str, Any]:
         """
         获取港股基本信息
@@ -362,39 +523,12 @@ class AKShareProvider:
 
             logger.info(f"🇭🇰 AKShare获取港股信息: {hk_symbol}")
 
-            # 尝试获取港股实时行情数据来获取基本信息
-            # 使用线程超时包装（兼容Windows）
-            import threading
-            import time
-
-
-            result = [None]
-            exception = [None]
-
-            def fetch_data():
-                try:
-                    result[0] = self.ak.stock_hk_spot_em()
-                except Exception as e:
-                    exception[0] = e
-
-            # 启动线程
-            thread = threading.Thread(target=fetch_data)
-            thread.daemon = True
-            thread.start()
-
-            # 等待60秒
-            thread.join(timeout=60)
-
-            if thread.is_alive():
-                # 超时了
+            # 尝试获取港股实时行情数据来获取基本信息（带超时保护）
+            try:
+                spot_data = self._call_with_timeout(self.ak.stock_hk_spot_em, timeout=60)
+            except TimeoutError:
                 logger.warning(f"⚠️ AKShare港股信息获取超时（60秒），使用备用方案")
-                raise Exception("AKShare港股信息获取超时（60秒）")
-            elif exception[0]:
-                # 有异常
-                raise exception[0]
-            else:
-                # 成功
-                spot_data = result[0]
+                raise
 
             # 查找对应的股票信息
             if not spot_data.empty:
@@ -432,6 +566,11 @@ class AKShareProvider:
                 'error': str(e)
             }
 
+    def _call_with_timeout(self, func: Callable, *args, timeout: float = 60, **kwargs):
+        """经共享限流和有界执行器调用 AKShare 接口"""
+        rate_limit("akshare")
+        return get_akshare_call_executor().call(func, *args, timeout=timeout, **kwargs)
+
     def _normalize_hk_symbol_for_akshare(self, symbol: str) -> str:
         """
         标准化港股代码为AKShare格式
@@ -454,9 +593,13 @@ class AKShareProvider:
 
         return clean_symbol
 
+    @single_flight("akshare", "financial_data")
     def get_financial_data(self, symbol: str) -> Dict[str, Any]:
         """
         获取股票财务数据
+
+        四张报表并发获取（共享 akshare 限流），并按 (股票代码, 报告期) 缓存，
+        只有出现新的报告期时才重新请求。
         
         Args:
             symbol: 股票代码 (6位数字)
@@ -472,55 +615,45 @@ class AKShareProvider:
             logger.info(f"🔍 开始获取{symbol}的AKShare财务数据")
             
             financial_data = {}
+            period = expected_report_period()
             
-            # 1. 优先获取主要财务指标
-            try:
-                logger.debug(f"📊 尝试获取{symbol}主要财务指标...")
-                main_indicators = self.ak.stock_financial_abstract(symbol=symbol)
-                if main_indicators is not None and not main_indicators.empty:
-                    financial_data['main_indicators'] = main_indicators
-                    logger.info(f"✅ 成功获取{symbol}主要财务指标: {len(main_indicators)}条记录")
-                    logger.debug(f"主要财务指标列名: {list(main_indicators.columns)}")
+            # 1. 先查缓存
+            pending = {}
+            for key in FINANCIAL_STATEMENTS:
+                cached = _financial_cache.get(symbol, key, period)
+                if cached is not None:
+                    financial_data[key] = cached
                 else:
-                    logger.warning(f"⚠️ {symbol}主要财务指标为空")
-            except Exception as e:
-                logger.warning(f"❌ 获取{symbol}主要财务指标失败: {e}")
-            
-            # 2. 尝试获取资产负债表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}资产负债表...")
-                balance_sheet = self.ak.stock_balance_sheet_by_report_em(symbol=symbol)
-                if balance_sheet is not None and not balance_sheet.empty:
-                    financial_data['balance_sheet'] = balance_sheet
-                    logger.debug(f"✅ 成功获取{symbol}资产负债表: {len(balance_sheet)}条记录")
-                else:
-                    logger.debug(f"⚠️ {symbol}资产负债表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}资产负债表失败: {e}")
+                    pending[key] = FINANCIAL_STATEMENTS[key]
+            if financial_data:
+                logger.debug(f"⚡ {symbol}财务报表命中缓存: {list(financial_data.keys())}")
             
-            # 3. 尝试获取利润表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}利润表...")
-                income_statement = self.ak.stock_profit_sheet_by_report_em(symbol=symbol)
-                if income_statement is not None and not income_statement.empty:
-                    financial_data['income_statement'] = income_statement
-                    logger.debug(f"✅ 成功获取{symbol}利润表: {len(income_statement)}条记录")
-                else:
-                    logger.debug(f"⚠️ {symbol}利润表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}利润表失败: {e}")
+            # 2. 未命中的报表并发获取
+            executor = get_akshare_call_executor()
+            futures = {}
+            for key, (func_name, label) in pending.items():
+                try:
+                    rate_limit("akshare")
+                    futures[key] = executor.submit(getattr(self.ak, func_name), symbol=symbol)
+                except Exception as e:
+                    logger.warning(f"❌ 提交{symbol}{label}请求失败: {e}")
             
-            # 4. 尝试获取现金流量表（可能失败，降级为debug日志）
-            try:
-                logger.debug(f"📊 尝试获取{symbol}现金流量表...")
-                cash_flow = self.ak.stock_cash_flow_sheet_by_report_em(symbol=symbol)
-                if cash_flow is not None and not cash_flow.empty:
-                    financial_data['cash_flow'] = cash_flow
-                    logger.debug(f"✅ 成功获取{symbol}现金流量表: {len(cash_flow)}条记录")
+            for key, future in futures.items():
+                func_name, label = FINANCIAL_STATEMENTS[key]
+                try:
+                    data = executor.wait(future, timeout=60, name=func_name)
+                except Exception as e:
+                    # 主要财务指标失败记为警告，其余报表可能不支持该股票，降级为debug日志
+                    log = logger.warning if key == 'main_indicators' else logger.debug
+                    log(f"❌ 获取{symbol}{label}失败: {e}")
+                    continue
+                
+                if data is not None and not data.empty:
+                    financial_data[key] = data
+                    _financial_cache.put(symbol, key, period, data)
+                    logger.debug(f"✅ 成功获取{symbol}{label}: {len(data)}条记录")
                 else:
-                    logger.debug(f"⚠️ {symbol}现金流量表为空")
-            except Exception as e:
-                logger.debug(f"❌ 获取{symbol}现金流量表失败: {e}")
+                    logger.debug(f"⚠️ {symbol}{label}为空")
             
             # 记录最终结果
             if financial_data:
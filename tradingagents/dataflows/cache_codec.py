@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+缓存数据紧凑编码
+数据库缓存原先以 to_json(orient='records') 文本保存 DataFrame，以原始字符串保存
+新闻和基本面报告：逐行 JSON 冗长，读取时需要重新解析并推断列类型。本模块提供
+带格式标记的压缩二进制编码：
+
+- DataFrame: Parquet（zstd 压缩，需安装 pyarrow），未安装时退化为 zlib 压缩的 JSON
+- 文本: zlib 压缩的 UTF-8
+- 解码按格式标记进行，旧格式（dataframe_json / text）的缓存照常读取
+
+【使用方式】
+from tradingagents.dataflows.cache_codec import encode_payload, decode_payload
+payload, data_format = encode_payload(df)         # bytes, "dataframe_parquet"
+df = decode_payload(payload, data_format)
+
+raw = pack_redis_value(payload, data_format)        # 单个二进制值写入 Redis
+unpacked = unpack_redis_value(raw)                  # (payload, data_format)，旧格式返回 None
+
+【配置】
+DB_CACHE_COMPACT_ENCODING   是否使用压缩二进制编码写入缓存（默认 true，关闭时写入旧格式）
+"""
+
+import io
+import zlib
+from typing import Any, Optional, Tuple, Union
+
+import pandas as pd
+
+from tradingagents.config.env_utils import parse_bool_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    logger.warning("⚠️ [缓存编码] 未安装pyarrow，DataFrame缓存退化为压缩JSON（不保留列类型），请安装 pyarrow")
+
+# 格式标记
+FORMAT_DATAFRAME_PARQUET = "dataframe_parquet"
+FORMAT_DATAFRAME_JSON_ZLIB = "dataframe_json_zlib"
+FORMAT_TEXT_ZLIB = "text_zlib"
+# 旧格式
+FORMAT_DATAFRAME_JSON = "dataframe_json"
+FORMAT_TEXT = "text"
+
+BINARY_FORMATS = (FORMAT_DATAFRAME_PARQUET, FORMAT_DATAFRAME_JSON_ZLIB, FORMAT_TEXT_ZLIB)
+
+# Redis 二进制值头部：魔数 + 格式标记长度 + 格式标记 + 数据
+_REDIS_MAGIC = b"TADC\x01"
+
+_ZLIB_LEVEL = 6
+
+
+def is_compact_encoding_enabled() -> bool:
+    return parse_bool_env("DB_CACHE_COMPACT_ENCODING", True)
+
+
+def encode_dataframe(df: pd.DataFrame) -> Tuple[bytes, str]:
+    """DataFrame 编码为 Parquet（zstd），无 pyarrow 时编码为 zlib 压缩的 JSON"""
+    if PARQUET_AVAILABLE:
+        try:
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, engine='pyarrow', compression='zstd')
+            return buffer.getvalue(), FORMAT_DATAFRAME_PARQUET
+        except Exception as e:
+            # 混合类型的 object 列等 Parquet 无法表示的数据退化为 JSON
+            logger.debug(f"Parquet编码失败，改用压缩JSON: {e}")
+    raw = df.to_json(orient='records', date_format='iso')
+    return zlib.compress(raw.encode('utf-8'), _ZLIB_LEVEL), FORMAT_DATAFRAME_JSON_ZLIB
+
+
+def encode_text(text: str) -> Tuple[bytes, str]:
+    """文本编码为 zlib 压缩的 UTF-8"""
+    return zlib.compress(str(text).encode('utf-8'), _ZLIB_LEVEL), FORMAT_TEXT_ZLIB
+
+
+def encode_payload(data: Union[pd.DataFrame, str]) -> Tuple[Union[bytes, str], str]:
+    """
+    编码缓存数据
+
+    Returns:
+        (数据, 格式标记)；关闭紧凑编码时返回旧格式的字符串
+    """
+    if isinstance(data, pd.DataFrame):
+        if is_compact_encoding_enabled():
+            return encode_dataframe(data)
+        return data.to_json(orient='records', date_format='iso'), FORMAT_DATAFRAME_JSON
+    if is_compact_encoding_enabled():
+        return encode_text(data)
+    return str(data), FORMAT_TEXT
+
+
+def decode_payload(payload: Any, data_format: Optional[str]) -> Union[pd.DataFrame, str]:
+    """按格式标记解码缓存数据，缺少标记的旧数据原样返回"""
+    if data_format == FORMAT_DATAFRAME_PARQUET:
+        return pd.read_parquet(io.BytesIO(bytes(payload)), engine='pyarrow')
+    if data_format == FORMAT_DATAFRAME_JSON_ZLIB:
+        return pd.read_json(io.StringIO(zlib.decompress(bytes(payload)).decode('utf-8')), orient='records')
+    if data_format == FORMAT_TEXT_ZLIB:
+        return zlib.decompress(bytes(payload)).decode('utf-8')
+    if data_format == FORMAT_DATAFRAME_JSON:
+        return pd.read_json(io.StringIO(payload), orient='records')
+    return payload
+
+
+def pack_redis_value(payload: Union[bytes, str], data_format: str) -> bytes:
+    """打包为带格式标记的 Redis 二进制值"""
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    tag = data_format.encode('ascii')
+    return _REDIS_MAGIC + bytes([len(tag)]) + tag + payload
+
+
+def unpack_redis_value(raw: Optional[bytes]) -> Optional[Tuple[Union[bytes, str], str]]:
+    """
+    解包 Redis 二进制值
+
+    Returns:
+        (数据, 格式标记)；不是 pack_redis_value 写入的值（旧的 JSON 格式）返回 None
+    """
+    if not raw or not isinstance(raw, bytes) or not raw.startswith(_REDIS_MAGIC):
+        return None
+    offset = len(_REDIS_MAGIC)
+    tag_length = raw[offset]
+    tag = raw[offset + 1:offset + 1 + tag_length].decode('ascii')
+    payload = raw[offset + 1 + tag_length:]
+    if tag not in BINARY_FORMATS:
+        payload = payload.decode('utf-8')
+    return payload, tag
@@ -410,6 +410,20 @@ class StockDataCache:
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol}")
         return None
     
+    def get_fresh_stock_data(self, symbol: str, start_date: str = None,
+                             end_date: str = None, data_source: str = None,
+                             max_age_hours: int = None) -> Optional[Union[pd.DataFrame, str]]:
+        """
+        获取有效的缓存股票数据，代替 find_cached_stock_data + load_stock_data
+
+        Returns:
+            缓存数据；不存在或已过期时返回 None
+        """
+        cache_key = self.find_cached_stock_data(symbol, start_date, end_date, data_source, max_age_hours)
+        if not cache_key:
+            return None
+        return self.load_stock_data(cache_key)
+    
     def save_news_data(self, symbol: str, news_data: str, 
                       start_date: str = None, end_date: str = None,
                       data_source: str = "unknown") -> str:
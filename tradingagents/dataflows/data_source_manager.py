@@ -13,6 +13,8 @@ import pandas as pd
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.rate_limiter import rate_limit
+from tradingagents.utils.single_flight import single_flight
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
@@ -272,6 +274,7 @@ class DataSourceManager:
             logger.error(f"❌ BaoStock适配器导入失败: {e}")
             return None
     
+    @single_flight("china_unified", "stock_data")
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> str:
         """
         获取股票数据的统一接口
@@ -581,7 +584,22 @@ class DataSourceManager:
         return f"❌ 所有数据源都无法获取{symbol}的数据"
     
     def get_stock_info(self, symbol: str) -> Dict:
-        """获取股票基本信息，支持降级机制"""
+        """获取股票基本信息：优先查内存证券主数据，未命中时按数据源获取并回填"""
+        from .security_master import get_security_master
+
+        security_master = get_security_master()
+        security = security_master.get(symbol)
+        if security:
+            logger.debug(f"📊 [股票信息] 证券主数据命中: {symbol} -> {security.name}")
+            return security.to_dict()
+
+        result = self._fetch_stock_info(symbol)
+        security_master.add(result)
+        return result
+
+    @single_flight("china_unified", "stock_info")
+    def _fetch_stock_info(self, symbol: str) -> Dict:
+        """从数据源获取股票基本信息，支持降级机制"""
         logger.info(f"📊 [股票信息] 开始获取{symbol}基本信息...")
 
         # 首先尝试当前数据源
@@ -676,6 +694,7 @@ class DataSourceManager:
             import akshare as ak
 
             # 尝试获取个股信息
+            rate_limit("akshare")
             stock_info = ak.stock_individual_info_em(symbol=symbol)
 
             if stock_info is not None and not stock_info.empty:
@@ -721,6 +740,7 @@ class DataSourceManager:
                 return {'symbol': symbol, 'name': f'股票{symbol}', 'source': 'baostock'}
 
             # 查询股票基本信息
+            rate_limit("baostock")
             rs = bs.query_stock_basic(code=bs_code)
             if rs.error_code != '0':
                 bs.logout()
@@ -2,6 +2,9 @@
 """
 MongoDB + Redis 数据库缓存管理器
 提供高性能的股票数据缓存和持久化存储
+
+数据以带格式标记的压缩二进制保存（DataFrame 为 Parquet，报告为 zlib 压缩文本，
+见 cache_codec），旧格式的缓存照常读取
 """
 
 import os
@@ -14,6 +17,7 @@ import pandas as pd
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.dataflows.cache_codec import decode_payload, encode_payload, pack_redis_value, unpack_redis_value
 logger = get_logger('agents')
 
 # MongoDB
@@ -27,7 +31,7 @@ except ImportError:
 
 # Redis - 使用统一的连接管理
 try:
-    from tradingagents.storage.redis.connection import get_redis_client, REDIS_AVAILABLE
+    from tradingagents.storage.redis.connection import get_redis_client, get_redis_binary_client, REDIS_AVAILABLE
     REDIS_AVAILABLE = REDIS_AVAILABLE
 except ImportError:
     REDIS_AVAILABLE = False
@@ -47,8 +51,9 @@ class DatabaseCacheManager:
             redis_url: Redis连接URL（已弃用，使用统一连接管理）
             redis_db: Redis数据库编号（已弃用，使用统一连接管理）
         """
-        # 使用统一的 Redis 连接管理
+        # 使用统一的 Redis 连接管理（二进制客户端读写缓存数据）
         self.redis_client = None
+        self.redis_binary_client = None
         
         # 初始化 MongoDB 索引（如果可用）
         self._create_mongodb_indexes()
@@ -66,6 +71,7 @@ class DatabaseCacheManager:
         try:
             # 使用统一的 Redis 连接管理
             self.redis_client = get_redis_client()
+            self.redis_binary_client = get_redis_binary_client()
             
             if self.redis_client:
                 logger.info(f"✅ Redis连接成功（使用统一连接管理）")
@@ -75,6 +81,7 @@ class DatabaseCacheManager:
         except Exception as e:
             logger.error(f"❌ Redis连接失败: {e}")
             self.redis_client = None
+            self.redis_binary_client = None
     
     def _create_mongodb_indexes(self):
         """创建MongoDB索引（使用统一的连接管理）"""
@@ -128,6 +135,25 @@ class DatabaseCacheManager:
         
         cache_key = hashlib.md5(params_str.encode()).hexdigest()[:16]
         return f"{data_type}:{symbol}:{cache_key}"
+
+    def _set_redis_payload(self, cache_key: str, payload: Union[bytes, str], data_format: str, ttl_seconds: int):
+        """以带格式标记的二进制值写入Redis"""
+        if self.redis_binary_client is None:
+            raise RuntimeError("Redis二进制客户端不可用")
+        self.redis_binary_client.setex(cache_key, ttl_seconds, pack_redis_value(payload, data_format))
+
+    def _get_redis_payload(self, cache_key: str) -> Optional[tuple]:
+        """读取Redis缓存，返回 (数据, 格式标记)，兼容旧的JSON格式"""
+        if self.redis_binary_client is None:
+            return None
+        raw = self.redis_binary_client.get(cache_key)
+        if not raw:
+            return None
+        unpacked = unpack_redis_value(raw)
+        if unpacked is not None:
+            return unpacked
+        data_dict = json.loads(raw.decode('utf-8'))
+        return data_dict["data"], data_dict.get("data_format", "text")
     
     def save_stock_data(self, symbol: str, data: Union[pd.DataFrame, str],
                        start_date: str = None, end_date: str = None,
@@ -174,13 +200,8 @@ class DatabaseCacheManager:
             "updated_at": datetime.utcnow()
         }
         
-        # 处理数据格式
-        if isinstance(data, pd.DataFrame):
-            doc["data"] = data.to_json(orient='records', date_format='iso')
-            doc["data_format"] = "dataframe_json"
-        else:
-            doc["data"] = str(data)
-            doc["data_format"] = "text"
+        # 处理数据格式（压缩二进制，MongoDB中以BSON二进制保存）
+        doc["data"], doc["data_format"] = encode_payload(data)
         
         # 保存到MongoDB（持久化）
         if MONGODB_AVAILABLE:
@@ -196,18 +217,7 @@ class DatabaseCacheManager:
         # 保存到Redis（快速缓存，6小时过期）
         if self.redis_client:
             try:
-                redis_data = {
-                    "data": doc["data"],
-                    "data_format": doc["data_format"],
-                    "symbol": symbol,
-                    "data_source": data_source,
-                    "created_at": doc["created_at"].isoformat()
-                }
-                self.redis_client.setex(
-                    cache_key,
-                    6 * 3600,  # 6小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
-                )
+                self._set_redis_payload(cache_key, doc["data"], doc["data_format"], 6 * 3600)
                 logger.info(f"⚡ 股票数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
                 logger.error(f"⚠️ Redis缓存失败: {e}")
@@ -220,15 +230,10 @@ class DatabaseCacheManager:
         # 首先尝试从Redis加载（更快）
         if self.redis_client:
             try:
-                redis_data = self.redis_client.get(cache_key)
+                redis_data = self._get_redis_payload(cache_key)
                 if redis_data:
-                    data_dict = json.loads(redis_data)
                     logger.info(f"⚡ 从Redis加载数据: {cache_key}")
-                    
-                    if data_dict["data_format"] == "dataframe_json":
-                        return pd.read_json(data_dict["data"], orient='records')
-                    else:
-                        return data_dict["data"]
+                    return decode_payload(*redis_data)
             except Exception as e:
                 logger.error(f"⚠️ Redis加载失败: {e}")
         
@@ -246,26 +251,12 @@ class DatabaseCacheManager:
                         # 同时更新到Redis缓存
                         if self.redis_client:
                             try:
-                                redis_data = {
-                                    "data": doc["data"],
-                                    "data_format": doc["data_format"],
-                                    "symbol": doc["symbol"],
-                                    "data_source": doc["data_source"],
-                                    "created_at": doc["created_at"].isoformat()
-                                }
-                                self.redis_client.setex(
-                                    cache_key,
-                                    6 * 3600,
-                                    json.dumps(redis_data, ensure_ascii=False)
-                                )
+                                self._set_redis_payload(cache_key, doc["data"], doc["data_format"], 6 * 3600)
                                 logger.info(f"⚡ 数据已同步到Redis缓存")
                             except Exception as e:
                                 logger.error(f"⚠️ Redis同步失败: {e}")
                         
-                        if doc["data_format"] == "dataframe_json":
-                            return pd.read_json(doc["data"], orient='records')
-                        else:
-                            return doc["data"]
+                        return decode_payload(doc["data"], doc.get("data_format"))
                         
             except Exception as e:
                 logger.error(f"⚠️ MongoDB加载失败: {e}")
@@ -338,10 +329,10 @@ class DatabaseCacheManager:
             "start_date": start_date,
             "end_date": end_date,
             "data_source": data_source,
-            "data": news_data,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        doc["data"], doc["data_format"] = encode_payload(news_data)
 
         # 保存到MongoDB
         if MONGODB_AVAILABLE:
@@ -357,17 +348,7 @@ class DatabaseCacheManager:
         # 保存到Redis（24小时过期）
         if self.redis_client:
             try:
-                redis_data = {
-                    "data": news_data,
-                    "symbol": symbol,
-                    "data_source": data_source,
-                    "created_at": doc["created_at"].isoformat()
-                }
-                self.redis_client.setex(
-                    cache_key,
-                    24 * 3600,  # 24小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
-                )
+                self._set_redis_payload(cache_key, doc["data"], doc["data_format"], 24 * 3600)  # 24小时过期
                 logger.info(f"⚡ 新闻数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
                 logger.error(f"⚠️ Redis缓存失败: {e}")
@@ -391,10 +372,10 @@ class DatabaseCacheManager:
             "data_type": "fundamentals_data",
             "analysis_date": analysis_date,
             "data_source": data_source,
-            "data": fundamentals_data,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        doc["data"], doc["data_format"] = encode_payload(fundamentals_data)
 
         # 保存到MongoDB
         if MONGODB_AVAILABLE:
@@ -410,18 +391,7 @@ class DatabaseCacheManager:
         # 保存到Redis（24小时过期）
         if self.redis_client:
             try:
-                redis_data = {
-                    "data": fundamentals_data,
-                    "symbol": symbol,
-                    "data_source": data_source,
-                    "analysis_date": analysis_date,
-                    "created_at": doc["created_at"].isoformat()
-                }
-                self.redis_client.setex(
-                    cache_key,
-                    24 * 3600,  # 24小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
-                )
+                self._set_redis_payload(cache_key, doc["data"], doc["data_format"], 24 * 3600)  # 24小时过期
                 logger.info(f"⚡ 基本面数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
                 logger.error(f"⚠️ Redis缓存失败: {e}")
@@ -13,6 +13,7 @@ import warnings
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.http_client import get_http_client
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
@@ -158,7 +159,7 @@ class EODHDProvider:
             }
             
             # 调用API
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_client().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             news_data = response.json()
@@ -256,7 +257,7 @@ class EODHDProvider:
             }
             
             # 调用API
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_client().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             news_data = response.json()
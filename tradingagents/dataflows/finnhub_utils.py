@@ -1,11 +1,67 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.config.env_utils import parse_int_env
 logger = get_logger('agents')
 
 
+class FinnhubFileCache:
+    """
+    进程内的 Finnhub 离线数据文件缓存
+
+    同一 ticker 在连续交易日的回放中反复读取同一个数MB的 JSON 文件，
+    这里缓存解析结果，并按文件 mtime/大小失效；同时为日期键建立有序索引，
+    区间查询用 bisect 切片，不再逐键比较。
+    """
+
+    def __init__(self, max_files: int = None):
+        self.max_files = max_files or max(1, parse_int_env("FINNHUB_FILE_CACHE_SIZE", 64))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, data_path: str, stat: os.stat_result):
+        with open(data_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # 有序日期键及其在文件中的原始位置（切片结果按原始顺序返回）
+        index = sorted((key, position) for position, key in enumerate(data))
+        return {
+            'signature': (stat.st_mtime_ns, stat.st_size),
+            'data': data,
+            'keys': [key for key, _ in index],
+            'positions': [position for _, position in index],
+            'ordered_keys': list(data),
+        }
+
+    def get(self, data_path: str):
+        """获取文件的解析结果与日期索引，文件变化时重新加载"""
+        stat = os.stat(data_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(data_path)
+            if entry is not None and entry['signature'] == signature:
+                self._entries.move_to_end(data_path)
+                return entry
+
+        entry = self._load(data_path, stat)
+        with self._lock:
+            self._entries[data_path] = entry
+            self._entries.move_to_end(data_path)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_file_cache = FinnhubFileCache()
+
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
     """
@@ -36,8 +92,7 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             logger.warning(f"⚠️ [DEBUG] 请确保已下载相关数据或检查数据目录配置")
             return {}
         
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        entry = _file_cache.get(data_path)
     except FileNotFoundError:
         logger.error(f"❌ [ERROR] 文件未找到: {data_path}")
         return {}
@@ -49,8 +104,15 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         return {}
 
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
+    keys = entry['keys']
+    lo = bisect_left(keys, start_date)
+    hi = bisect_right(keys, end_date)
+    data = entry['data']
+    ordered_keys = entry['ordered_keys']
     filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
+    for position in sorted(entry['positions'][lo:hi]):
+        key = ordered_keys[position]
+        value = data[key]
+        if len(value) > 0:
             filtered_data[key] = value
     return filtered_data
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+港股名称缓存
+ImprovedHKStockProvider 原先把名称缓存保存在工作目录的 hk_stock_cache.json 中：
+构造时整体读入，每获取一个新名称就以 indent=2 整体重写。多线程或多进程并发分析
+时各自读写同一文件，相互覆盖，且每次都要付出整文件重写的代价。
+
+本模块以本地 SQLite 文件作为键值存储，并在进程内保留一份内存副本：
+
+- 按 5 位代码单键原子写入（INSERT ... ON CONFLICT），不重写其他条目
+- 每条记录带过期时间，默认名称使用较短的 TTL
+- 首次使用时在后台批量预加载港交所上市列表（AKShare 港股行情），之后的查询均为内存命中；
+  预加载时间记录在库中，多个进程共享同一份列表，TTL 内不会重复拉取
+- WAL 模式允许 Web 服务与 CLI 等多个进程同时读写
+
+【使用方式】
+from tradingagents.dataflows.hk_name_store import get_hk_name_store
+store = get_hk_name_store()
+name = store.get("0700.HK")                  # "腾讯控股" 或 None
+store.put("0700.HK", "腾讯控股", source="akshare_api")
+
+【配置】
+HK_NAME_CACHE_PATH           SQLite 文件路径（默认 data/cache/hk_stock_names.sqlite3）
+HK_NAME_CACHE_TTL_HOURS      名称有效小时数（默认 24）
+HK_NAME_CACHE_PRELOAD        是否预加载港交所上市列表（默认 true）
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_bool_env, parse_float_env, parse_str_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 上市列表预加载时间在 meta 表中的键
+_LISTING_LOADED_AT = "listing_loaded_at"
+
+
+def normalize_hk_code(symbol: str) -> str:
+    """统一为 5 位港股代码："0700.HK" / "700" / "00700" -> "00700" """
+    code = str(symbol or '').strip().upper()
+    if code.endswith('.HK'):
+        code = code[:-3]
+    return code.zfill(5) if code.isdigit() else code
+
+
+class HKNameStore:
+    """基于 SQLite 的港股名称缓存（带内存副本）"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or parse_str_env("HK_NAME_CACHE_PATH", "data/cache/hk_stock_names.sqlite3")
+        self.ttl_seconds = max(60.0, parse_float_env("HK_NAME_CACHE_TTL_HOURS", 24.0) * 3600)
+        self.preload_enabled = parse_bool_env("HK_NAME_CACHE_PRELOAD", True)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # 代码 -> (名称, 来源, 过期时间)
+        self._names: Dict[str, Tuple[str, str, float]] = {}
+        self._loaded = False
+        self._preloading = False
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "preloaded": 0, "errors": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时打开数据库（调用方需持有锁）"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS names (
+                    code TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    source TEXT,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _ensure_loaded(self):
+        """首次使用时把未过期的名称读入内存，并按需在后台预加载上市列表"""
+        if self._loaded:
+            return
+        start_preload = False
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                conn = self._connect()
+                now = time.time()
+                for code, name, source, expires_at in conn.execute(
+                    "SELECT code, name, source, expires_at FROM names WHERE expires_at > ?", (now,)
+                ):
+                    self._names[code] = (name, source, expires_at)
+                row = conn.execute("SELECT value FROM meta WHERE key = ?", (_LISTING_LOADED_AT,)).fetchone()
+                start_preload = self.preload_enabled and (row is None or now - row[0] > self.ttl_seconds)
+                logger.info(f"📊 [港股名称缓存] 已加载 {len(self._names)} 个名称: {self.path}")
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ [港股名称缓存] 打开缓存失败，仅使用内存缓存: {e}")
+            self._loaded = True
+            if start_preload:
+                self._preloading = True
+
+        if start_preload:
+            threading.Thread(target=self._preload_listing, name="hk-name-preload", daemon=True).start()
+
+    def get(self, symbol: str) -> Optional[str]:
+        """获取未过期的名称，不存在返回 None"""
+        self._ensure_loaded()
+        code = normalize_hk_code(symbol)
+        now = time.time()
+        with self._lock:
+            entry = self._names.get(code)
+            if entry is None and self._conn is not None:
+                # 其他进程可能已写入
+                try:
+                    row = self._conn.execute(
+                        "SELECT name, source, expires_at FROM names WHERE code = ?", (code,)
+                    ).fetchone()
+                    if row is not None:
+                        entry = self._names[code] = tuple(row)
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    logger.debug(f"📊 [港股名称缓存] 读取失败: {e}")
+            if entry is None or entry[2] <= now:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, symbol: str, name: str, source: str = "", ttl_seconds: Optional[float] = None):
+        """写入单个名称（原子 upsert）"""
+        self.put_many([(symbol, name)], source, ttl_seconds)
+
+    def put_many(self, items: Iterable[Tuple[str, str]], source: str = "", ttl_seconds: Optional[float] = None) -> int:
+        """在一个事务内批量写入名称"""
+        self._ensure_loaded()
+        expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        rows = [(normalize_hk_code(symbol), str(name), source, expires_at) for symbol, name in items if symbol and name]
+        if not rows:
+            return 0
+        with self._lock:
+            for code, name, row_source, row_expires_at in rows:
+                self._names[code] = (name, row_source, row_expires_at)
+            self._stats["writes"] += len(rows)
+            if self._conn is None:
+                return len(rows)
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO names (code, name, source, expires_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(code) DO UPDATE SET name = excluded.name, source = excluded.source, "
+                        "expires_at = excluded.expires_at",
+                        rows,
+                    )
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.debug(f"📊 [港股名称缓存] 写入失败: {e}")
+        return len(rows)
+
+    def _preload_listing(self):
+        """批量预加载港交所上市列表"""
+        try:
+            from tradingagents.dataflows.akshare_utils import get_akshare_provider
+
+            provider = get_akshare_provider()
+            if not provider.connected:
+                return
+            spot_data = provider._call_with_timeout(provider.ak.stock_hk_spot_em, timeout=60)
+            if spot_data is None or spot_data.empty:
+                return
+            count = self.put_many(zip(spot_data['代码'].astype(str), spot_data['名称'].astype(str)), "hkex_listing")
+            with self._lock:
+                self._stats["preloaded"] = count
+                if self._conn is not None:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (_LISTING_LOADED_AT, time.time())
+                        )
+            logger.info(f"📊 [港股名称缓存] 预加载港交所上市列表 {count} 只")
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"⚠️ [港股名称缓存] 预加载上市列表失败: {e}")
+        finally:
+            self._preloading = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存条数、命中与预加载统计"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["size"] = len(self._names)
+        stats["path"] = self.path
+        stats["preloading"] = self._preloading
+        return stats
+
+
+hk_name_store: Optional[HKNameStore] = None
+_hk_name_store_lock = threading.Lock()
+
+
+def get_hk_name_store() -> HKNameStore:
+    """获取全局港股名称缓存（懒加载单例）"""
+    global hk_name_store
+    if hk_name_store is None:
+        with _hk_name_store_lock:
+            if hk_name_store is None:
+                hk_name_store = HKNameStore()
+    return hk_name_store
+
+
+def get_hk_name_store_stats() -> Dict[str, Any]:
+    """获取港股名称缓存统计，未初始化时返回空统计"""
+    if hk_name_store is None:
+        return {"size": 0, "hits": 0, "misses": 0}
+    return hk_name_store.get_stats()
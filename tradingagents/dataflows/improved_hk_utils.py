@@ -5,13 +5,12 @@
 """
 
 import time
-import json
-import os
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
+from tradingagents.dataflows.hk_name_store import get_hk_name_store
 logger = get_logger("default")
 
 
@@ -19,8 +18,8 @@ class ImprovedHKStockProvider:
     """改进的港股数据提供器"""
     
     def __init__(self):
-        self.cache_file = "hk_stock_cache.json"
-        self.cache_ttl = 3600 * 24  # 24小时缓存
+        self.cache = get_hk_name_store()
+        self.default_name_ttl = 3600  # 默认名称1小时后过期
         self.rate_limit_wait = 5  # 速率限制等待时间
         self.last_request_time = 0
         
@@ -82,36 +81,6 @@ class ImprovedHKStockProvider:
             '0902.HK': '华能国际', '0902': '华能国际', '00902': '华能国际',
             '0991.HK': '大唐发电', '0991': '大唐发电', '00991': '大唐发电'
         }
-        
-        self._load_cache()
-    
-    def _load_cache(self):
-        """加载缓存"""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-            else:
-                self.cache = {}
-        except Exception as e:
-            logger.debug(f"📊 [港股缓存] 加载缓存失败: {e}")
-            self.cache = {}
-    
-    def _save_cache(self):
-        """保存缓存"""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.debug(f"📊 [港股缓存] 保存缓存失败: {e}")
-    
-    def _is_cache_valid(self, key: str) -> bool:
-        """检查缓存是否有效"""
-        if key not in self.cache:
-            return False
-        
-        cache_time = self.cache[key].get('timestamp', 0)
-        return (time.time() - cache_time) < self.cache_ttl
     
     def _normalize_hk_symbol(self, symbol: str) -> str:
         """标准化港股代码"""
@@ -142,9 +111,8 @@ class ImprovedHKStockProvider:
         """
         try:
             # 检查缓存
-            cache_key = f"name_{symbol}"
-            if self._is_cache_valid(cache_key):
-                cached_name = self.cache[cache_key]['data']
+            cached_name = self.cache.get(symbol)
+            if cached_name:
                 logger.debug(f"📊 [港股缓存] 从缓存获取公司名称: {symbol} -> {cached_name}")
                 return cached_name
             
@@ -157,12 +125,7 @@ class ImprovedHKStockProvider:
                     company_name = self.hk_stock_names[format_symbol]
                     
                     # 缓存结果
-                    self.cache[cache_key] = {
-                        'data': company_name,
-                        'timestamp': time.time(),
-                        'source': 'builtin_mapping'
-                    }
-                    self._save_cache()
+                    self.cache.put(symbol, company_name, source='builtin_mapping')
                     
                     logger.debug(f"📊 [港股映射] 获取公司名称: {symbol} -> {company_name}")
                     return company_name
@@ -188,12 +151,7 @@ class ImprovedHKStockProvider:
                         akshare_name = akshare_info['name']
                         if not akshare_name.startswith('港股'):
                             # 缓存AKShare结果
-                            self.cache[cache_key] = {
-                                'data': akshare_name,
-                                'timestamp': time.time(),
-                                'source': 'akshare_api'
-                            }
-                            self._save_cache()
+                            self.cache.put(symbol, akshare_name, source='akshare_api')
 
                             logger.debug(f"📊 [港股AKShare] 获取公司名称: {symbol} -> {akshare_name}")
                             return akshare_name
@@ -208,12 +166,7 @@ class ImprovedHKStockProvider:
                     api_name = hk_info['name']
                     if not api_name.startswith('港股'):
                         # 缓存API结果
-                        self.cache[cache_key] = {
-                            'data': api_name,
-                            'timestamp': time.time(),
-                            'source': 'unified_api'
-                        }
-                        self._save_cache()
+                        self.cache.put(symbol, api_name, source='unified_api')
 
                         logger.debug(f"📊 [港股统一API] 获取公司名称: {symbol} -> {api_name}")
                         return api_name
@@ -226,12 +179,7 @@ class ImprovedHKStockProvider:
             default_name = f"港股{clean_symbol}"
             
             # 缓存默认结果（较短的TTL）
-            self.cache[cache_key] = {
-                'data': default_name,
-                'timestamp': time.time() - self.cache_ttl + 3600,  # 1小时后过期
-                'source': 'default'
-            }
-            self._save_cache()
+            self.cache.put(symbol, default_name, source='default', ttl_seconds=self.default_name_ttl)
             
             logger.debug(f"📊 [港股默认] 使用默认名称: {symbol} -> {default_name}")
             return default_name
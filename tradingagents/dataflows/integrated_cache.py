@@ -152,6 +152,40 @@ class IntegratedCacheManager:
                 data_source=data_source
             )
     
+    def get_fresh_stock_data(self, symbol: str, start_date: str = None, end_date: str = None,
+                             data_source: str = "default", max_age_hours: int = None) -> Optional[Any]:
+        """
+        获取有效的缓存股票数据，代替 find_cached_stock_data + load_stock_data 的两次读取
+        
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+            data_source: 数据源
+            max_age_hours: 最大缓存时间（仅传统缓存使用，自适应缓存按配置的TTL）
+            
+        Returns:
+            股票数据或None
+        """
+        if self.use_adaptive:
+            # 使用自适应缓存系统
+            return self.adaptive_cache.get_if_fresh(
+                symbol=symbol,
+                start_date=start_date or "",
+                end_date=end_date or "",
+                data_source=data_source,
+                data_type="stock_data"
+            )
+        else:
+            # 使用传统缓存系统
+            return self.legacy_cache.get_fresh_stock_data(
+                symbol=symbol,
+                start_date=start_date,
+                end_date=end_date,
+                data_source=data_source,
+                max_age_hours=max_age_hours
+            )
+    
     def save_news_data(self, symbol: str, data: Any, data_source: str = "default") -> str:
         """保存新闻数据"""
         if self.use_adaptive:
@@ -10,6 +10,7 @@ from tradingagents.utils.logging_init import setup_dataflow_logging
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.rate_limiter import rate_limit
 logger = get_logger('agents')
 logger = setup_dataflow_logging()
 
@@ -888,6 +889,7 @@ def get_fundamentals_finnhub(ticker, curr_date):
         
         # 获取基本财务数据
         try:
+            rate_limit("finnhub")
             basic_financials = finnhub_client.company_basic_financials(ticker, 'all')
         except Exception as e:
             logger.error(f"❌ [DEBUG] Finnhub基本财务数据获取失败: {str(e)}")
@@ -895,6 +897,7 @@ def get_fundamentals_finnhub(ticker, curr_date):
         
         # 获取公司概况
         try:
+            rate_limit("finnhub")
             company_profile = finnhub_client.company_profile2(symbol=ticker)
         except Exception as e:
             logger.error(f"❌ [DEBUG] Finnhub公司概况获取失败: {str(e)}")
@@ -902,6 +905,7 @@ def get_fundamentals_finnhub(ticker, curr_date):
         
         # 获取收益数据
         try:
+            rate_limit("finnhub")
             earnings = finnhub_client.company_earnings(ticker, limit=4)
         except Exception as e:
             logger.error(f"❌ [DEBUG] Finnhub收益数据获取失败: {str(e)}")
@@ -5,7 +5,6 @@
 """
 
 import os
-import time
 import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -14,6 +13,7 @@ from .config import get_config
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.single_flight import single_flight
 logger = get_logger('agents')
 
 
@@ -23,22 +23,10 @@ class OptimizedChinaDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = get_config()
-        self.last_api_call = 0
-        self.min_api_interval = 0.5  # Tushare数据接口调用间隔较短
         
         logger.info(f"📊 优化A股数据提供器初始化完成")
     
-    def _wait_for_rate_limit(self):
-        """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
-            time.sleep(wait_time)
-        
-        self.last_api_call = time.time()
-    
+    @single_flight("china_cached", "stock_data")
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
@@ -57,27 +45,22 @@ class OptimizedChinaDataProvider:
         
         # 检查缓存（除非强制刷新）
         if not force_refresh:
-            cache_key = self.cache.find_cached_stock_data(
+            cached_data = self.cache.get_fresh_stock_data(
                 symbol=symbol,
                 start_date=start_date,
                 end_date=end_date,
                 data_source="unified"
             )
             
-            if cache_key:
-                cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
-                    logger.info(f"⚡ 从缓存加载A股数据: {symbol}")
-                    return cached_data
+            if cached_data:
+                logger.info(f"⚡ 从缓存加载A股数据: {symbol}")
+                return cached_data
         
         # 缓存未命中，从Tushare数据接口获取
         logger.info(f"🌐 从Tushare数据接口获取数据: {symbol}")
         
         try:
-            # API限制处理
-            self._wait_for_rate_limit()
-            
-            # 调用统一数据源接口（默认Tushare，支持备用数据源）
+            # 调用统一数据源接口（默认Tushare，支持备用数据源；各数据源调用时各自限流）
             from .data_source_manager import get_china_stock_data_unified
 
             formatted_data = get_china_stock_data_unified(
@@ -123,6 +106,7 @@ class OptimizedChinaDataProvider:
             # 生成备用数据
             return self._generate_fallback_data(symbol, start_date, end_date, error_msg)
     
+    @single_flight("china_cached", "fundamentals")
     def get_fundamentals_data(self, symbol: str, force_refresh: bool = False) -> str:
         """
         获取A股基本面数据 - 优先使用缓存
@@ -201,20 +185,14 @@ class OptimizedChinaDataProvider:
         volume = "N/A"
         change_pct = "N/A"
 
-        # 首先尝试从统一接口获取股票基本信息
+        # 首先尝试从证券主数据获取股票名称
         try:
             logger.debug(f"🔍 [股票代码追踪] 尝试获取{symbol}的基本信息...")
-            from .interface import get_china_stock_info_unified
+            from .data_source_manager import get_china_stock_info_unified
             stock_info = get_china_stock_info_unified(symbol)
-            logger.debug(f"🔍 [股票代码追踪] 获取到的股票信息: {stock_info}")
-
-            if "股票名称:" in stock_info:
-                lines = stock_info.split('\n')
-                for line in lines:
-                    if "股票名称:" in line:
-                        company_name = line.split(':')[1].strip()
-                        logger.debug(f"🔍 [股票代码追踪] 从统一接口获取到股票名称: {company_name}")
-                        break
+            if stock_info.get('name') and stock_info['name'] != f'股票{symbol}':
+                company_name = stock_info['name']
+                logger.debug(f"🔍 [股票代码追踪] 获取到股票名称: {company_name}")
         except Exception as e:
             logger.warning(f"⚠️ 获取股票基本信息失败: {e}")
 
@@ -5,7 +5,6 @@
 """
 
 import os
-import time
 import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -16,6 +15,8 @@ from .config import get_config
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.rate_limiter import rate_limit
+from tradingagents.utils.single_flight import single_flight
 logger = get_logger('agents')
 
 
@@ -25,23 +26,16 @@ class OptimizedUSDataProvider:
     def __init__(self):
         self.cache = get_cache()
         self.config = get_config()
-        self.last_api_call = 0
-        self.min_api_interval = 1.0  # 最小API调用间隔（秒）
         
         logger.info(f"📊 优化美股数据提供器初始化完成")
     
-    def _wait_for_rate_limit(self):
-        """等待API限制"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.min_api_interval:
-            wait_time = self.min_api_interval - time_since_last_call
-            logger.info(f"⏳ API限制等待 {wait_time:.1f}s...")
-            time.sleep(wait_time)
-        
-        self.last_api_call = time.time()
+    def _wait_for_rate_limit(self, source: str = "yfinance"):
+        """等待API限制（进程内按数据源共享的令牌桶）"""
+        wait_time = rate_limit(source)
+        if wait_time > 0:
+            logger.info(f"⏳ {source} API限制等待 {wait_time:.1f}s...")
     
+    @single_flight("us_cached", "stock_data")
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
@@ -61,7 +55,7 @@ class OptimizedUSDataProvider:
         # 检查缓存（除非强制刷新）
         if not force_refresh:
             # 优先查找FINNHUB缓存
-            cache_key = self.cache.find_cached_stock_data(
+            cached_data = self.cache.get_fresh_stock_data(
                 symbol=symbol,
                 start_date=start_date,
                 end_date=end_date,
@@ -69,19 +63,17 @@ class OptimizedUSDataProvider:
             )
 
             # 如果没有FINNHUB缓存，查找Yahoo Finance缓存
-            if not cache_key:
-                cache_key = self.cache.find_cached_stock_data(
+            if not cached_data:
+                cached_data = self.cache.get_fresh_stock_data(
                     symbol=symbol,
                     start_date=start_date,
                     end_date=end_date,
                     data_source="yfinance"
                 )
 
-            if cache_key:
-                cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
-                    logger.info(f"⚡ 从缓存加载美股数据: {symbol}")
-                    return cached_data
+            if cached_data:
+                logger.info(f"⚡ 从缓存加载美股数据: {symbol}")
+                return cached_data
         
         # 缓存未命中，从API获取 - 优先使用FINNHUB
         formatted_data = None
@@ -90,7 +82,6 @@ class OptimizedUSDataProvider:
         # 尝试FINNHUB API（优先）
         try:
             logger.info(f"🌐 从FINNHUB API获取数据: {symbol}")
-            self._wait_for_rate_limit()
 
             formatted_data = self._get_data_from_finnhub(symbol, start_date, end_date)
             if formatted_data and "❌" not in formatted_data:
@@ -130,7 +121,7 @@ class OptimizedUSDataProvider:
                         # 备用方案：Yahoo Finance
                         logger.info(f"🔄 使用Yahoo Finance备用方案获取港股数据: {symbol}")
 
-                        self._wait_for_rate_limit()
+                        self._wait_for_rate_limit("yfinance_hk")
                         ticker = yf.Ticker(symbol)  # 港股代码保持原格式
                         data = ticker.history(start=start_date, end=end_date)
 
@@ -281,11 +272,13 @@ class OptimizedUSDataProvider:
             client = finnhub.Client(api_key=api_key)
 
             # 获取实时报价
+            self._wait_for_rate_limit("finnhub")
             quote = client.quote(symbol.upper())
             if not quote or 'c' not in quote:
                 return None
 
             # 获取公司信息
+            self._wait_for_rate_limit("finnhub")
             profile = client.company_profile2(symbol=symbol.upper())
             company_name = profile.get('name', symbol.upper()) if profile else symbol.upper()
 
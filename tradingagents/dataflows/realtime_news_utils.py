@@ -15,6 +15,7 @@ from dataclasses import dataclass
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.http_client import get_http_client
 logger = get_logger('agents')
 
 
@@ -38,6 +39,8 @@ class RealtimeNewsAggregator:
         self.headers = {
             'User-Agent': 'TradingAgents-CN/1.0'
         }
+        # 共享连接池的HTTP客户端（默认超时、keep-alive、条件请求）
+        self.http = get_http_client()
         
         # API密钥配置
         self.finnhub_key = os.getenv('FINNHUB_API_KEY')
@@ -168,7 +171,7 @@ class RealtimeNewsAggregator:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.http.get(url, params=params, headers=self.headers, conditional=True)
             response.raise_for_status()
             
             news_data = response.json()
@@ -213,7 +216,7 @@ class RealtimeNewsAggregator:
                 'limit': 50
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.http.get(url, params=params, headers=self.headers, conditional=True)
             response.raise_for_status()
             
             data = response.json()
@@ -280,7 +283,7 @@ class RealtimeNewsAggregator:
                 'apiKey': self.newsapi_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = self.http.get(url, params=params, headers=self.headers, conditional=True)
             response.raise_for_status()
             
             data = response.json()
@@ -455,7 +458,10 @@ class RealtimeNewsAggregator:
             import feedparser
             
             logger.debug(f"[RSS解析] 尝试获取RSS源内容")
-            feed = feedparser.parse(rss_url)
+            # 由共享客户端拉取（带超时与条件请求），feedparser 只负责解析
+            response = self.http.get(rss_url, headers=self.headers, conditional=True)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             if not feed or not feed.entries:
                 logger.warning(f"[RSS解析] RSS源未返回有效内容")
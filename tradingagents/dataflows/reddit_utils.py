@@ -3,9 +3,11 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, List, Optional, Tuple
 import os
 import re
+import sqlite3
+import threading
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -63,8 +65,6 @@ def fetch_top_from_category(
 ):
     base_path = data_path
 
-    all_content = []
-
     if max_limit < len(os.listdir(os.path.join(base_path, category))):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
@@ -74,6 +74,38 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
+    # Serve from the (category, date) partitioned index; rebuilt automatically
+    # when the source .jsonl files change.
+    index_path = ensure_reddit_index(category, base_path)
+    if index_path:
+        return _fetch_from_index(index_path, base_path, category, date, limit_per_subreddit, query)
+
+    return _scan_category(base_path, category, date, limit_per_subreddit, query)
+
+
+def _get_search_terms(query: str) -> List[str]:
+    if "OR" in ticker_to_company[query]:
+        search_terms = ticker_to_company[query].split(" OR ")
+    else:
+        search_terms = [ticker_to_company[query]]
+
+    search_terms.append(query)
+    return search_terms
+
+
+def _mentions(search_terms: List[str], title: str, selftext: str) -> bool:
+    for term in search_terms:
+        if re.search(term, title, re.IGNORECASE) or re.search(
+            term, selftext, re.IGNORECASE
+        ):
+            return True
+    return False
+
+
+def _scan_category(base_path, category, date, limit_per_subreddit, query):
+    """Full scan of every .jsonl file in the category (used when the index is unavailable)."""
+    all_content = []
+
     for data_file in os.listdir(os.path.join(base_path, category)):
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
@@ -98,23 +130,11 @@ def fetch_top_from_category(
 
                 # if is company_news, check that the title or the content has the company's name (query) mentioned
                 if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
+                    if not _mentions(
+                        _get_search_terms(query),
+                        parsed_line["title"],
+                        parsed_line["selftext"],
+                    ):
                         continue
 
                 post = {
@@ -133,3 +153,217 @@ def fetch_top_from_category(
         all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
     return all_content
+
+
+# ---------------------------------------------------------------------------
+# Date-partitioned index
+#
+# One SQLite file per category under <data_path>/.index/. Posts are stored
+# once, keyed by (date, subreddit file), with a precomputed ticker-mention
+# table for company categories, so a lookup reads only the requested day's
+# rows instead of re-parsing the whole corpus.
+# ---------------------------------------------------------------------------
+
+REDDIT_INDEX_DIR = ".index"
+REDDIT_INDEX_VERSION = "1"
+
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_guard = threading.Lock()
+# index path -> source signature it was last verified against
+_verified_indexes: Dict[str, Tuple] = {}
+
+
+def _index_path_for(category: str, data_path: str) -> str:
+    return os.path.join(data_path, REDDIT_INDEX_DIR, f"{category}.sqlite")
+
+
+def _source_signature(category: str, data_path: str) -> Tuple:
+    """(file name, size, mtime) of every .jsonl file in the category."""
+    category_dir = os.path.join(data_path, category)
+    signature = []
+    for data_file in sorted(os.listdir(category_dir)):
+        if not data_file.endswith(".jsonl"):
+            continue
+        stat = os.stat(os.path.join(category_dir, data_file))
+        signature.append((data_file, stat.st_size, int(stat.st_mtime)))
+    return tuple(signature)
+
+
+def _read_index_signature(index_path: str) -> Optional[Tuple]:
+    try:
+        conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if meta.get("version") != REDDIT_INDEX_VERSION:
+            return None
+        return tuple(tuple(item) for item in json.loads(meta["signature"]))
+    except (sqlite3.Error, KeyError, ValueError):
+        return None
+    finally:
+        conn.close()
+
+
+def build_reddit_index(
+    category: Annotated[str, "Category folder to index."],
+    data_path: Annotated[str, "Path to the data folder."] = "reddit_data",
+) -> str:
+    """
+    Build the date-partitioned index for one category.
+
+    Parses every .jsonl file once and writes posts plus, for company
+    categories, the ticker mentions for every ticker in ticker_to_company.
+    The index is written to a temp file and swapped in atomically.
+    Returns the index path.
+    """
+    category_dir = os.path.join(data_path, category)
+    index_path = _index_path_for(category, data_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    signature = _source_signature(category, data_path)
+    tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    index_mentions = "company" in category
+    search_terms = {ticker: _get_search_terms(ticker) for ticker in ticker_to_company}
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE posts (
+                id INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                subreddit TEXT NOT NULL,
+                line_no INTEGER NOT NULL,
+                title TEXT,
+                content TEXT,
+                url TEXT,
+                upvotes INTEGER
+            );
+            CREATE TABLE mentions (ticker TEXT NOT NULL, post_id INTEGER NOT NULL);
+            """
+        )
+        post_id = 0
+        for data_file, _, _ in signature:
+            posts = []
+            mentions = []
+            with open(os.path.join(category_dir, data_file), "rb") as f:
+                for line_no, line in enumerate(f):
+                    if not line.strip():
+                        continue
+                    parsed_line = json.loads(line)
+                    post_date = datetime.utcfromtimestamp(
+                        parsed_line["created_utc"]
+                    ).strftime("%Y-%m-%d")
+                    post_id += 1
+                    posts.append((
+                        post_id,
+                        post_date,
+                        data_file,
+                        line_no,
+                        parsed_line["title"],
+                        parsed_line["selftext"],
+                        parsed_line["url"],
+                        parsed_line["ups"],
+                    ))
+                    if index_mentions:
+                        for ticker, terms in search_terms.items():
+                            if _mentions(terms, parsed_line["title"], parsed_line["selftext"]):
+                                mentions.append((ticker, post_id))
+            conn.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", posts)
+            conn.executemany("INSERT INTO mentions VALUES (?, ?)", mentions)
+
+        conn.executescript(
+            """
+            CREATE INDEX idx_posts_date ON posts (date, subreddit, upvotes DESC, line_no);
+            CREATE INDEX idx_mentions_ticker ON mentions (ticker, post_id);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("version", REDDIT_INDEX_VERSION),
+                ("signature", json.dumps(signature)),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, index_path)
+    _verified_indexes[index_path] = signature
+    return index_path
+
+
+def ensure_reddit_index(category: str, data_path: str = "reddit_data") -> Optional[str]:
+    """
+    Return an up-to-date index path for the category, building it if it is
+    missing or the source files changed. Returns None if the index cannot be
+    built (e.g. read-only data folder), in which case callers fall back to a
+    full scan.
+    """
+    index_path = _index_path_for(category, data_path)
+    try:
+        signature = _source_signature(category, data_path)
+        if _verified_indexes.get(index_path) == signature:
+            return index_path
+
+        with _index_locks_guard:
+            lock = _index_locks.setdefault(index_path, threading.Lock())
+        with lock:
+            if _verified_indexes.get(index_path) == signature:
+                return index_path
+            if _read_index_signature(index_path) == signature:
+                _verified_indexes[index_path] = signature
+                return index_path
+            return build_reddit_index(category, data_path)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _fetch_from_index(index_path, base_path, category, date, limit_per_subreddit, query):
+    all_content = []
+    filter_by_company = "company" in category and query
+    if filter_by_company and query not in ticker_to_company:
+        # Unknown tickers raise KeyError, matching the scan path
+        raise KeyError(query)
+
+    conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        # keep the scan path's subreddit order
+        for subreddit in os.listdir(os.path.join(base_path, category)):
+            if not subreddit.endswith(".jsonl"):
+                continue
+            if filter_by_company:
+                rows = conn.execute(
+                    """
+                    SELECT p.title, p.content, p.url, p.upvotes FROM posts p
+                    JOIN mentions m ON m.post_id = p.id AND m.ticker = ?
+                    WHERE p.date = ? AND p.subreddit = ?
+                    ORDER BY p.upvotes DESC, p.line_no
+                    LIMIT ?
+                    """,
+                    (query, date, subreddit, limit_per_subreddit),
+                )
+            else:
+                rows = conn.execute(
+                    """
+                    SELECT title, content, url, upvotes FROM posts
+                    WHERE date = ? AND subreddit = ?
+                    ORDER BY upvotes DESC, line_no
+                    LIMIT ?
+                    """,
+                    (date, subreddit, limit_per_subreddit),
+                )
+            for title, content, url, upvotes in rows:
+                all_content.append({
+                    "title": title,
+                    "content": content,
+                    "url": url,
+                    "upvotes": upvotes,
+                    "posted_date": date,
+                })
+    finally:
+        conn.close()
+    return all_content
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+A股证券主数据（进程内）
+从 stock_dict / stock_basic_info 集合一次性加载股票名称、行业、市场、上市日期等
+基础信息到内存，按代码、带交易所后缀的代码、股票名称 O(1) 查询，替代每次分析
+都经由 Tushare stock_basic 查询、拼接成文本再解析回名称的链路。
+
+- 首次使用时同步加载，之后超过刷新间隔时在后台线程重新加载，期间继续使用旧数据
+- 主数据中没有的代码由 DataSourceManager.get_stock_info 按原有数据源获取后回填
+
+【使用方式】
+from tradingagents.dataflows.security_master import get_security_master, resolve_china_company_name
+info = get_security_master().get("000001.SZ")    # SecurityInfo 或 None
+name = resolve_china_company_name("000001")        # 未找到时返回 "股票代码000001"
+
+【配置】
+SECURITY_MASTER_ENABLED         是否启用内存主数据（默认 true）
+SECURITY_MASTER_REFRESH_HOURS   重新加载间隔小时数（默认 24）
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_bool_env, parse_float_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 交易所后缀（"000001.SZ"、"600000.SS" 等）
+_EXCHANGE_SUFFIXES = ('SZ', 'SH', 'SS', 'BJ')
+
+
+@dataclass(frozen=True)
+class SecurityInfo:
+    """单只股票的基础信息"""
+    symbol: str
+    name: str
+    industry: str = '未知'
+    area: str = '未知'
+    market: str = '未知'
+    exchange: str = ''
+    list_date: str = '未知'
+    list_status: str = 'L'
+    ts_code: str = ''
+    aliases: Tuple[str, ...] = field(default_factory=tuple)
+    source: str = 'security_master'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 DataSourceManager.get_stock_info 的返回格式"""
+        info = asdict(self)
+        info['aliases'] = list(self.aliases)
+        return info
+
+
+def normalize_symbol(symbol: str) -> str:
+    """统一代码格式：去空白、转大写、去掉交易所后缀"""
+    code = str(symbol or '').strip().upper()
+    if '.' in code:
+        head, _, tail = code.partition('.')
+        if tail in _EXCHANGE_SUFFIXES:
+            return head
+        if head in _EXCHANGE_SUFFIXES:
+            return tail
+    return code
+
+
+def _text(value: Any, default: str = '未知') -> str:
+    if value is None:
+        return default
+    value = str(value).strip()
+    return value or default
+
+
+def _is_valid_name(symbol: str, name: Optional[str]) -> bool:
+    return bool(name) and name not in (f'股票{symbol}', f'股票代码{symbol}', '未知')
+
+
+class SecurityMaster:
+    """进程内证券主数据"""
+
+    def __init__(self):
+        self.enabled = parse_bool_env("SECURITY_MASTER_ENABLED", True)
+        self.refresh_seconds = max(60.0, parse_float_env("SECURITY_MASTER_REFRESH_HOURS", 24.0) * 3600)
+
+        self._by_symbol: Dict[str, SecurityInfo] = {}
+        self._by_alias: Dict[str, str] = {}
+        self._loaded_at = 0.0
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "backfilled": 0}
+
+    # ==================== 加载 ====================
+
+    @staticmethod
+    def _from_stock_dict(doc: Dict[str, Any]) -> Optional[SecurityInfo]:
+        symbol = normalize_symbol(doc.get('symbol'))
+        name = _text(doc.get('name'), '')
+        if not symbol or not name:
+            return None
+        ts_code = _text(doc.get('ts_code'), '')
+        aliases = tuple(alias for alias in (ts_code, _text(doc.get('fullname'), '')) if alias)
+        return SecurityInfo(
+            symbol=symbol,
+            name=name,
+            industry=_text(doc.get('industry')),
+            area=_text(doc.get('area')),
+            market=_text(doc.get('market')),
+            exchange=_text(doc.get('exchange'), ''),
+            list_date=_text(doc.get('list_date')),
+            list_status=_text(doc.get('list_status'), 'L'),
+            ts_code=ts_code,
+            aliases=aliases,
+            source='stock_dict',
+        )
+
+    @staticmethod
+    def _from_stock_basic_info(doc: Dict[str, Any]) -> Optional[SecurityInfo]:
+        symbol = normalize_symbol(doc.get('code'))
+        name = _text(doc.get('name'), '')
+        if not symbol or not name:
+            return None
+        return SecurityInfo(
+            symbol=symbol,
+            name=name,
+            industry=_text(doc.get('industry')),
+            area=_text(doc.get('area')),
+            market=_text(doc.get('market')),
+            list_date=_text(doc.get('list_date')),
+            source='stock_basic_info',
+        )
+
+    @staticmethod
+    def _iter_collection(name: str, projection: Dict[str, int]) -> Iterable[Dict[str, Any]]:
+        from tradingagents.storage.manager import get_mongo_collection
+
+        collection = get_mongo_collection(name)
+        if collection is None:
+            return []
+        return collection.find({}, projection)
+
+    def load(self) -> int:
+        """
+        从 MongoDB 全量加载主数据，stock_dict 优先，stock_basic_info 补充
+
+        Returns:
+            int: 加载的股票数
+        """
+        by_symbol: Dict[str, SecurityInfo] = {}
+        try:
+            projection = {'_id': 0, 'symbol': 1, 'ts_code': 1, 'name': 1, 'fullname': 1, 'industry': 1,
+                          'area': 1, 'market': 1, 'exchange': 1, 'list_date': 1, 'list_status': 1}
+            for doc in self._iter_collection('stock_dict', projection):
+                info = self._from_stock_dict(doc)
+                if info:
+                    by_symbol[info.symbol] = info
+
+            projection = {'_id': 0, 'code': 1, 'name': 1, 'industry': 1, 'area': 1, 'market': 1, 'list_date': 1}
+            for doc in self._iter_collection('stock_basic_info', projection):
+                info = self._from_stock_basic_info(doc)
+                if info and info.symbol not in by_symbol:
+                    by_symbol[info.symbol] = info
+        except Exception as e:
+            logger.warning(f"⚠️ [证券主数据] 加载失败，继续使用现有数据: {e}")
+            self._loaded_at = time.time()
+            return len(self._by_symbol)
+
+        # 保留运行期间回填、但集合中尚不存在的股票
+        for symbol, info in self._by_symbol.items():
+            by_symbol.setdefault(symbol, info)
+
+        by_alias: Dict[str, str] = {}
+        for info in by_symbol.values():
+            by_alias.setdefault(info.name, info.symbol)
+            for alias in info.aliases:
+                by_alias.setdefault(alias, info.symbol)
+
+        # 整体替换引用，读取方无需加锁
+        self._by_symbol, self._by_alias = by_symbol, by_alias
+        self._loaded_at = time.time()
+        self._stats["loads"] += 1
+        logger.info(f"✅ [证券主数据] 已加载 {len(by_symbol)} 只股票")
+        return len(by_symbol)
+
+    def _refresh_in_background(self):
+        try:
+            self.load()
+        finally:
+            self._refreshing = False
+
+    def _ensure_loaded(self):
+        """首次使用时同步加载，过期后在后台刷新"""
+        if not self._loaded_at:
+            with self._load_lock:
+                if not self._loaded_at:
+                    self.load()
+            return
+
+        if time.time() - self._loaded_at > self.refresh_seconds and not self._refreshing:
+            with self._load_lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            threading.Thread(
+                target=self._refresh_in_background,
+                daemon=True,
+                name="SecurityMasterRefresh"
+            ).start()
+
+    # ==================== 查询 ====================
+
+    def get(self, symbol: str) -> Optional[SecurityInfo]:
+        """按代码（可带交易所后缀）或股票名称查询"""
+        if not self.enabled or not symbol:
+            return None
+        self._ensure_loaded()
+
+        key = normalize_symbol(symbol)
+        info = self._by_symbol.get(key)
+        if info is None:
+            alias_symbol = self._by_alias.get(key) or self._by_alias.get(str(symbol).strip())
+            info = self._by_symbol.get(alias_symbol) if alias_symbol else None
+
+        self._stats["hits" if info else "misses"] += 1
+        return info
+
+    def get_name(self, symbol: str) -> Optional[str]:
+        """获取股票名称，不存在返回 None"""
+        info = self.get(symbol)
+        return info.name if info else None
+
+    def add(self, info: Dict[str, Any]) -> Optional[SecurityInfo]:
+        """
+        回填由外部数据源获取到的股票信息
+
+        Args:
+            info: DataSourceManager.get_stock_info 返回的字典
+
+        Returns:
+            回填后的 SecurityInfo，名称无效时返回 None
+        """
+        symbol = normalize_symbol(info.get('symbol'))
+        name = _text(info.get('name'), '')
+        if not self.enabled or not symbol or not _is_valid_name(symbol, name):
+            return None
+
+        security = SecurityInfo(
+            symbol=symbol,
+            name=name,
+            industry=_text(info.get('industry')),
+            area=_text(info.get('area')),
+            market=_text(info.get('market')),
+            list_date=_text(info.get('list_date')),
+            source=_text(info.get('source'), 'unknown'),
+        )
+        self._by_symbol[symbol] = security
+        self._by_alias.setdefault(name, symbol)
+        self._stats["backfilled"] += 1
+        return security
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取主数据规模与命中统计"""
+        stats = dict(self._stats)
+        stats["enabled"] = self.enabled
+        stats["securities"] = len(self._by_symbol)
+        stats["loaded_at"] = self._loaded_at or None
+        return stats
+
+
+security_master: Optional[SecurityMaster] = None
+_security_master_lock = threading.Lock()
+
+
+def get_security_master() -> SecurityMaster:
+    """获取全局证券主数据（懒加载单例）"""
+    global security_master
+    if security_master is None:
+        with _security_master_lock:
+            if security_master is None:
+                security_master = SecurityMaster()
+    return security_master
+
+
+def resolve_china_company_name(ticker: str) -> str:
+    """
+    获取A股公司名称：优先查内存主数据，未命中时经数据源管理器获取并回填
+
+    Returns:
+        str: 公司名称，获取失败时返回 "股票代码{ticker}"
+    """
+    name = get_security_master().get_name(ticker)
+    if name:
+        return name
+
+    try:
+        from .data_source_manager import get_china_stock_info_unified
+        info = get_china_stock_info_unified(normalize_symbol(ticker))
+        name = info.get('name') if info else None
+        if _is_valid_name(normalize_symbol(ticker), name):
+            return name
+    except Exception as e:
+        logger.warning(f"⚠️ [证券主数据] 获取{ticker}名称失败: {e}")
+    return f"股票代码{ticker}"
@@ -119,63 +119,58 @@ class TushareDataAdapter:
         if self.enable_cache:
             try:
                 logger.debug(f"🔍 [TushareAdapter详细日志] 开始查找缓存数据...")
-                cache_key = self.cache_manager.find_cached_stock_data(
+                cached_data = self.cache_manager.get_fresh_stock_data(
                     symbol=symbol,
                     start_date=start_date,
                     end_date=end_date,
                     max_age_hours=24  # 日线数据缓存24小时
                 )
 
-                if cache_key:
-                    logger.debug(f"🔍 [TushareAdapter详细日志] 找到缓存键: {cache_key}")
-                    cached_data = self.cache_manager.load_stock_data(cache_key)
-                    if cached_data is not None:
-                        # 检查是否为DataFrame且不为空
-                        if hasattr(cached_data, 'empty') and not cached_data.empty:
-                            # 验证缓存数据的日期范围是否覆盖请求的日期范围
-                            if start_date or end_date:
-                                date_valid = self._validate_cache_date_range(
-                                    cached_data, start_date, end_date
+                if cached_data is not None:
+                    # 检查是否为DataFrame且不为空
+                    if hasattr(cached_data, 'empty') and not cached_data.empty:
+                        # 验证缓存数据的日期范围是否覆盖请求的日期范围
+                        if start_date or end_date:
+                            date_valid = self._validate_cache_date_range(
+                                cached_data, start_date, end_date
+                            )
+                            if not date_valid:
+                                logger.warning(
+                                    f"⚠️ 缓存数据日期范围不匹配请求范围 "
+                                    f"(请求: {start_date} 到 {end_date})，跳过缓存，重新获取"
                                 )
-                                if not date_valid:
-                                    logger.warning(
-                                        f"⚠️ 缓存数据日期范围不匹配请求范围 "
-                                        f"(请求: {start_date} 到 {end_date})，跳过缓存，重新获取"
-                                    )
-                                    # 缓存日期范围不匹配，继续从API获取
-                                else:
-                                    logger.debug(f"📦 从缓存获取{symbol}数据: {len(cached_data)}条")
-                                    logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据有效，确保标准化后返回")
-                                    # 确保缓存数据也经过标准化验证（修复KeyError: 'volume'问题）
-                                    standardized_data = self._validate_and_standardize_data(cached_data)
-                                    # 如果请求了特定日期范围，过滤数据
-                                    if start_date or end_date:
-                                        filtered_data = self._filter_data_by_date_range(
-                                            standardized_data, start_date, end_date
-                                        )
-                                        if not filtered_data.empty:
-                                            return filtered_data
-                                        else:
-                                            logger.warning(
-                                                f"⚠️ 缓存数据过滤后为空 "
-                                                f"(请求: {start_date} 到 {end_date})，跳过缓存，重新获取"
-                                            )
-                                            # 过滤后为空，继续从API获取
-                                    else:
-                                        return standardized_data
+                                # 缓存日期范围不匹配，继续从API获取
                             else:
-                                # 没有指定日期范围，直接返回缓存数据
                                 logger.debug(f"📦 从缓存获取{symbol}数据: {len(cached_data)}条")
                                 logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据有效，确保标准化后返回")
-                                return self._validate_and_standardize_data(cached_data)
-                        elif isinstance(cached_data, str) and cached_data.strip():
-                            logger.debug(f"📦 从缓存获取{symbol}数据: 字符串格式")
-                            logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据为字符串格式")
-                            return cached_data
+                                # 确保缓存数据也经过标准化验证（修复KeyError: 'volume'问题）
+                                standardized_data = self._validate_and_standardize_data(cached_data)
+                                # 如果请求了特定日期范围，过滤数据
+                                if start_date or end_date:
+                                    filtered_data = self._filter_data_by_date_range(
+                                        standardized_data, start_date, end_date
+                                    )
+                                    if not filtered_data.empty:
+                                        return filtered_data
+                                    else:
+                                        logger.warning(
+                                            f"⚠️ 缓存数据过滤后为空 "
+                                            f"(请求: {start_date} 到 {end_date})，跳过缓存，重新获取"
+                                        )
+                                        # 过滤后为空，继续从API获取
+                                else:
+                                    return standardized_data
                         else:
-                            logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据无效: {type(cached_data)}")
+                            # 没有指定日期范围，直接返回缓存数据
+                            logger.debug(f"📦 从缓存获取{symbol}数据: {len(cached_data)}条")
+                            logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据有效，确保标准化后返回")
+                            return self._validate_and_standardize_data(cached_data)
+                    elif isinstance(cached_data, str) and cached_data.strip():
+                        logger.debug(f"📦 从缓存获取{symbol}数据: 字符串格式")
+                        logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据为字符串格式")
+                        return cached_data
                     else:
-                        logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据为None")
+                        logger.debug(f"🔍 [TushareAdapter详细日志] 缓存数据无效: {type(cached_data)}")
                 else:
                     logger.debug(f"🔍 [TushareAdapter详细日志] 未找到有效缓存")
             except Exception as e:
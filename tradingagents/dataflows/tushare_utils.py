@@ -14,6 +14,8 @@ import time
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.single_flight import single_flight
+from tradingagents.utils.rate_limiter import rate_limit
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
@@ -37,6 +39,23 @@ except ImportError:
     logger.error("❌ Tushare库未安装，请运行: pip install tushare")
 
 
+class _RateLimitedTushareApi:
+    """Tushare pro_api 包装：每次接口调用前从进程内共享的 tushare 令牌桶取令牌"""
+    
+    def __init__(self, api):
+        self._api = api
+    
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+        
+        def call(*args, **kwargs):
+            rate_limit("tushare")
+            return attr(*args, **kwargs)
+        return call
+
+
 class TushareProvider:
     """Tushare数据提供器"""
     
@@ -80,7 +99,7 @@ class TushareProvider:
         if TUSHARE_AVAILABLE:
             try:
                 ts.set_token(token)
-                self.api = ts.pro_api()
+                self.api = _RateLimitedTushareApi(ts.pro_api())
                 self.connected = True
                 logger.info("✅ Tushare API连接成功")
             except Exception as e:
@@ -88,6 +107,7 @@ class TushareProvider:
         else:
             logger.error("❌ Tushare库不可用")
     
+    @single_flight("tushare", "stock_basic")
     def get_stock_list(self) -> pd.DataFrame:
         """
         获取A股股票列表
@@ -102,21 +122,19 @@ class TushareProvider:
         try:
             # 尝试从缓存获取
             if self.enable_cache:
-                cache_key = self.cache_manager.find_cached_stock_data(
+                cached_data = self.cache_manager.get_fresh_stock_data(
                     symbol="tushare_stock_list",
                     max_age_hours=24  # 股票列表缓存24小时
                 )
                 
-                if cache_key:
-                    cached_data = self.cache_manager.load_stock_data(cache_key)
-                    if cached_data is not None:
-                        # 检查是否为DataFrame且不为空
-                        if hasattr(cached_data, 'empty') and not cached_data.empty:
-                            logger.info(f"📦 从缓存获取股票列表: {len(cached_data)}条")
-                            return cached_data
-                        elif isinstance(cached_data, str) and cached_data.strip():
-                            logger.info(f"📦 从缓存获取股票列表: 字符串格式")
-                            return cached_data
+                if cached_data is not None:
+                    # 检查是否为DataFrame且不为空
+                    if hasattr(cached_data, 'empty') and not cached_data.empty:
+                        logger.info(f"📦 从缓存获取股票列表: {len(cached_data)}条")
+                        return cached_data
+                    elif isinstance(cached_data, str) and cached_data.strip():
+                        logger.info(f"📦 从缓存获取股票列表: 字符串格式")
+                        return cached_data
             
             logger.info(f"🔄 从Tushare获取A股股票列表...")
             
@@ -151,6 +169,7 @@ class TushareProvider:
             logger.error(f"❌ 获取股票列表失败: {e}")
             return pd.DataFrame()
     
+    @single_flight("tushare", "daily")
     def get_stock_daily(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
         获取股票日线数据
@@ -286,6 +305,7 @@ class TushareProvider:
             logger.error(f"❌ [Tushare详细日志] 异常堆栈: {traceback.format_exc()}")
             return pd.DataFrame()
 
+    @single_flight("tushare", "fund_daily")
     def get_fund_daily(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
         获取基金日线数据
@@ -416,6 +436,7 @@ class TushareProvider:
             logger.error(f"❌ [基金数据] 异常堆栈: {traceback.format_exc()}")
             return pd.DataFrame()
 
+    @single_flight("tushare", "index_daily")
     def get_index_daily(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """
         获取指数日线数据
@@ -612,6 +633,7 @@ class TushareProvider:
             logger.error(f"❌ 返回原始数据")
             return data
     
+    @single_flight("tushare", "stock_info")
     def get_stock_info(self, symbol: str) -> Dict:
         """
         获取股票基本信息
@@ -660,6 +682,7 @@ class TushareProvider:
             logger.error(f"❌ 获取{symbol}股票信息失败: {e}")
             return {'symbol': symbol, 'name': f'股票{symbol}', 'source': 'unknown'}
     
+    @single_flight("tushare", "financial_data")
     def get_financial_data(self, symbol: str, period: str = "20231231") -> Dict:
         """
         获取财务数据
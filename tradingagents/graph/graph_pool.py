@@ -0,0 +1,231 @@
+# TradingAgents/graph/graph_pool.py
+"""
+分析引擎对象池
+
+批量分析时大量任务共享相同的分析师、模型和辩论配置，每次新建
+TradingAgentsGraph 都要重新创建 LLM 客户端、Toolkit、记忆库、工具节点并
+重新 compile 工作流。本模块按有效配置指纹缓存已构建好的引擎：
+
+- GraphPool: 借出 / 归还已编译的 TradingAgentsGraph，同一实例同一时刻只被
+  一个任务使用；股票代码、日期、analysis_id 等任务状态在 propagate 时注入
+- LLMClientCache: 按 LLM 配置缓存客户端，不同引擎之间共享 HTTP 长连接
+
+【使用方式】
+from tradingagents.graph.graph_pool import get_graph_pool
+pool = get_graph_pool()
+graph = pool.acquire(analysts, config)
+try:
+    graph.propagate(symbol, trade_date, analysis_id=analysis_id)
+finally:
+    pool.release(graph)
+
+【配置】
+GRAPH_POOL_ENABLED      是否启用对象池（默认 true）
+GRAPH_POOL_MAX_IDLE     每个配置指纹最多保留的空闲引擎数（默认 2）
+GRAPH_POOL_MAX_KEYS     最多缓存的配置指纹数，超出时淘汰最久未用的（默认 8）
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 影响 LLM 客户端构建的配置项
+_LLM_CONFIG_KEYS = (
+    "llm_provider",
+    "deep_think_llm",
+    "quick_think_llm",
+    "backend_url",
+    "custom_openai_base_url",
+)
+
+
+def compute_config_fingerprint(selected_analysts: List[str], config: Dict[str, Any], debug: bool = False) -> str:
+    """计算引擎配置指纹：分析师列表 + 调试模式 + 有效配置"""
+    payload = {
+        "analysts": list(selected_analysts),
+        "debug": bool(debug),
+        "config": config,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class LLMClientCache:
+    """按 LLM 配置缓存 (deep_thinking_llm, quick_thinking_llm) 客户端对"""
+
+    def __init__(self):
+        self._clients: Dict[str, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(config: Dict[str, Any]) -> str:
+        """仅取影响客户端构建的配置项生成缓存键"""
+        return json.dumps({k: config.get(k) for k in _LLM_CONFIG_KEYS}, sort_keys=True, default=str)
+
+    def get_or_create(self, config: Dict[str, Any], factory: Callable[[], Tuple[Any, Any]]) -> Tuple[Any, Any]:
+        """
+        获取缓存的客户端对，不存在时调用 factory 创建
+
+        factory 在锁外执行，并发首建时以先写入者为准
+        """
+        key = self.make_key(config)
+        with self._lock:
+            clients = self._clients.get(key)
+            if clients is not None:
+                self._hits += 1
+                return clients
+            self._misses += 1
+
+        clients = factory()
+        with self._lock:
+            return self._clients.setdefault(key, clients)
+
+    def clear(self):
+        """清空缓存（API密钥等环境变化后调用）"""
+        with self._lock:
+            self._clients.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cached_clients": len(self._clients),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+class GraphPool:
+    """按配置指纹复用已编译的 TradingAgentsGraph"""
+
+    def __init__(self):
+        self.enabled = parse_bool_env("GRAPH_POOL_ENABLED", True)
+        self.max_idle_per_key = max(0, parse_int_env("GRAPH_POOL_MAX_IDLE", 2))
+        self.max_keys = max(1, parse_int_env("GRAPH_POOL_MAX_KEYS", 8))
+
+        self._idle: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 引擎初始化耗时统计（新建与复用分别统计）
+        self._stats = {
+            "builds": 0,
+            "reuses": 0,
+            "discarded": 0,
+            "build_seconds_total": 0.0,
+            "reuse_seconds_total": 0.0,
+            "last_init_seconds": 0.0,
+            "max_build_seconds": 0.0,
+        }
+
+    def _take_idle(self, fingerprint: str):
+        with self._lock:
+            graphs = self._idle.get(fingerprint)
+            if not graphs:
+                return None
+            self._idle.move_to_end(fingerprint)
+            return graphs.pop()
+
+    def acquire(self, selected_analysts: List[str], config: Dict[str, Any], debug: bool = False):
+        """
+        借出一个与配置匹配的引擎，没有空闲实例时新建
+
+        Args:
+            selected_analysts: 分析师列表
+            config: 有效配置
+            debug: 是否调试模式
+
+        Returns:
+            TradingAgentsGraph 实例，使用完毕后应调用 release 归还
+        """
+        from .trading_graph import TradingAgentsGraph
+
+        start = time.perf_counter()
+        fingerprint = compute_config_fingerprint(selected_analysts, config, debug)
+
+        graph = self._take_idle(fingerprint) if self.enabled else None
+        reused = graph is not None
+        if reused:
+            graph.activate()
+        else:
+            graph = TradingAgentsGraph(selected_analysts, config=config, debug=debug)
+        graph.config_fingerprint = fingerprint
+
+        elapsed = time.perf_counter() - start
+        graph.init_seconds = elapsed
+        with self._lock:
+            self._stats["last_init_seconds"] = elapsed
+            if reused:
+                self._stats["reuses"] += 1
+                self._stats["reuse_seconds_total"] += elapsed
+            else:
+                self._stats["builds"] += 1
+                self._stats["build_seconds_total"] += elapsed
+                self._stats["max_build_seconds"] = max(self._stats["max_build_seconds"], elapsed)
+
+        logger.info(
+            f"🏗️ [引擎池] {'复用' if reused else '新建'}分析引擎 {fingerprint[:8]}，"
+            f"初始化耗时 {elapsed:.3f}s"
+        )
+        return graph
+
+    def release(self, graph):
+        """归还引擎：清理任务状态后放回空闲队列，超出上限则丢弃"""
+        fingerprint = getattr(graph, "config_fingerprint", None)
+        if not self.enabled or not fingerprint:
+            return
+
+        graph.reset_run_state()
+        with self._lock:
+            graphs = self._idle.setdefault(fingerprint, [])
+            self._idle.move_to_end(fingerprint)
+            if len(graphs) < self.max_idle_per_key:
+                graphs.append(graph)
+            else:
+                self._stats["discarded"] += 1
+
+            while len(self._idle) > self.max_keys:
+                _, evicted = self._idle.popitem(last=False)
+                self._stats["discarded"] += len(evicted)
+
+    def clear(self):
+        """清空所有空闲引擎"""
+        with self._lock:
+            self._idle.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取池状态与初始化耗时统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle_graphs"] = sum(len(graphs) for graphs in self._idle.values())
+            stats["fingerprints"] = len(self._idle)
+        builds, reuses = stats["builds"], stats["reuses"]
+        stats["avg_build_seconds"] = round(stats["build_seconds_total"] / builds, 3) if builds else 0.0
+        stats["avg_reuse_seconds"] = round(stats["reuse_seconds_total"] / reuses, 3) if reuses else 0.0
+        stats["reuse_ratio"] = round(reuses / (builds + reuses), 3) if (builds + reuses) else 0.0
+        stats["enabled"] = self.enabled
+        stats["llm_clients"] = llm_client_cache.get_stats()
+        return stats
+
+
+llm_client_cache = LLMClientCache()
+graph_pool: Optional[GraphPool] = None
+_graph_pool_lock = threading.Lock()
+
+
+def get_graph_pool() -> GraphPool:
+    """获取全局引擎池（懒加载单例）"""
+    global graph_pool
+    if graph_pool is None:
+        with _graph_pool_lock:
+            if graph_pool is None:
+                graph_pool = GraphPool()
+    return graph_pool
@@ -13,7 +13,7 @@ from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from tradingagents.llm_adapters import ChatDashScope, ChatDashScopeOpenAI, ChatGoogleOpenAI
 
-from langgraph.prebuilt import ToolNode
+from tradingagents.agents.utils.tool_executor import ConcurrentToolNode
 
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
@@ -37,6 +37,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .graph_pool import llm_client_cache
 
 
 class TradingAgentsGraph:
@@ -67,7 +68,106 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
+        # Initialize LLMs（相同LLM配置的引擎共享客户端及其HTTP长连接）
+        self.deep_thinking_llm, self.quick_thinking_llm = llm_client_cache.get_or_create(
+            self.config, self._create_llms
+        )
+        
+        self.toolkit = Toolkit(config=self.config)
+
+        # Initialize memories (如果启用)
+        memory_enabled = self.config.get("memory_enabled", True)
+        if memory_enabled:
+            # 使用单例ChromaDB管理器，避免并发创建冲突
+            self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
+            self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
+            self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
+            self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
+            self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        else:
+            # 创建空的内存对象
+            self.bull_memory = None
+            self.bear_memory = None
+            self.trader_memory = None
+            self.invest_judge_memory = None
+            self.risk_manager_memory = None
+
+        # Create tool nodes
+        self.tool_nodes = self._create_tool_nodes()
+
+        # Initialize components
+        # 从config读取辩论和风险讨论的轮数配置
+        max_debate_rounds = self.config.get("max_debate_rounds", 1)
+        max_risk_discuss_rounds = self.config.get("max_risk_discuss_rounds", 1)
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=max_debate_rounds,
+            max_risk_discuss_rounds=max_risk_discuss_rounds
+        )
+        self.graph_setup = GraphSetup(
+            self.quick_thinking_llm,
+            self.deep_thinking_llm,
+            self.toolkit,
+            self.tool_nodes,
+            self.bull_memory,
+            self.bear_memory,
+            self.trader_memory,
+            self.invest_judge_memory,
+            self.risk_manager_memory,
+            self.conditional_logic,
+            self.config,
+            getattr(self, 'react_llm', None),
+        )
+
+        self.propagator = Propagator()
+        self.reflector = Reflector(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+
+        # State tracking
+        self.curr_state = None
+        self.ticker = None
+        self.log_states_dict = {}  # date to full state dict
+        
+        # Step-by-step output tracking (内存保存)
+        self.step_traces = []  # List of all chunks during execution
+        self.enable_step_tracking = self.config.get("enable_step_tracking", True)  # 默认启用
+        
+        # 保存分析参数（用于结果复用时的参数匹配）
+        self.selected_analysts = selected_analysts
+        self.research_depth = self.config.get("research_depth", 2)  # 从config中获取研究深度
+        self.market_type = self.config.get("market_type", "美股")  # 从config中获取市场类型
+        
+        # MongoDB步骤状态管理器（用于存储和读取步骤状态）
+        from tradingagents.storage.mongodb.steps_manager import mongodb_steps_status_manager
+        self.steps_status_manager = mongodb_steps_status_manager
+
+        # Set up the graph
+        self.graph = self.graph_setup.setup_graph(selected_analysts)
+
+        # 配置指纹与本次借出的初始化耗时（由引擎池设置）
+        self.config_fingerprint = None
+        self.init_seconds = 0.0
+
+        # 设置graph实例到结果复用辅助工具中
+        from .cache_reuse_helper import set_graph_instance
+        set_graph_instance(self)
+
+    def activate(self):
+        """从引擎池借出时重新生效：恢复全局数据接口配置与结果复用的graph实例"""
+        set_config(self.config)
+        Toolkit.update_config(self.config)
+
+        from .cache_reuse_helper import set_graph_instance
+        set_graph_instance(self)
+
+    def reset_run_state(self):
+        """清理上一次分析留下的任务状态，编译好的工作流、LLM客户端和记忆库保留"""
+        self.curr_state = None
+        self.ticker = None
+        self.log_states_dict = {}
+        self.step_traces = []
+
+    def _create_llms(self) -> Tuple[Any, Any]:
+        """根据 llm_provider 创建 (深度思考, 快速思考) LLM 客户端"""
         if self.config["llm_provider"].lower() == "openai":
             self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
             self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
@@ -234,84 +334,15 @@ class TradingAgentsGraph:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
-        self.toolkit = Toolkit(config=self.config)
-
-        # Initialize memories (如果启用)
-        memory_enabled = self.config.get("memory_enabled", True)
-        if memory_enabled:
-            # 使用单例ChromaDB管理器，避免并发创建冲突
-            self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-            self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-            self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-            self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-            self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
-        else:
-            # 创建空的内存对象
-            self.bull_memory = None
-            self.bear_memory = None
-            self.trader_memory = None
-            self.invest_judge_memory = None
-            self.risk_manager_memory = None
+        return self.deep_thinking_llm, self.quick_thinking_llm
 
-        # Create tool nodes
-        self.tool_nodes = self._create_tool_nodes()
+    def _create_tool_nodes(self) -> Dict[str, ConcurrentToolNode]:
+        """Create tool nodes for different data sources.
 
-        # Initialize components
-        # 从config读取辩论和风险讨论的轮数配置
-        max_debate_rounds = self.config.get("max_debate_rounds", 1)
-        max_risk_discuss_rounds = self.config.get("max_risk_discuss_rounds", 1)
-        self.conditional_logic = ConditionalLogic(
-            max_debate_rounds=max_debate_rounds,
-            max_risk_discuss_rounds=max_risk_discuss_rounds
-        )
-        self.graph_setup = GraphSetup(
-            self.quick_thinking_llm,
-            self.deep_thinking_llm,
-            self.toolkit,
-            self.tool_nodes,
-            self.bull_memory,
-            self.bear_memory,
-            self.trader_memory,
-            self.invest_judge_memory,
-            self.risk_manager_memory,
-            self.conditional_logic,
-            self.config,
-            getattr(self, 'react_llm', None),
-        )
-
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
-
-        # State tracking
-        self.curr_state = None
-        self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
-        
-        # Step-by-step output tracking (内存保存)
-        self.step_traces = []  # List of all chunks during execution
-        self.enable_step_tracking = self.config.get("enable_step_tracking", True)  # 默认启用
-        
-        # 保存分析参数（用于结果复用时的参数匹配）
-        self.selected_analysts = selected_analysts
-        self.research_depth = self.config.get("research_depth", 2)  # 从config中获取研究深度
-        self.market_type = self.config.get("market_type", "美股")  # 从config中获取市场类型
-        
-        # MongoDB步骤状态管理器（用于存储和读取步骤状态）
-        from tradingagents.storage.mongodb.steps_manager import mongodb_steps_status_manager
-        self.steps_status_manager = mongodb_steps_status_manager
-
-        # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
-
-        # 设置graph实例到结果复用辅助工具中
-        from .cache_reuse_helper import set_graph_instance
-        set_graph_instance(self)
-
-    def _create_tool_nodes(self) -> Dict[str, ToolNode]:
-        """Create tool nodes for different data sources."""
+        同一轮的多个工具调用在共享的有界线程池中并发执行。
+        """
         return {
-            "market": ToolNode(
+            "market": ConcurrentToolNode(
                 [
                     # 统一工具
                     self.toolkit.get_stock_market_data_unified,
@@ -323,7 +354,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_stockstats_indicators_report,
                 ]
             ),
-            "social": ToolNode(
+            "social": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_stock_news_openai,
@@ -331,7 +362,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_stock_info,
                 ]
             ),
-            "news": ToolNode(
+            "news": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_global_news_openai,
@@ -341,7 +372,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_news,
                 ]
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": ConcurrentToolNode(
                 [
                     # 统一工具
                     self.toolkit.get_stock_fundamentals_unified,
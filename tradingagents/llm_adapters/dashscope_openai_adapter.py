@@ -10,6 +10,8 @@ from langchain_openai import ChatOpenAI
 from langchain_core.tools import BaseTool
 from pydantic import Field, SecretStr
 from ..config.config_manager import token_tracker
+from .response_cache import cached_generate
+from ..messaging.business.token_stream import stream_or_generate
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -53,8 +55,19 @@ class ChatDashScopeOpenAI(ChatOpenAI):
     def _generate(self, *args, **kwargs):
         """重写生成方法，添加 token 使用量追踪"""
         
-        # 调用父类的生成方法
-        result = super()._generate(*args, **kwargs)
+        # 调用父类的生成方法（启用响应缓存时相同输入直接返回缓存结果，启用逐 token 推送时流式生成）
+        generate, stream = super()._generate, super()._stream
+        messages = args[0] if args else kwargs.get('messages', [])
+        stop = args[1] if len(args) > 1 else kwargs.get('stop')
+        run_manager = args[2] if len(args) > 2 else kwargs.get('run_manager')
+        generate_kwargs = {k: v for k, v in kwargs.items() if k not in ('messages', 'stop', 'run_manager')}
+        result, cached = cached_generate(
+            self, "dashscope", messages, stop, generate_kwargs,
+            lambda: stream_or_generate(generate, stream, messages, stop, run_manager, **generate_kwargs)
+        )
+        if cached:
+            # 命中缓存不产生费用，不记录 token 使用量
+            return result
         
         # 追踪 token 使用量
         try:
@@ -12,6 +12,8 @@ from langchain_core.callbacks import CallbackManagerForLLMRun
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
+from tradingagents.llm_adapters.response_cache import cached_generate
+from tradingagents.messaging.business.token_stream import stream_or_generate
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger, get_logger_manager
@@ -93,8 +95,15 @@ class ChatDeepSeek(ChatOpenAI):
         analysis_type = kwargs.pop('analysis_type', None)
 
         try:
-            # 调用父类方法生成响应
-            result = super()._generate(messages, stop, run_manager, **kwargs)
+            # 调用父类方法生成响应（启用响应缓存时相同输入直接返回缓存结果，启用逐token推送时流式生成）
+            generate, stream = super()._generate, super()._stream
+            result, cached = cached_generate(
+                self, "deepseek", messages, stop, kwargs,
+                lambda: stream_or_generate(generate, stream, messages, stop, run_manager, **kwargs)
+            )
+            if cached:
+                # 命中缓存不产生费用，不记录token使用
+                return result
             
             # 提取token使用量
             input_tokens = 0
@@ -13,6 +13,8 @@ from langchain_core.callbacks import CallbackManagerForLLMRun
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
+from tradingagents.llm_adapters.response_cache import cached_generate
+from tradingagents.messaging.business.token_stream import stream_or_generate
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger, get_logger_manager
@@ -128,11 +130,16 @@ class OpenAICompatibleBase(ChatOpenAI):
         # 记录开始时间
         start_time = time.time()
         
-        # 调用父类生成方法
-        result = super()._generate(messages, stop, run_manager, **kwargs)
+        # 调用父类生成方法（启用响应缓存时相同输入直接返回缓存结果，启用逐token推送时流式生成）
+        generate, stream = super()._generate, super()._stream
+        result, cached = cached_generate(
+            self, self.provider_name or "openai_compatible", messages, stop, kwargs,
+            lambda: stream_or_generate(generate, stream, messages, stop, run_manager, **kwargs)
+        )
         
-        # 记录token使用
-        self._track_token_usage(result, kwargs, start_time)
+        # 记录token使用（命中缓存不计费）
+        if not cached:
+            self._track_token_usage(result, kwargs, start_time)
         
         return result
 
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+LLM 响应缓存（内容寻址）
+崩溃后重跑同一股票、同一日期的分析，或以相同输入回放批量任务时，每次 LLM 调用
+都会按全价、全延迟重新发出。适配器的 temperature 已固定为 0.1，本模块在适配器
+的 _generate 中按 (提供商, 模型, 规范化消息, 工具定义, 采样参数) 的哈希缓存响应：
+
+- 缓存存储在本地 SQLite 文件中，按 TTL 过期，超过条数上限时淘汰最久未使用的记录
+- 命中缓存的调用不计入 token 跟踪（零成本），节省的 token 数计入统计
+- 回放模式下未命中直接报错而不请求接口，可基于录制的响应离线运行分析图做基准测试
+
+【使用方式】
+from tradingagents.llm_adapters.response_cache import cached_generate
+result, cached = cached_generate(self, "deepseek", messages, stop, kwargs,
+                                 lambda: generate(messages, stop, run_manager, **kwargs))
+if not cached:
+    ...  # 记录 token 使用
+
+【配置】
+LLM_RESPONSE_CACHE_ENABLED       是否启用响应缓存（默认 false）
+LLM_RESPONSE_CACHE_REPLAY_ONLY   回放模式：只使用已缓存的响应，未命中时报错（默认 false）
+LLM_RESPONSE_CACHE_PATH          SQLite 文件路径（默认 data/cache/llm_responses.sqlite3）
+LLM_RESPONSE_CACHE_TTL_HOURS     缓存有效小时数，0 表示不过期（默认 168）
+LLM_RESPONSE_CACHE_MAX_ENTRIES   最大缓存条数（默认 20000）
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.config.env_utils import parse_bool_env, parse_float_env, parse_int_env, parse_str_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+# 参与缓存键的采样参数（取自模型实例）
+_SAMPLING_FIELDS = (
+    'temperature', 'max_tokens', 'top_p', 'frequency_penalty', 'presence_penalty',
+    'seed', 'n', 'model_kwargs', 'extra_body',
+)
+
+
+class ResponseCacheMiss(RuntimeError):
+    """回放模式下缓存未命中"""
+
+
+def _normalize_message(message: BaseMessage) -> Dict[str, Any]:
+    """规范化消息：忽略每次运行都会变化的消息 ID 和工具调用 ID"""
+    data: Dict[str, Any] = {"type": message.type, "content": message.content}
+    if getattr(message, 'name', None):
+        data["name"] = message.name
+    tool_calls = getattr(message, 'tool_calls', None)
+    if tool_calls:
+        data["tool_calls"] = [{"name": call.get('name'), "args": call.get('args')} for call in tool_calls]
+    return data
+
+
+def make_cache_key(provider: str, llm: Any, messages: List[BaseMessage],
+                   stop: Optional[List[str]] = None, kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成缓存键：(提供商, 模型, 规范化消息, 工具定义与调用参数, 采样参数) 的 SHA-256
+
+    Args:
+        provider: 提供商名称
+        llm: 模型实例（读取模型名称与采样参数）
+        messages: 输入消息
+        stop: 停止词
+        kwargs: _generate 的其他参数（bind_tools 绑定的 tools / tool_choice 等）
+    """
+    material = {
+        "provider": provider,
+        "model": getattr(llm, 'model_name', None),
+        "messages": [_normalize_message(message) for message in messages],
+        "stop": stop,
+        "sampling": {name: getattr(llm, name, None) for name in _SAMPLING_FIELDS},
+        "kwargs": kwargs or {},
+    }
+    raw = json.dumps(material, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _token_usage(result: ChatResult) -> Tuple[int, int]:
+    """提取响应的 (输入, 输出) token 数"""
+    token_usage = (result.llm_output or {}).get('token_usage') or {}
+    input_tokens = token_usage.get('prompt_tokens') or 0
+    output_tokens = token_usage.get('completion_tokens') or 0
+    if not (input_tokens or output_tokens) and result.generations:
+        usage = getattr(result.generations[0].message, 'usage_metadata', None) or {}
+        input_tokens = usage.get('input_tokens') or 0
+        output_tokens = usage.get('output_tokens') or 0
+    return int(input_tokens), int(output_tokens)
+
+
+def _dump_result(result: ChatResult) -> str:
+    payload = {
+        "generations": [
+            {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+            for generation in result.generations
+        ],
+        "llm_output": result.llm_output,
+    }
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _load_result(raw: str) -> ChatResult:
+    """还原缓存的响应，token 用量置零（命中缓存不产生费用）"""
+    payload = json.loads(raw)
+    generations = []
+    for item in payload["generations"]:
+        message = messages_from_dict([item["message"]])[0]
+        if getattr(message, 'usage_metadata', None):
+            message.usage_metadata = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        generations.append(ChatGeneration(message=message, generation_info=item.get("generation_info")))
+
+    llm_output = dict(payload.get("llm_output") or {})
+    llm_output["token_usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    llm_output["cached"] = True
+    return ChatResult(generations=generations, llm_output=llm_output)
+
+
+class LLMResponseCache:
+    """基于 SQLite 的 LLM 响应缓存"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.enabled = parse_bool_env("LLM_RESPONSE_CACHE_ENABLED", False)
+        self.replay_only = parse_bool_env("LLM_RESPONSE_CACHE_REPLAY_ONLY", False)
+        self.path = path or parse_str_env("LLM_RESPONSE_CACHE_PATH", "data/cache/llm_responses.sqlite3")
+        self.ttl_seconds = max(0.0, parse_float_env("LLM_RESPONSE_CACHE_TTL_HOURS", 168.0) * 3600)
+        self.max_entries = max(100, parse_int_env("LLM_RESPONSE_CACHE_MAX_ENTRIES", 20000))
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0,
+                       "saved_input_tokens": 0, "saved_output_tokens": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """首次使用时打开数据库（调用方需持有锁）"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            # WAL 模式允许多个进程（Web 服务与 CLI）同时读写同一缓存文件
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    payload TEXT NOT NULL,
+                    input_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at);
+                CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+                """
+            )
+            self._conn = conn
+            logger.info(f"💾 [LLM响应缓存] 已打开缓存文件: {self.path}")
+        return self._conn
+
+    def get(self, key: str) -> Optional[ChatResult]:
+        """读取未过期的缓存响应，不存在返回 None"""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT payload, input_tokens, output_tokens, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (self.ttl_seconds and now - row[3] > self.ttl_seconds):
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+                conn.commit()
+                self._stats["hits"] += 1
+                self._stats["saved_input_tokens"] += row[1]
+                self._stats["saved_output_tokens"] += row[2]
+            return _load_result(row[0])
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"⚠️ [LLM响应缓存] 读取失败: {e}")
+            return None
+
+    def put(self, key: str, result: ChatResult, provider: str, model: Optional[str]):
+        """写入响应，并清理过期与超出条数上限的记录"""
+        if not result.generations:
+            return
+        now = time.time()
+        input_tokens, output_tokens = _token_usage(result)
+        try:
+            payload = _dump_result(result)
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, provider, model, payload, input_tokens, output_tokens, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, payload, input_tokens, output_tokens, now, now),
+                )
+                evicted = 0
+                if self.ttl_seconds:
+                    evicted += conn.execute(
+                        "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+                    ).rowcount
+                overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    evicted += conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)", (overflow,)
+                    ).rowcount
+                conn.commit()
+                self._stats["stores"] += 1
+                self._stats["evictions"] += evicted
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"⚠️ [LLM响应缓存] 写入失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存配置与命中统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = None
+            if self._conn is not None:
+                try:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "enabled": self.enabled,
+            "replay_only": self.replay_only,
+            "path": self.path,
+            "entries": entries,
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+        })
+        return stats
+
+
+llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """获取全局 LLM 响应缓存（懒加载单例）"""
+    global llm_response_cache
+    if llm_response_cache is None:
+        with _llm_response_cache_lock:
+            if llm_response_cache is None:
+                llm_response_cache = LLMResponseCache()
+    return llm_response_cache
+
+
+def cached_generate(
+    llm: Any,
+    provider: str,
+    messages: List[BaseMessage],
+    stop: Optional[List[str]],
+    kwargs: Dict[str, Any],
+    generate: Callable[[], ChatResult],
+) -> Tuple[ChatResult, bool]:
+    """
+    经响应缓存执行一次生成
+
+    Args:
+        llm: 模型实例
+        provider: 提供商名称
+        messages / stop / kwargs: 传给 _generate 的参数，用于生成缓存键
+        generate: 实际请求接口的无参函数
+
+    Returns:
+        (响应, 是否命中缓存)
+
+    Raises:
+        ResponseCacheMiss: 回放模式下缓存未命中
+    """
+    cache = get_llm_response_cache()
+    if not cache.enabled:
+        return generate(), False
+
+    key = make_cache_key(provider, llm, messages, stop, kwargs)
+    result = cache.get(key)
+    if result is not None:
+        logger.info(f"💾 [LLM响应缓存] 命中: {provider}/{getattr(llm, 'model_name', 'unknown')}，本次调用不计费")
+        return result, True
+    if cache.replay_only:
+        raise ResponseCacheMiss(f"LLM响应缓存未命中（回放模式）: {provider}/{getattr(llm, 'model_name', 'unknown')} {key[:12]}")
+
+    result = generate()
+    cache.put(key, result, provider, getattr(llm, 'model_name', None))
+    return result, False
+
+
+def get_llm_response_cache_stats() -> Dict[str, Any]:
+    """获取全局 LLM 响应缓存统计，未初始化时返回空统计"""
+    if llm_response_cache is None:
+        return {"hits": 0, "misses": 0}
+    return llm_response_cache.get_stats()
@@ -9,11 +9,13 @@ from .messages import (
     ModuleEvent,
     TaskProgressMessage,
     TaskStatusMessage,
-    ModuleEventMessage
+    ModuleEventMessage,
+    LLMTokenMessage
 )
 from .producer import TaskMessageProducer
 from .consumer import TaskMessageConsumer
 from .handler import ProgressMessageHandler
+from .token_stream import token_stream_context, stream_or_generate
 
 __all__ = [
     'TaskStatus',
@@ -21,8 +23,11 @@ __all__ = [
     'TaskProgressMessage',
     'TaskStatusMessage',
     'ModuleEventMessage',
+    'LLMTokenMessage',
     'TaskMessageProducer',
     'TaskMessageConsumer',
     'ProgressMessageHandler',
+    'token_stream_context',
+    'stream_or_generate',
 ]
 
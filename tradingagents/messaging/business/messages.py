@@ -70,3 +70,15 @@ class ModuleEventMessage:
     error_message: Optional[str] = None
     extra_data: Optional[Dict[str, Any]] = field(default_factory=dict)
 
+
+@dataclass
+class LLMTokenMessage:
+    """LLM 流式文本批次消息"""
+    analysis_id: str
+    module_name: str
+    stream_id: str  # 单次LLM调用的流ID（节点名-序号）
+    seq: int  # 批次序号，从0开始
+    text: str
+    done: bool = False  # 本次LLM调用的最后一个批次
+    total_chars: int = 0
+    elapsed_time: float = 0.0
@@ -0,0 +1,236 @@
+"""
+LLM 逐 token 流式推送
+分析节点在 LLM 生成完成后才发布步骤消息，一份 90 秒的基本面报告期间前端看不到
+任何输出，只能轮询状态接口。启用后，被 message_analysis_module 装饰的节点内的
+LLM 调用改为流式请求，生成的文本经消息引擎（WebSocket / Redis / MQTT）推送：
+
+- 第一段文本立即发布，保证首个 token 在一秒内到达客户端
+- 之后的文本按时间窗口合并为小批次发布，限制消息频率
+- 每次 LLM 调用结束时发布 done=True 的批次，客户端据此结束该段输出
+- 流式响应拼装为与非流式调用一致的 ChatResult，token 统计与响应缓存不受影响
+
+【使用方式】
+# 节点装饰器（已集成）
+with token_stream_context(analysis_id, module_name):
+    result = node(state)
+
+# LLM 适配器（已集成 OpenAICompatibleBase / ChatDashScopeOpenAI / ChatDeepSeek）
+result = stream_or_generate(super()._generate, super()._stream, messages, stop, run_manager, **kwargs)
+
+【配置】
+LLM_TOKEN_STREAMING_ENABLED   是否启用逐 token 推送（默认 false，需同时启用消息模式）
+LLM_TOKEN_STREAM_FLUSH_MS     批次合并时间窗口毫秒数（默认 250）
+LLM_TOKEN_STREAM_MAX_CHARS    单批次最大字符数，超过立即发布（默认 2000）
+"""
+
+import contextlib
+import contextvars
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+from ..handler.message_handler import MessageType
+from .messages import LLMTokenMessage
+
+logger = get_logger('messaging.token_stream')
+
+_stream_ids = itertools.count(1)
+_stats_lock = threading.Lock()
+_stats = {"streams": 0, "batches": 0, "chars": 0, "errors": 0}
+
+
+def is_token_streaming_enabled() -> bool:
+    """检查是否启用逐 token 推送"""
+    return parse_bool_env("LLM_TOKEN_STREAMING_ENABLED", False)
+
+
+def _count(key: str, value: int = 1):
+    with _stats_lock:
+        _stats[key] += value
+
+
+def _chunk_text(chunk: ChatGenerationChunk) -> str:
+    """提取流式分片中的文本（多模态内容取其中的 text 部分）"""
+    content = chunk.message.content
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ''.join(
+            part.get('text', '') if isinstance(part, dict) else str(part)
+            for part in content
+        )
+    return ''
+
+
+class TokenStream:
+    """一次 LLM 调用的 token 流，按时间窗口合并后发布"""
+
+    def __init__(self, analysis_id: str, module_name: str,
+                 flush_interval: Optional[float] = None, max_chars: Optional[int] = None):
+        self.analysis_id = analysis_id
+        self.module_name = module_name
+        self.stream_id = f"{module_name}-{next(_stream_ids)}"
+        self.flush_interval = flush_interval if flush_interval is not None else \
+            max(0, parse_int_env("LLM_TOKEN_STREAM_FLUSH_MS", 250)) / 1000
+        self.max_chars = max_chars if max_chars is not None else \
+            max(1, parse_int_env("LLM_TOKEN_STREAM_MAX_CHARS", 2000))
+
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._seq = 0
+        self._total_chars = 0
+        self._last_flush: Optional[float] = None
+        self._started_at = time.time()
+
+    def push(self, text: str):
+        """追加一段文本：首段立即发布，之后在时间窗口到期或积累过多时发布"""
+        if not text:
+            return
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        now = time.monotonic()
+        if (self._last_flush is None
+                or now - self._last_flush >= self.flush_interval
+                or self._buffered_chars >= self.max_chars):
+            self.flush()
+
+    def flush(self, done: bool = False):
+        """发布缓冲的文本"""
+        if not self._buffer and not done:
+            return
+        text = ''.join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+        self._total_chars += len(text)
+
+        message = LLMTokenMessage(
+            analysis_id=self.analysis_id,
+            module_name=self.module_name,
+            stream_id=self.stream_id,
+            seq=self._seq,
+            text=text,
+            done=done,
+            total_chars=self._total_chars,
+            elapsed_time=time.time() - self._started_at,
+        )
+        self._seq += 1
+        _publish(message)
+
+    def close(self):
+        """结束本次调用的流"""
+        self.flush(done=True)
+
+
+def _publish(message: LLMTokenMessage):
+    """经全局消息处理器发布（WebSocket 引擎的广播回调注册在该处理器上）"""
+    from ..config import get_message_handler
+
+    handler = get_message_handler()
+    if handler is None:
+        return
+    try:
+        handler.publish(MessageType.LLM_TOKEN, {
+            'analysis_id': message.analysis_id,
+            'module_name': message.module_name,
+            'stream_id': message.stream_id,
+            'seq': message.seq,
+            'text': message.text,
+            'done': message.done,
+            'total_chars': message.total_chars,
+            'elapsed_time': message.elapsed_time,
+        })
+        _count("batches")
+        _count("chars", len(message.text))
+    except Exception as e:
+        _count("errors")
+        logger.debug(f"发布token批次失败: {e}")
+
+
+# 当前节点的 (analysis_id, module_name)，由 message_analysis_module 设置
+_current_node: contextvars.ContextVar = contextvars.ContextVar('llm_token_stream_node', default=None)
+
+
+@contextlib.contextmanager
+def token_stream_context(analysis_id: str, module_name: str):
+    """在节点执行期间启用流式推送；未启用逐 token 推送时不做任何处理"""
+    if not analysis_id or not is_token_streaming_enabled():
+        yield
+        return
+    token = _current_node.set((analysis_id, module_name))
+    try:
+        yield
+    finally:
+        _current_node.reset(token)
+
+
+def get_current_token_stream() -> Optional[TokenStream]:
+    """为当前节点内的一次 LLM 调用创建 token 流，不在流式节点内时返回 None"""
+    node = _current_node.get()
+    if node is None:
+        return None
+    return TokenStream(*node)
+
+
+def _with_token_usage(result: ChatResult) -> ChatResult:
+    """流式响应的 token 用量只在消息的 usage_metadata 中，补齐 llm_output 供 token 统计使用"""
+    llm_output = dict(result.llm_output or {})
+    if not llm_output.get('token_usage') and result.generations:
+        usage = getattr(result.generations[0].message, 'usage_metadata', None) or {}
+        if usage:
+            llm_output['token_usage'] = {
+                'prompt_tokens': usage.get('input_tokens', 0),
+                'completion_tokens': usage.get('output_tokens', 0),
+                'total_tokens': usage.get('total_tokens', 0),
+            }
+    return ChatResult(generations=result.generations, llm_output=llm_output)
+
+
+def stream_or_generate(
+    generate: Callable[..., ChatResult],
+    stream: Callable[..., Iterator[ChatGenerationChunk]],
+    messages: List[Any],
+    stop: Optional[List[str]] = None,
+    run_manager: Any = None,
+    **kwargs: Any,
+) -> ChatResult:
+    """
+    在流式节点内以流式请求生成并推送文本，否则直接调用非流式生成
+
+    Args:
+        generate: 适配器父类的 _generate
+        stream: 适配器父类的 _stream
+        messages / stop / run_manager / kwargs: 生成参数
+
+    Returns:
+        ChatResult: 与非流式调用一致的结果
+    """
+    token_stream = get_current_token_stream()
+    if token_stream is None:
+        return generate(messages, stop, run_manager, **kwargs)
+
+    _count("streams")
+
+    def relay() -> Iterator[ChatGenerationChunk]:
+        for chunk in stream(messages, stop, run_manager, stream_usage=True, **kwargs):
+            token_stream.push(_chunk_text(chunk))
+            yield chunk
+
+    try:
+        return _with_token_usage(generate_from_stream(relay()))
+    finally:
+        token_stream.close()
+
+
+def get_token_stream_stats() -> Dict[str, Any]:
+    """获取逐 token 推送统计"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["enabled"] = is_token_streaming_enabled()
+    return stats
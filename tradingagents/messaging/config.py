@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional
 from tradingagents.utils.logging_manager import get_logger
 from .engine.base import MessageEngine
 from .engine.mqtt_engine import MQTTEngine
-from .engine.redis_engine import RedisPubSubEngine
+from .engine.redis_engine import RedisPubSubEngine, RedisStreamEngine
 from .engine.memory_engine import MemoryEngine
 from .handler.message_handler import MessageHandler
 from .business.handler import ProgressMessageHandler
@@ -69,7 +69,11 @@ class MessageConfig:
                     "host": "localhost",
                     "port": 6379,
                     "password": None,
-                    "db": 0
+                    "db": 0,
+                    "mode": "pubsub",  # pubsub 或 stream（Redis Streams，可回放、支持多进程消费者组）
+                    "stream_maxlen": 1000,
+                    "stream_ttl": 86400,
+                    "consumer_group": "tradingagents-api"
                 },
                 "websocket": {
                     "enabled": True
@@ -80,7 +84,8 @@ class MessageConfig:
                 "task_status": "task/status",
                 "module_start": "module/start",
                 "module_complete": "module/complete",
-                "module_error": "module/error"
+                "module_error": "module/error",
+                "llm_token": "llm/token"
             },
             "enabled": os.getenv('MESSAGE_MODE_ENABLED', 'false').lower() == 'true'
         }
@@ -105,6 +110,9 @@ class MessageConfig:
             logger.info("创建MQTT消息引擎")
             return MQTTEngine(engine_config)
         elif engine_type == 'redis':
+            if engine_config.get('mode', 'pubsub') == 'stream':
+                logger.info("创建Redis Streams消息引擎")
+                return RedisStreamEngine(engine_config)
             logger.info("创建Redis Pub/Sub消息引擎")
             return RedisPubSubEngine(engine_config)
         elif engine_type == 'memory':
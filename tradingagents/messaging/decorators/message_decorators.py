@@ -11,6 +11,7 @@ from datetime import datetime
 from tradingagents.utils.logging_manager import get_logger
 from ..config import get_message_producer, is_message_mode_enabled
 from ..business.messages import NodeStatus, TaskProgressMessage
+from ..business.token_stream import token_stream_context
 
 logger = get_logger('messaging.decorators')
 
@@ -335,8 +336,9 @@ def message_analysis_module(module_name: str, session_id: str = None):
                     
                     start_time = time.time()
                     try:
-                        # 执行分析函数
-                        result = func(*args, **kwargs)
+                        # 执行分析函数（启用逐token推送时，节点内的LLM调用以流式推送生成的文本）
+                        with token_stream_context(analysis_id, module_name):
+                            result = func(*args, **kwargs)
                         
                         # 计算执行时间
                         duration = time.time() - start_time
@@ -1,12 +1,12 @@
 """
 消息引擎模块
 
-提供多种消息引擎实现：MQTT、Redis Pub/Sub、Memory、WebSocket
+提供多种消息引擎实现：MQTT、Redis Pub/Sub、Redis Streams、Memory、WebSocket
 """
 
 from .base import MessageEngine
 from .mqtt_engine import MQTTEngine
-from .redis_engine import RedisPubSubEngine
+from .redis_engine import RedisPubSubEngine, RedisStreamEngine
 from .memory_engine import MemoryEngine
 from .websocket_engine import WebSocketEngine
 
@@ -14,6 +14,7 @@ __all__ = [
     'MessageEngine',
     'MQTTEngine',
     'RedisPubSubEngine',
+    'RedisStreamEngine',
     'MemoryEngine',
     'WebSocketEngine',
 ]
@@ -1,10 +1,19 @@
 """
-Redis Pub/Sub 消息引擎实现
+Redis 消息引擎实现
+
+- RedisPubSubEngine: Redis Pub/Sub，无订阅者时消息直接丢弃
+- RedisStreamEngine: Redis Streams，每个主题（含 analysis_id）一个限长的流，
+  消息持久保存、可按消息ID回放；多个API进程通过消费者组分摊消费
+
+在 message_config.json 中将 message_engine.redis.mode 设为 "stream" 启用 Streams 模式
 """
 
 import json
+import os
+import socket
 import threading
-from typing import Dict, Any, Callable, Optional
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
 try:
     import redis
     REDIS_AVAILABLE = True
@@ -183,3 +192,370 @@ class RedisPubSubEngine(MessageEngine):
         
         logger.info("Redis消息循环已停止")
 
+
+class RedisStreamEngine(MessageEngine):
+    """Redis Streams 消息引擎实现
+
+    - 发布: 消息先进入本地缓冲，由后台线程按批次在一次 pipeline 往返中写入（XADD + EXPIRE）
+    - 订阅: 默认加入消费者组（XREADGROUP），同组的多个API进程分摊消息并逐条确认；
+      组在首次订阅时从流的起点创建，订阅前已发布的消息不会丢失
+    - 回放: subscribe 指定 start_id 或调用 read_stream，从给定消息ID之后继续读取
+
+    配置项（message_engine.redis）:
+        stream_prefix: 流键前缀（默认 "tradingagents:stream:"）
+        stream_maxlen: 每个流保留的大致消息数（默认 1000）
+        stream_ttl: 流最后一次写入后的过期秒数（默认 86400）
+        consumer_group: 消费者组名（默认 "tradingagents-api"）；不同进程使用不同组名时为广播消费
+        batch_size: 单次 pipeline 写入的最大消息数（默认 100）
+        batch_interval_ms: 发布缓冲的最长等待毫秒数（默认 50）
+        block_ms: 读取阻塞的毫秒数（默认 1000）
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """初始化Redis Streams引擎
+
+        Args:
+            config: 配置字典（连接使用统一的连接管理，这里只读取流相关配置）
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis 未安装，请运行: pip install redis")
+
+        self.config = config or {}
+        self.stream_prefix = self.config.get('stream_prefix', 'tradingagents:stream:')
+        self.stream_maxlen = int(self.config.get('stream_maxlen', 1000))
+        self.stream_ttl = int(self.config.get('stream_ttl', 86400))
+        self.consumer_group = self.config.get('consumer_group', 'tradingagents-api')
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = max(1, int(self.config.get('batch_size', 100)))
+        self.batch_interval = max(0.001, int(self.config.get('batch_interval_ms', 50)) / 1000)
+        self.block_ms = max(1, int(self.config.get('block_ms', 1000)))
+
+        self.client: Optional[redis.Redis] = None
+        self.running = False
+        self._connected = False
+        self._lock = threading.Lock()
+
+        # 订阅: 流键 -> (主题, 回调)；消费者组读取位置 / 独立游标位置
+        self.callbacks: Dict[str, Tuple[str, Callable]] = {}
+        self._group_offsets: Dict[str, str] = {}
+        self._cursor_offsets: Dict[str, str] = {}
+        self.subscribe_thread: Optional[threading.Thread] = None
+
+        # 发布缓冲
+        self._pending: List[Tuple[str, str]] = []
+        self._pending_cond = threading.Condition(self._lock)
+        self.flush_thread: Optional[threading.Thread] = None
+
+        self._stats = {
+            "published": 0,
+            "flushes": 0,
+            "publish_errors": 0,
+            "delivered": 0,
+            "acked": 0,
+            "callback_errors": 0,
+        }
+
+    def _stream_key(self, topic: str) -> str:
+        return f"{self.stream_prefix}{topic}"
+
+    def connect(self) -> bool:
+        """连接Redis服务器（使用统一连接管理）"""
+        try:
+            from tradingagents.storage.redis.connection import get_redis_client, REDIS_AVAILABLE
+
+            if not REDIS_AVAILABLE:
+                logger.error("Redis不可用，请检查Redis服务是否启动")
+                self._connected = False
+                return False
+
+            self.client = get_redis_client()
+            if not self.client:
+                logger.error("无法获取Redis客户端，请检查Redis连接配置")
+                self._connected = False
+                return False
+
+            self.client.ping()
+            self.running = True
+            self._connected = True
+            self.flush_thread = threading.Thread(
+                target=self._flush_loop,
+                daemon=True,
+                name="RedisStreamFlushLoop"
+            )
+            self.flush_thread.start()
+            logger.info(f"Redis Streams连接成功（使用统一连接管理），消费者: {self.consumer_group}/{self.consumer_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Redis连接失败: {e}")
+            self._connected = False
+            return False
+
+    def disconnect(self):
+        """断开连接：写出缓冲中的消息并停止后台线程，不关闭共享连接"""
+        self.running = False
+        with self._pending_cond:
+            self._pending_cond.notify_all()
+        for thread in (self.flush_thread, self.subscribe_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=2.0)
+        self.flush()
+
+        self._connected = False
+        logger.info("Redis Streams连接已断开")
+
+    def publish(self, topic: str, message: Dict[str, Any]) -> bool:
+        """发布消息（写入本地缓冲，由后台线程批量写入流）"""
+        if not self._connected or not self.running:
+            logger.warning("Redis未连接，无法发布消息")
+            return False
+
+        try:
+            payload = json.dumps(message, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Redis消息序列化失败: {e}")
+            return False
+
+        with self._pending_cond:
+            self._pending.append((self._stream_key(topic), payload))
+            if len(self._pending) >= self.batch_size:
+                self._pending_cond.notify()
+        return True
+
+    def flush(self) -> int:
+        """将缓冲中的消息在一次 pipeline 往返中写入
+
+        Returns:
+            int: 写入的消息数
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch or self.client is None:
+            return 0
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for stream_key, payload in batch:
+                pipe.xadd(stream_key, {'data': payload}, maxlen=self.stream_maxlen, approximate=True)
+            if self.stream_ttl > 0:
+                for stream_key in {stream_key for stream_key, _ in batch}:
+                    pipe.expire(stream_key, self.stream_ttl)
+            pipe.execute()
+            with self._lock:
+                self._stats["published"] += len(batch)
+                self._stats["flushes"] += 1
+            logger.debug(f"Redis Streams批量写入 {len(batch)} 条消息")
+            return len(batch)
+        except Exception as e:
+            with self._lock:
+                self._stats["publish_errors"] += len(batch)
+            logger.error(f"Redis Streams批量写入失败（{len(batch)} 条消息）: {e}")
+            return 0
+
+    def _flush_loop(self):
+        """发布缓冲刷新循环：达到批量大小或等待超过 batch_interval 时写入"""
+        while self.running:
+            with self._pending_cond:
+                if len(self._pending) < self.batch_size:
+                    self._pending_cond.wait(timeout=self.batch_interval)
+            self.flush()
+
+    def subscribe(self, topic: str, callback: Callable[[str, Dict[str, Any]], None],
+                  start_id: Optional[str] = None) -> bool:
+        """订阅主题
+
+        Args:
+            topic: 主题名称
+            callback: 回调函数，接收 (topic, message)；message 中附带 stream_id
+            start_id: 指定时不加入消费者组，从该消息ID之后读取（"0" 表示从头回放）
+        """
+        if not self.is_connected():
+            logger.warning("Redis未连接，无法订阅")
+            return False
+
+        stream_key = self._stream_key(topic)
+        try:
+            if start_id is None:
+                try:
+                    self.client.xgroup_create(stream_key, self.consumer_group, id='0', mkstream=True)
+                except redis.exceptions.ResponseError as e:
+                    if 'BUSYGROUP' not in str(e):
+                        raise
+
+            with self._lock:
+                self.callbacks[stream_key] = (topic, callback)
+                if start_id is None:
+                    # 先读取本消费者未确认的消息，再读取新消息
+                    self._group_offsets[stream_key] = '0'
+                    self._cursor_offsets.pop(stream_key, None)
+                else:
+                    self._cursor_offsets[stream_key] = start_id
+                    self._group_offsets.pop(stream_key, None)
+
+            if not self.subscribe_thread or not self.subscribe_thread.is_alive():
+                self.subscribe_thread = threading.Thread(
+                    target=self._message_loop,
+                    daemon=True,
+                    name="RedisStreamMessageLoop"
+                )
+                self.subscribe_thread.start()
+
+            logger.info(f"Redis Streams已订阅主题: {topic}" + (f"（从 {start_id} 回放）" if start_id else ""))
+            return True
+        except Exception as e:
+            logger.error(f"Redis Streams订阅异常: {e}")
+            return False
+
+    def unsubscribe(self, topic: str) -> bool:
+        """取消订阅（保留流与消费者组，便于之后回放）"""
+        stream_key = self._stream_key(topic)
+        with self._lock:
+            self.callbacks.pop(stream_key, None)
+            self._group_offsets.pop(stream_key, None)
+            self._cursor_offsets.pop(stream_key, None)
+        logger.info(f"Redis Streams已取消订阅: {topic}")
+        return True
+
+    def read_stream(self, topic: str, last_id: str = '0', count: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """读取主题流中 last_id 之后的消息，用于断线重连后补齐进度
+
+        Args:
+            topic: 主题名称
+            last_id: 已收到的最后一条消息ID，"0" 表示从头读取
+            count: 最多读取的消息数
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: (消息ID, 消息) 列表
+        """
+        if self.client is None:
+            return []
+        start = f"({last_id}" if last_id != '0' else '-'
+        entries = self.client.xrange(self._stream_key(topic), min=start, count=count)
+        return self._decode_entries(entries)
+
+    def is_connected(self) -> bool:
+        """检查连接状态"""
+        if not self._connected or not self.client:
+            return False
+        try:
+            self.client.ping()
+            return True
+        except Exception:
+            self._connected = False
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取发布/消费统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending_publish"] = len(self._pending)
+            stats["subscriptions"] = len(self.callbacks)
+        stats["consumer"] = f"{self.consumer_group}/{self.consumer_name}"
+        return stats
+
+    @staticmethod
+    def _decode_entries(entries) -> List[Tuple[str, Dict[str, Any]]]:
+        """解析流条目中的 JSON 消息，附带 stream_id"""
+        decoded = []
+        for entry_id, fields in entries or []:
+            try:
+                message = json.loads(fields.get('data', '{}'))
+            except (json.JSONDecodeError, TypeError):
+                logger.error(f"Redis Streams消息JSON解析失败: {entry_id}")
+                message = None
+            if isinstance(message, dict):
+                message['stream_id'] = entry_id
+            decoded.append((entry_id, message))
+        return decoded
+
+    def _dispatch(self, stream_key: str, entry_id: str, message: Optional[Dict[str, Any]]):
+        with self._lock:
+            subscription = self.callbacks.get(stream_key)
+        if not subscription or message is None:
+            return
+        topic, callback = subscription
+        try:
+            callback(topic, message)
+            with self._lock:
+                self._stats["delivered"] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats["callback_errors"] += 1
+            logger.error(f"Redis Streams消息回调执行错误: {e}")
+
+    def _read_group(self, block: Optional[int]) -> bool:
+        """通过消费者组读取一批消息并确认，返回是否读到消息"""
+        with self._lock:
+            offsets = dict(self._group_offsets)
+        if not offsets:
+            return False
+
+        # 有未确认消息待补读时不阻塞
+        if any(offset != '>' for offset in offsets.values()):
+            block = None
+        response = self.client.xreadgroup(
+            self.consumer_group, self.consumer_name, offsets, count=self.batch_size, block=block
+        )
+
+        got_messages = False
+        for stream_key, entries in response or []:
+            if not entries and offsets.get(stream_key) != '>':
+                # 本消费者的未确认消息已补读完，切换到新消息
+                with self._lock:
+                    if stream_key in self._group_offsets:
+                        self._group_offsets[stream_key] = '>'
+                continue
+
+            acked = []
+            for entry_id, message in self._decode_entries(entries):
+                self._dispatch(stream_key, entry_id, message)
+                acked.append(entry_id)
+            if acked:
+                got_messages = True
+                self.client.xack(stream_key, self.consumer_group, *acked)
+                with self._lock:
+                    self._stats["acked"] += len(acked)
+                    if self._group_offsets.get(stream_key, '>') != '>':
+                        self._group_offsets[stream_key] = acked[-1]
+        return got_messages
+
+    def _read_cursors(self, block: Optional[int]) -> bool:
+        """按独立游标读取（回放模式），返回是否读到消息"""
+        with self._lock:
+            offsets = dict(self._cursor_offsets)
+        if not offsets:
+            return False
+
+        response = self.client.xread(offsets, count=self.batch_size, block=block)
+        got_messages = False
+        for stream_key, entries in response or []:
+            for entry_id, message in self._decode_entries(entries):
+                self._dispatch(stream_key, entry_id, message)
+                got_messages = True
+                with self._lock:
+                    if stream_key in self._cursor_offsets:
+                        self._cursor_offsets[stream_key] = entry_id
+        return got_messages
+
+    def _message_loop(self):
+        """消息循环：单线程同时处理消费者组与回放游标"""
+        logger.info("Redis Streams消息循环已启动")
+        while self.running:
+            try:
+                with self._lock:
+                    has_group = bool(self._group_offsets)
+                    has_cursor = bool(self._cursor_offsets)
+                if not has_group and not has_cursor:
+                    time.sleep(self.block_ms / 1000)
+                    continue
+
+                # 两种订阅同时存在时平分阻塞时间
+                block = self.block_ms // 2 if has_group and has_cursor else self.block_ms
+                got_messages = self._read_group(block) if has_group else False
+                if has_cursor:
+                    self._read_cursors(None if got_messages else block)
+            except Exception as e:
+                if self.running:
+                    logger.error(f"Redis Streams消息循环错误: {e}")
+                    time.sleep(1.0)
+
+        logger.info("Redis Streams消息循环已停止")
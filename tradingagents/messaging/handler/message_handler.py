@@ -20,6 +20,7 @@ class MessageType(Enum):
     MODULE_COMPLETE = "module.complete"
     MODULE_ERROR = "module.error"
     STEP_UPDATE = "step.update"
+    LLM_TOKEN = "llm.token"
 
 
 class MessageHandler:
@@ -14,6 +14,7 @@ from tenacity import (
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.http_client import get_http_client
 logger = get_logger('agents')
 
 
@@ -32,7 +33,7 @@ def make_request(url, headers):
     # Random delay before each request to avoid detection
     time.sleep(random.uniform(2, 6))
     # 添加超时参数，设置连接超时和读取超时
-    response = requests.get(url, headers=headers, timeout=(10, 30))  # 连接超时10秒，读取超时30秒
+    response = get_http_client().get(url, headers=headers, timeout=(10, 30))  # 连接超时10秒，读取超时30秒
     return response
 
 
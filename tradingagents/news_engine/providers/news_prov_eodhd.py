@@ -11,6 +11,7 @@ from typing import List, Optional
 from .news_prov_base import NewsProvider
 from tradingagents.news_engine.models import NewsItem, NewsSource
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.http_client import get_http_client
 from tradingagents.utils.time_utils import TaTimes, TimeGranularity
 
 logger = get_logger('news_engine.eodhd')
@@ -69,7 +70,7 @@ class EODHDNewsProvider(NewsProvider):
             params['from'] = TaTimes.to_day_format(start_date)
             params['to'] = TaTimes.to_day_format(end_date)
             
-            response = requests.get(url, params=params, timeout=self.config.request_timeout)
+            response = get_http_client().get(url, params=params, timeout=self.config.request_timeout)
             response.raise_for_status()
             
             data = response.json()
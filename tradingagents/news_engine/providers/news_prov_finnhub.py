@@ -11,6 +11,7 @@ from typing import List, Optional
 from .news_prov_base import NewsProvider
 from tradingagents.news_engine.models import NewsItem, NewsSource
 from tradingagents.utils.logging_manager import get_logger
+from tradingagents.utils.http_client import get_http_client
 
 logger = get_logger('news_engine.finnhub')
 
@@ -83,7 +84,7 @@ class FinnhubNewsProvider(NewsProvider):
             logger.info(f"📝 FinnHub 获取 {stock_code} 的新闻")
             logger.debug(f"FinnHub API 请求: URL={url}, params={params}")
             
-            response = requests.get(url, params=params, timeout=self.config.request_timeout)
+            response = get_http_client().get(url, params=params, timeout=self.config.request_timeout)
             
             # 记录响应状态
             logger.debug(f"FinnHub HTTP 响应状态码: {response.status_code}")
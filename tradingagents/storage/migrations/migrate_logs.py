@@ -313,6 +313,11 @@ class LogsMigrator:
             if not log_entries:
                 return 0
             
+            # 生成关键字搜索使用的词元（与 SystemLogsManager 写入时一致）
+            from tradingagents.storage.mongodb.system_logs_manager import search_token_fields
+            for entry in log_entries:
+                entry.update(search_token_fields(entry))
+            
             # 批量插入（ordered=False 表示即使部分失败也继续插入）
             result = self.collection.insert_many(log_entries, ordered=False)
             
@@ -12,12 +12,20 @@ from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('cursor_usage')
 
 try:
-    from pymongo.errors import BulkWriteError, DuplicateKeyError
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
+    UpdateOne = None
     BulkWriteError = None
     DuplicateKeyError = None
+    OperationFailure = None
+
+# 一条使用记录的唯一键
+UNIQUE_KEY_FIELDS = ("account_name", "Date", "Model", "Kind")
+UNIQUE_INDEX_NAME = "unique_usage_record"
+DUPLICATE_KEY_ERROR_CODE = 11000
 
 
 class CursorUsageManager:
@@ -33,6 +41,7 @@ class CursorUsageManager:
         self.collection_name = "cursor_usage"
         self.collection = None
         self._connected = False
+        self._unique_index = False
         
         # 尝试连接
         self._connect()
@@ -61,12 +70,8 @@ class CursorUsageManager:
     def _create_indexes(self):
         """创建数据库索引"""
         try:
-            # 创建复合索引用于去重查询
-            self.collection.create_index(
-                [("account_name", 1), ("Date", 1), ("Model", 1), ("Kind", 1)],
-                background=True,
-                name="unique_usage_record"
-            )
+            # 创建唯一复合索引，导入时由服务端跳过重复记录
+            self._unique_index = self._ensure_unique_index()
             
             # 创建其他常用查询索引
             self.collection.create_index([("account_name", 1), ("Date", -1)], background=True)
@@ -80,6 +85,41 @@ class CursorUsageManager:
         except Exception as e:
             logger.error(f"创建MongoDB索引失败: {e}")
     
+    def _ensure_unique_index(self) -> bool:
+        """
+        确保 (account_name, Date, Model, Kind) 上存在唯一索引
+        
+        旧版本创建过同名的非唯一索引：集合中没有重复记录时替换为唯一索引，
+        否则保留原索引并返回 False（导入改用 upsert 去重）。
+        
+        Returns:
+            唯一索引是否可用
+        """
+        keys = [(field, 1) for field in UNIQUE_KEY_FIELDS]
+        try:
+            self.collection.create_index(keys, unique=True, background=True, name=UNIQUE_INDEX_NAME)
+            return True
+        except OperationFailure as e:
+            logger.info(f"唯一索引创建失败，检查历史索引与重复记录: {e}")
+        
+        duplicates = list(self.collection.aggregate([
+            {"$group": {"_id": {field: f"${field}" for field in UNIQUE_KEY_FIELDS}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$limit": 1}
+        ], allowDiskUse=True))
+        if duplicates:
+            logger.warning("⚠️ cursor_usage 中存在重复记录，暂不创建唯一索引，批量导入将使用 upsert 去重")
+            return False
+        
+        try:
+            self.collection.drop_index(UNIQUE_INDEX_NAME)
+            self.collection.create_index(keys, unique=True, background=True, name=UNIQUE_INDEX_NAME)
+            logger.info("✅ 已将去重索引升级为唯一索引")
+            return True
+        except OperationFailure as e:
+            logger.warning(f"⚠️ 唯一索引创建失败，批量导入将使用 upsert 去重: {e}")
+            return False
+    
     def is_connected(self) -> bool:
         """检查是否连接到 MongoDB"""
         return self._connected
@@ -140,110 +180,79 @@ class CursorUsageManager:
         Returns:
             成功插入的记录数
         """
-        if not self._connected:
-            return 0
-        
-        if not documents:
-            return 0
-        
-        try:
-            # 如果需要去重，先过滤重复项
-            if skip_duplicates:
-                original_count = len(documents)
-                documents = self._filter_duplicates(documents)
-                if len(documents) < original_count:
-                    logger.info(f"去重: {original_count} -> {len(documents)} 条")
-            
-            if not documents:
-                return 0
-            
-            # 添加创建时间
-            for doc in documents:
-                doc['_created_at'] = datetime.now()
-            
-            # 批量插入（ordered=False 表示即使部分失败也继续插入）
-            result = self.collection.insert_many(documents, ordered=False)
-            
-            inserted_count = len(result.inserted_ids)
-            logger.info(f"✅ 批量插入 {inserted_count} 条记录")
-            return inserted_count
-            
-        except BulkWriteError as e:
-            # 处理部分成功的情况
-            write_errors = e.details.get('writeErrors', [])
-            successful_count = len(documents) - len(write_errors)
-            if successful_count > 0:
-                logger.warning(f"⚠️ 批量插入部分失败: {successful_count} 条成功，{len(write_errors)} 条失败")
-            else:
-                logger.error(f"❌ 批量插入全部失败")
-            return successful_count
-        except Exception as e:
-            logger.error(f"❌ 批量插入记录失败: {e}")
-            return 0
+        return self.bulk_import(documents, skip_duplicates=skip_duplicates)["inserted"]
     
-    def _filter_duplicates(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def bulk_import(self, documents: List[Dict[str, Any]], skip_duplicates: bool = True) -> Dict[str, int]:
         """
-        过滤重复的文档（基于 account_name + Date + Model + Kind）
+        批量导入记录，由唯一索引在服务端跳过重复记录
+        
+        唯一索引可用时使用 insert_many(ordered=False)，重复键错误计为跳过；
+        唯一索引无法建立（历史数据中已有重复）时改用 $setOnInsert 的 upsert 批量写入。
         
         Args:
             documents: 文档列表
+            skip_duplicates: 是否跳过重复记录；为 False 时重复记录计为失败
             
         Returns:
-            去重后的文档列表
+            {"inserted": 插入数, "skipped": 跳过的重复数, "failed": 失败数}
         """
-        if not documents:
-            return documents
+        counts = {"inserted": 0, "skipped": 0, "failed": 0}
+        if not self._connected or not documents:
+            return counts
+        
+        # 添加创建时间
+        created_at = datetime.now()
+        for doc in documents:
+            doc['_created_at'] = created_at
         
         try:
-            # 构建批量查询条件（使用 $or 查询）
-            queries = []
-            for doc in documents:
-                queries.append({
-                    'account_name': doc.get('account_name'),
-                    'Date': doc.get('Date'),
-                    'Model': doc.get('Model'),
-                    'Kind': doc.get('Kind')
-                })
-            
-            if not queries:
-                return documents
-            
-            # 批量查询已存在的记录（MongoDB 对 $or 查询有限制，所以分批查询）
-            existing_records = set()
-            batch_query_size = 100  # 每次查询100条
-            for i in range(0, len(queries), batch_query_size):
-                batch_queries = queries[i:i + batch_query_size]
-                existing_docs = list(self.collection.find({
-                    '$or': batch_queries
-                }))
-                
-                # 构建已存在记录的集合
-                for doc in existing_docs:
-                    key = (
-                        doc.get('account_name'),
-                        doc.get('Date'),
-                        doc.get('Model'),
-                        doc.get('Kind')
-                    )
-                    existing_records.add(key)
-            
-            # 过滤掉已存在的记录
-            filtered_docs = []
-            for doc in documents:
-                key = (
-                    doc.get('account_name'),
-                    doc.get('Date'),
-                    doc.get('Model'),
-                    doc.get('Kind')
-                )
-                if key not in existing_records:
-                    filtered_docs.append(doc)
-            
-            return filtered_docs
-            
+            if self._unique_index or not skip_duplicates:
+                counts.update(self._insert_unordered(documents, skip_duplicates))
+            else:
+                counts.update(self._upsert_missing(documents))
         except Exception as e:
-            logger.error(f"⚠️ 批量去重失败，将插入所有记录: {e}")
-            return documents
+            logger.error(f"❌ 批量插入记录失败: {e}")
+            counts["failed"] = len(documents)
+            return counts
+        
+        logger.info(
+            f"✅ 批量导入 {len(documents)} 条记录: 插入 {counts['inserted']} 条，"
+            f"跳过重复 {counts['skipped']} 条，失败 {counts['failed']} 条"
+        )
+        return counts
+    
+    def _insert_unordered(self, documents: List[Dict[str, Any]], skip_duplicates: bool) -> Dict[str, int]:
+        """insert_many(ordered=False)，按错误码区分重复与失败"""
+        try:
+            result = self.collection.insert_many(documents, ordered=False)
+            return {"inserted": len(result.inserted_ids), "skipped": 0, "failed": 0}
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            duplicates = sum(1 for error in write_errors if error.get('code') == DUPLICATE_KEY_ERROR_CODE)
+            failed = len(write_errors) - duplicates
+            if not skip_duplicates:
+                failed, duplicates = len(write_errors), 0
+            if failed:
+                logger.warning(f"⚠️ 批量插入部分失败: {failed} 条失败")
+            return {
+                "inserted": e.details.get('nInserted', len(documents) - len(write_errors)),
+                "skipped": duplicates,
+                "failed": failed
+            }
+    
+    def _upsert_missing(self, documents: List[Dict[str, Any]]) -> Dict[str, int]:
+        """按唯一键 upsert（$setOnInsert），已存在的记录保持不变"""
+        operations = [
+            UpdateOne(
+                {field: doc.get(field) for field in UNIQUE_KEY_FIELDS},
+                {'$setOnInsert': doc},
+                upsert=True
+            )
+            for doc in documents
+        ]
+        result = self.collection.bulk_write(operations, ordered=False)
+        inserted = result.upserted_count
+        return {"inserted": inserted, "skipped": len(documents) - inserted, "failed": 0}
     
     def update_one(self, document_id: str, update_data: Dict[str, Any]) -> bool:
         """
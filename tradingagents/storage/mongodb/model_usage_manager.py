@@ -2,6 +2,11 @@
 """
 模型使用记录 MongoDB 管理器
 用于管理 model_usages 集合的完整 CRUD 操作
+
+统计查询读取按 (日期, 供应商, 模型) 预聚合的 model_usage_rollups 集合：
+- 插入记录时增量累加对应的汇总文档，更新记录时从旧组合扣减、向新组合累加
+- rebuild_rollups 从原始记录重新计算（用于首次回填和定期校正）
+- 原始记录通过 _created_at 上的 TTL 索引自动过期，汇总数据长期保留
 """
 
 import os
@@ -9,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -27,7 +34,7 @@ class UsageRecord:
     analysis_type: str  # 分析类型
 
 try:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, UpdateOne, ReturnDocument
     from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, DuplicateKeyError
     from bson import ObjectId
     MONGODB_AVAILABLE = True
@@ -48,10 +55,16 @@ class ModelUsageManager:
             raise ImportError("pymongo is not installed. Please install it with: pip install pymongo")
         
         self.collection_name = "model_usages"
+        self.rollup_collection_name = "model_usage_rollups"
         
         self.collection = None
+        self.rollup_collection = None
         self._connected = False
         
+        # 统计查询是否使用预聚合汇总；原始记录保留天数（0 表示不过期）
+        self.rollups_enabled = parse_bool_env("MODEL_USAGE_ROLLUPS_ENABLED", True)
+        self.raw_ttl_days = parse_int_env("MODEL_USAGE_RAW_TTL_DAYS", 90)
+        
         # 尝试连接
         self._connect()
     
@@ -67,12 +80,18 @@ class ModelUsageManager:
                 self._connected = False
                 return
             
+            if self.rollups_enabled:
+                self.rollup_collection = get_mongo_collection(self.rollup_collection_name)
+            
             # 创建索引
             self._create_indexes()
             
             self._connected = True
             logger.info(f"✅ MongoDB连接成功（使用统一连接管理）: {self.collection_name}")
             
+            # 汇总集合为空而原始记录存在时，执行一次回填
+            self._backfill_rollups_if_empty()
+            
         except Exception as e:
             logger.error(f"❌ MongoDB连接失败: {e}")
             logger.info(f"将使用本地JSON文件存储")
@@ -107,6 +126,27 @@ class ModelUsageManager:
             
         except Exception as e:
             logger.error(f"创建MongoDB索引失败: {e}")
+        
+        # 原始记录 TTL（timestamp 为字符串，TTL 只能建在日期类型的 _created_at 上）
+        if self.raw_ttl_days > 0:
+            try:
+                self.collection.create_index(
+                    "_created_at",
+                    name="created_at_ttl",
+                    expireAfterSeconds=self.raw_ttl_days * 86400
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 创建原始记录TTL索引失败（已存在不同配置时需手动调整）: {e}")
+        
+        if self.rollup_collection is not None:
+            try:
+                self.rollup_collection.create_index(
+                    [("date", 1), ("provider", 1), ("model_name", 1)],
+                    unique=True
+                )
+                self.rollup_collection.create_index([("provider", 1), ("date", 1)])
+            except Exception as e:
+                logger.error(f"创建汇总集合索引失败: {e}")
     
     def is_connected(self) -> bool:
         """检查是否连接到 MongoDB"""
@@ -150,6 +190,7 @@ class ModelUsageManager:
             
             if result.inserted_id:
                 logger.debug(f"✅ 使用记录已插入: {result.inserted_id}")
+                self._increment_rollups([record])
                 return str(result.inserted_id)
             else:
                 logger.error(f"❌ MongoDB插入失败：未返回插入ID")
@@ -217,6 +258,7 @@ class ModelUsageManager:
             
             inserted_count = len(result.inserted_ids)
             logger.info(f"✅ 批量插入 {inserted_count} 条使用记录")
+            self._increment_rollups(records)
             return inserted_count
                 
         except Exception as e:
@@ -224,6 +266,8 @@ class ModelUsageManager:
             if hasattr(e, 'details') and 'writeErrors' in e.details:
                 inserted_count = e.details.get('nInserted', 0)
                 logger.warning(f"⚠️ 部分插入成功: {inserted_count}/{len(records)}")
+                # 无法确定哪些记录写入成功，重新计算涉及日期的汇总
+                self.rebuild_rollups(dates={r.timestamp[:10] for r in records})
                 return inserted_count
             logger.error(f"❌ 批量插入记录失败: {e}")
             return 0
@@ -249,14 +293,18 @@ class ModelUsageManager:
             # 添加更新时间
             record_dict['_updated_at'] = datetime.now()
             
-            # 更新记录
-            result = self.collection.update_one(
+            # 更新记录并取回旧值，汇总需要从旧的 (日期, 供应商, 模型) 组合扣减
+            old_doc = self.collection.find_one_and_update(
                 {"_id": ObjectId(record_id)},
-                {"$set": record_dict}
+                {"$set": record_dict},
+                return_document=ReturnDocument.BEFORE
             )
             
-            if result.modified_count > 0:
+            if old_doc is not None:
                 logger.info(f"✅ 使用记录已更新: {record_id}")
+                # 日期、供应商或模型变化时，只重新计算新日期无法校正旧组合（旧组合可能已无原始记录）
+                self._increment_rollups([self._doc_to_usage_record(old_doc)], sign=-1)
+                self._increment_rollups([record])
                 return True
             else:
                 logger.warning(f"⚠️ 未找到要更新的记录: {record_id}")
@@ -266,6 +314,198 @@ class ModelUsageManager:
             logger.error(f"❌ 更新记录失败: {e}")
             return False
     
+    # ==================== 预聚合汇总 ====================
+    
+    def _use_rollups(self) -> bool:
+        """统计查询是否走预聚合汇总"""
+        return self.rollups_enabled and self.rollup_collection is not None
+    
+    @staticmethod
+    def _doc_to_usage_record(doc: Dict[str, Any]) -> UsageRecord:
+        """原始记录文档转换为 UsageRecord"""
+        return UsageRecord(
+            timestamp=doc.get('timestamp', ''),
+            provider=doc.get('provider', ''),
+            model_name=doc.get('model_name', ''),
+            input_tokens=doc.get('input_tokens', 0),
+            output_tokens=doc.get('output_tokens', 0),
+            cost=doc.get('cost', 0.0),
+            session_id=doc.get('session_id', ''),
+            analysis_type=doc.get('analysis_type', '')
+        )
+    
+    def _increment_rollups(self, records: List[UsageRecord], sign: int = 1):
+        """
+        将记录增量累加到 (日期, 供应商, 模型) 汇总文档
+        
+        Args:
+            records: 已成功插入的 UsageRecord 列表
+            sign: 1 为累加，-1 为扣减（更新记录时扣减旧值）
+        """
+        if not self._use_rollups() or not records:
+            return
+        
+        try:
+            # 先在内存中按汇总键合并，减少写入次数
+            increments: Dict[tuple, Dict[str, float]] = {}
+            for record in records:
+                key = (record.timestamp[:10], record.provider, record.model_name)
+                inc = increments.setdefault(key, {
+                    'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0, 'requests': 0
+                })
+                inc['input_tokens'] += sign * record.input_tokens
+                inc['output_tokens'] += sign * record.output_tokens
+                inc['cost'] += sign * record.cost
+                inc['requests'] += sign
+            
+            now = datetime.now()
+            operations = [
+                UpdateOne(
+                    {'date': date, 'provider': provider, 'model_name': model_name},
+                    {'$inc': inc, '$set': {'updated_at': now}},
+                    upsert=True
+                )
+                for (date, provider, model_name), inc in increments.items()
+            ]
+            self.rollup_collection.bulk_write(operations, ordered=False)
+            
+        except Exception as e:
+            # 汇总失败不影响原始记录写入，可通过 rebuild_rollups 校正
+            logger.warning(f"⚠️ 更新使用汇总失败: {e}")
+    
+    def rebuild_rollups(self, days: int = None, dates: Optional[set] = None) -> int:
+        """
+        从原始记录重新计算汇总（回填 / 定期校正）
+        
+        只覆盖原始记录中仍存在的 (日期, 供应商, 模型) 组合，
+        原始记录已过期的历史汇总保持不变。
+        
+        Args:
+            days: 只重新计算最近N天，None 表示全部
+            dates: 只重新计算指定日期集合（YYYY-MM-DD），优先于 days
+            
+        Returns:
+            重新计算的汇总文档数量，失败返回 -1
+        """
+        if not self._connected or not self._use_rollups():
+            return 0
+        
+        try:
+            match_conditions = {}
+            if dates:
+                match_conditions['$or'] = [
+                    {'timestamp': {'$gte': date, '$lt': f"{date}\uffff"}} for date in sorted(dates)
+                ]
+            elif days:
+                cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+                match_conditions['timestamp'] = {'$gte': cutoff_date}
+            
+            pipeline = [
+                {'$match': match_conditions},
+                {
+                    '$group': {
+                        '_id': {
+                            'date': {'$substr': ['$timestamp', 0, 10]},
+                            'provider': '$provider',
+                            'model_name': '$model_name'
+                        },
+                        'input_tokens': {'$sum': '$input_tokens'},
+                        'output_tokens': {'$sum': '$output_tokens'},
+                        'cost': {'$sum': '$cost'},
+                        'requests': {'$sum': 1}
+                    }
+                },
+                {
+                    '$project': {
+                        '_id': 0,
+                        'date': '$_id.date',
+                        'provider': '$_id.provider',
+                        'model_name': '$_id.model_name',
+                        'input_tokens': 1,
+                        'output_tokens': 1,
+                        'cost': 1,
+                        'requests': 1,
+                        'updated_at': '$$NOW'
+                    }
+                },
+                {
+                    '$merge': {
+                        'into': self.rollup_collection_name,
+                        'on': ['date', 'provider', 'model_name'],
+                        'whenMatched': 'replace',
+                        'whenNotMatched': 'insert'
+                    }
+                }
+            ]
+            self.collection.aggregate(pipeline, allowDiskUse=True)
+            
+            rollup_query = {'date': {'$in': sorted(dates)}} if dates else {}
+            if not dates and days:
+                rollup_query = {'date': {'$gte': match_conditions['timestamp']['$gte']}}
+            count = self.rollup_collection.count_documents(rollup_query)
+            logger.info(f"✅ 使用汇总重新计算完成，涉及 {count} 条汇总")
+            return count
+            
+        except Exception as e:
+            logger.error(f"❌ 重新计算使用汇总失败: {e}")
+            return -1
+    
+    def _backfill_rollups_if_empty(self):
+        """汇总集合为空且存在原始记录时执行全量回填"""
+        if not self._use_rollups():
+            return
+        try:
+            if (self.rollup_collection.estimated_document_count() == 0
+                    and self.collection.estimated_document_count() > 0):
+                logger.info("🔄 使用汇总为空，开始从原始记录回填...")
+                self.rebuild_rollups()
+        except Exception as e:
+            logger.warning(f"⚠️ 检查使用汇总状态失败: {e}")
+    
+    @staticmethod
+    def _build_rollup_match(days: int = None,
+                            provider: str = None,
+                            model_name: str = None,
+                            start_date: str = None,
+                            end_date: str = None) -> Dict[str, Any]:
+        """
+        构建汇总集合的匹配条件（按天粒度，起止日期均包含）
+        
+        Args:
+            days: 最近N天
+            provider: 供应商过滤
+            model_name: 模型名称过滤
+            start_date: 开始日期（ISO格式字符串，取日期部分）
+            end_date: 结束日期（ISO格式字符串，取日期部分）
+        """
+        match_conditions = {}
+        if start_date and end_date:
+            match_conditions['date'] = {'$gte': start_date[:10], '$lte': end_date[:10]}
+        elif days:
+            cutoff_date = datetime.now() - timedelta(days=days)
+            match_conditions['date'] = {'$gte': cutoff_date.strftime('%Y-%m-%d')}
+        if provider:
+            match_conditions['provider'] = provider
+        if model_name:
+            match_conditions['model_name'] = model_name
+        return match_conditions
+    
+    def _aggregate_rollups(self, match_conditions: Dict[str, Any], group_id: Any) -> List[Dict[str, Any]]:
+        """按指定维度汇总 rollup 文档"""
+        pipeline = [
+            {'$match': match_conditions},
+            {
+                '$group': {
+                    '_id': group_id,
+                    'cost': {'$sum': '$cost'},
+                    'input_tokens': {'$sum': '$input_tokens'},
+                    'output_tokens': {'$sum': '$output_tokens'},
+                    'requests': {'$sum': '$requests'}
+                }
+            }
+        ]
+        return list(self.rollup_collection.aggregate(pipeline))
+    
     def query_usage_records(self, 
                            limit: int = 10000,
                            days: int = None,
@@ -368,6 +608,22 @@ class ModelUsageManager:
             return {}
         
         try:
+            if self._use_rollups():
+                match_conditions = self._build_rollup_match(days, provider, model_name, start_date, end_date)
+                result = self._aggregate_rollups(match_conditions, None)
+                stats = result[0] if result else {}
+                requests = stats.get('requests', 0)
+                return {
+                    'period_days': days,
+                    'total_cost': round(stats.get('cost', 0), 4),
+                    'total_input_tokens': int(stats.get('input_tokens', 0)),
+                    'total_output_tokens': int(stats.get('output_tokens', 0)),
+                    'total_requests': requests,
+                    'avg_cost': round(stats.get('cost', 0) / requests, 6) if requests else 0,
+                    'avg_input_tokens': round(stats.get('input_tokens', 0) / requests, 2) if requests else 0,
+                    'avg_output_tokens': round(stats.get('output_tokens', 0) / requests, 2) if requests else 0
+                }
+            
             # 构建匹配条件
             match_conditions = {}
             
@@ -451,6 +707,20 @@ class ModelUsageManager:
             return {}
         
         try:
+            if self._use_rollups():
+                match_conditions = self._build_rollup_match(days, start_date=start_date, end_date=end_date)
+                provider_stats = {}
+                for result in self._aggregate_rollups(match_conditions, '$provider'):
+                    requests = result.get('requests', 0)
+                    provider_stats[result['_id']] = {
+                        'cost': round(result.get('cost', 0), 4),
+                        'input_tokens': result.get('input_tokens', 0),
+                        'output_tokens': result.get('output_tokens', 0),
+                        'requests': requests,
+                        'avg_cost': round(result.get('cost', 0) / requests, 6) if requests else 0
+                    }
+                return provider_stats
+            
             # 构建匹配条件
             match_conditions = {}
             
@@ -517,6 +787,24 @@ class ModelUsageManager:
             return {}
         
         try:
+            if self._use_rollups():
+                match_conditions = self._build_rollup_match(days, provider, start_date=start_date, end_date=end_date)
+                group_id = {'provider': '$provider', 'model_name': '$model_name'}
+                model_stats = {}
+                for result in self._aggregate_rollups(match_conditions, group_id):
+                    requests = result.get('requests', 0)
+                    model_key = f"{result['_id']['provider']}/{result['_id']['model_name']}"
+                    model_stats[model_key] = {
+                        'provider': result['_id']['provider'],
+                        'model_name': result['_id']['model_name'],
+                        'cost': round(result.get('cost', 0), 4),
+                        'input_tokens': result.get('input_tokens', 0),
+                        'output_tokens': result.get('output_tokens', 0),
+                        'requests': requests,
+                        'avg_cost': round(result.get('cost', 0) / requests, 6) if requests else 0
+                    }
+                return model_stats
+            
             # 构建匹配条件
             match_conditions = {}
             
@@ -612,6 +900,26 @@ class ModelUsageManager:
             return {}
         
         try:
+            if self._use_rollups():
+                # 汇总文档本身即为 (日期, 供应商, 模型) 粒度，无需再聚合
+                match_conditions = self._build_rollup_match(days, provider, model_name, start_date, end_date)
+                cursor = self.rollup_collection.find(match_conditions, {'_id': 0}).sort('date', -1)
+                daily_stats = {}
+                for doc in cursor:
+                    input_tokens = doc.get('input_tokens', 0)
+                    output_tokens = doc.get('output_tokens', 0)
+                    model_key = f"{doc['provider']}/{doc['model_name']}"
+                    daily_stats.setdefault(doc['date'], {})[model_key] = {
+                        'provider': doc['provider'],
+                        'model_name': doc['model_name'],
+                        'input_tokens': input_tokens,
+                        'output_tokens': output_tokens,
+                        'total_tokens': input_tokens + output_tokens,
+                        'cost': round(doc.get('cost', 0), 4),
+                        'requests': doc.get('requests', 0)
+                    }
+                return daily_stats
+            
             # 构建匹配条件
             match_conditions = {}
             
@@ -714,6 +1022,12 @@ class ModelUsageManager:
             return 0
         
         try:
+            if self._use_rollups():
+                # 汇总的请求数包含原始记录已过期的历史调用
+                match_conditions = self._build_rollup_match(days, provider, model_name, start_date, end_date)
+                result = self._aggregate_rollups(match_conditions, None)
+                return int(result[0].get('requests', 0)) if result else 0
+            
             query = {}
             
             # 时间范围查询
@@ -17,15 +17,19 @@ stocks = sector_manager.get_stocks_by_concept("新能源")
 
 import os
 import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import pandas as pd
 
+from tradingagents.config.env_utils import parse_int_env, parse_float_env
+from tradingagents.utils.rate_limiter import get_rate_limiter
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('storage')
 
 try:
-    from pymongo import ASCENDING, DESCENDING
+    from pymongo import ASCENDING, DESCENDING, UpdateOne, ReplaceOne
     from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
     MONGODB_AVAILABLE = True
 except ImportError:
@@ -47,11 +51,42 @@ class SectorManager:
     # 集合名称
     COLLECTION_CONCEPT_THEMES = "dict_concept_themes"
     COLLECTION_INDUSTRY_SECTORS = "dict_industry_sectors"
+    COLLECTION_STOCK_SECTORS = "dict_stock_sectors"
+    COLLECTION_SECTOR_STATISTICS = "dict_sector_statistics"
+    
+    # 预计算统计信息文档的 _id
+    STATISTICS_DOC_ID = "summary"
+    
+    # 板块类型对应的反向索引字段与统计字段
+    SECTOR_INDEX_FIELDS = {
+        "概念": ("concepts", "concept_count", "total_concept_stocks"),
+        "行业": ("industries", "industry_count", "total_industry_stocks"),
+    }
+    
+    # 批量写入的单批操作数
+    BULK_WRITE_BATCH_SIZE = 200
+    
+    # 反向索引就绪状态的本地缓存秒数（以统计信息文档为准，多个进程共享）
+    STOCK_INDEX_CHECK_INTERVAL = 30
     
     def __init__(self):
         self.concept_collection = None
         self.industry_collection = None
+        self.stock_sectors_collection = None
+        self.statistics_collection = None
         self.connected = False
+        # 反向索引是否已构建（未构建时按股票查询回退到扫描板块集合）及上次检查时间
+        self._stock_index_ready = False
+        self._stock_index_checked_at = 0.0
+        
+        # 板块刷新并发与限流配置：并发线程数、请求速率（次/秒）、突发量
+        # 成分股接口较重，单独使用 akshare_sector 令牌桶（进程内共享）
+        self.update_workers = max(1, parse_int_env("SECTOR_UPDATE_WORKERS", 4))
+        self._fetch_bucket = get_rate_limiter(
+            "akshare_sector",
+            rate=max(parse_float_env("SECTOR_UPDATE_RATE", 0.5), 0.01),
+            capacity=max(1, parse_int_env("SECTOR_UPDATE_BURST", 2))
+        )
         
         if MONGODB_AVAILABLE:
             self._connect()
@@ -63,6 +98,8 @@ class SectorManager:
             
             self.concept_collection = get_mongo_collection(self.COLLECTION_CONCEPT_THEMES)
             self.industry_collection = get_mongo_collection(self.COLLECTION_INDUSTRY_SECTORS)
+            self.stock_sectors_collection = get_mongo_collection(self.COLLECTION_STOCK_SECTORS)
+            self.statistics_collection = get_mongo_collection(self.COLLECTION_SECTOR_STATISTICS)
             
             if self.concept_collection is None or self.industry_collection is None:
                 logger.warning("⚠️ [板块管理] 统一连接管理不可用，无法连接MongoDB")
@@ -75,6 +112,9 @@ class SectorManager:
             # 创建索引
             self._create_indexes()
             
+            # 检查反向索引是否已构建
+            self._is_stock_index_ready(refresh=True)
+            
         except Exception as e:
             logger.warning(f"⚠️ [板块管理] MongoDB连接失败: {e}")
             self.connected = False
@@ -113,6 +153,18 @@ class SectorManager:
                     else:
                         logger.warning(f"⚠️ [板块管理] 创建行业板块索引时出错: {e}")
             
+            # 股票→板块反向索引
+            if self.stock_sectors_collection is not None:
+                try:
+                    self.stock_sectors_collection.create_index("stock_code", unique=True)
+                    logger.debug("✅ [板块管理] 股票板块反向索引创建成功")
+                except Exception as e:
+                    error_str = str(e).lower()
+                    if "already exists" in error_str or "indexoptionsconflict" in error_str:
+                        logger.debug("✅ [板块管理] 股票板块反向索引已存在")
+                    else:
+                        logger.warning(f"⚠️ [板块管理] 创建股票板块反向索引时出错: {e}")
+            
         except Exception as e:
             logger.warning(f"⚠️ [板块管理] 索引创建失败: {e}")
     
@@ -330,6 +382,44 @@ class SectorManager:
     
     # ==================== 股票关联关系查询方法 ====================
     
+    def _scan_sectors_by_stock(self, collection, stock_code: str) -> List[str]:
+        """
+        扫描板块集合获取股票所属板块（反向索引未构建时的回退路径）
+        
+        Args:
+            collection: MongoDB集合对象
+            stock_code: 股票代码
+        
+        Returns:
+            板块名称列表
+        """
+        # 使用 $or 查询，支持字符串列表和字典列表两种格式
+        query = {
+            "$or": [
+                {"stocks": stock_code},  # 字符串列表格式
+                {"stocks.code": stock_code},  # 字典列表格式
+                {"stocks.股票代码": stock_code},  # 字典列表格式（中文字段名）
+                {"stocks.symbol": stock_code}  # 字典列表格式（symbol字段）
+            ]
+        }
+        
+        results = collection.find(query, {"name": 1, "_id": 0})
+        return [doc['name'] for doc in results]
+    
+    def _get_stock_index_doc(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """
+        从反向索引读取单只股票的板块归属
+        
+        Args:
+            stock_code: 股票代码
+        
+        Returns:
+            反向索引文档，反向索引未构建时返回 None
+        """
+        if self.stock_sectors_collection is None or not self._is_stock_index_ready():
+            return None
+        return self.stock_sectors_collection.find_one({"stock_code": stock_code}, {"_id": 0}) or {}
+    
     def get_concepts_by_stock(self, stock_code: str) -> List[str]:
         """
         根据股票代码获取所属的概念板块列表
@@ -345,21 +435,11 @@ class SectorManager:
             return []
         
         try:
-            # 使用 $or 查询，支持字符串列表和字典列表两种格式
-            query = {
-                "$or": [
-                    {"stocks": stock_code},  # 字符串列表格式
-                    {"stocks.code": stock_code},  # 字典列表格式
-                    {"stocks.股票代码": stock_code},  # 字典列表格式（中文字段名）
-                    {"stocks.symbol": stock_code}  # 字典列表格式（symbol字段）
-                ]
-            }
-            
-            results = self.concept_collection.find(
-                query,
-                {"name": 1, "_id": 0}
-            )
-            concepts = [doc['name'] for doc in results]
+            index_doc = self._get_stock_index_doc(stock_code)
+            if index_doc is not None:
+                concepts = index_doc.get("concepts", [])
+            else:
+                concepts = self._scan_sectors_by_stock(self.concept_collection, stock_code)
             logger.debug(f"✅ [板块管理] 查询股票 {stock_code} 的概念板块成功，返回 {len(concepts)} 个")
             return concepts
                 
@@ -382,21 +462,11 @@ class SectorManager:
             return []
         
         try:
-            # 使用 $or 查询，支持字符串列表和字典列表两种格式
-            query = {
-                "$or": [
-                    {"stocks": stock_code},  # 字符串列表格式
-                    {"stocks.code": stock_code},  # 字典列表格式
-                    {"stocks.股票代码": stock_code},  # 字典列表格式（中文字段名）
-                    {"stocks.symbol": stock_code}  # 字典列表格式（symbol字段）
-                ]
-            }
-            
-            results = self.industry_collection.find(
-                query,
-                {"name": 1, "_id": 0}
-            )
-            industries = [doc['name'] for doc in results]
+            index_doc = self._get_stock_index_doc(stock_code)
+            if index_doc is not None:
+                industries = index_doc.get("industries", [])
+            else:
+                industries = self._scan_sectors_by_stock(self.industry_collection, stock_code)
             logger.debug(f"✅ [板块管理] 查询股票 {stock_code} 的行业板块成功，返回 {len(industries)} 个")
             return industries
                 
@@ -414,11 +484,248 @@ class SectorManager:
         Returns:
             包含 concepts 和 industries 的字典
         """
+        if self.connected:
+            try:
+                index_doc = self._get_stock_index_doc(stock_code)
+                if index_doc is not None:
+                    return {
+                        "concepts": index_doc.get("concepts", []),
+                        "industries": index_doc.get("industries", [])
+                    }
+            except Exception as e:
+                logger.warning(f"⚠️ [板块管理] 读取股票 {stock_code} 的反向索引失败: {e}")
+        
         return {
             "concepts": self.get_concepts_by_stock(stock_code),
             "industries": self.get_industries_by_stock(stock_code)
         }
     
+    # ==================== 股票→板块反向索引 ====================
+    
+    @staticmethod
+    def _extract_stock_code(item: Any) -> Optional[str]:
+        """从 stocks 字段的元素中提取股票代码（兼容字符串和字典两种格式）"""
+        if isinstance(item, str):
+            return item
+        if isinstance(item, dict):
+            code = item.get('code') or item.get('股票代码') or item.get('symbol')
+            if code:
+                return str(code)
+        return None
+    
+    def _load_statistics_doc(self) -> Optional[Dict[str, Any]]:
+        """读取预计算的统计信息文档，不存在时返回 None"""
+        if self.statistics_collection is None:
+            return None
+        try:
+            return self.statistics_collection.find_one({"_id": self.STATISTICS_DOC_ID})
+        except Exception as e:
+            logger.warning(f"⚠️ [板块管理] 读取板块统计信息失败: {e}")
+            return None
+    
+    def _load_sector_codes(self, collection, sector_names: List[str]) -> Dict[str, set]:
+        """
+        批量读取板块当前保存的成分股代码
+        
+        Args:
+            collection: MongoDB集合对象
+            sector_names: 板块名称列表
+        
+        Returns:
+            {板块名称: 股票代码集合}，数据库中不存在的板块不会出现在结果中
+        """
+        sector_codes = {}
+        cursor = collection.find({"name": {"$in": list(sector_names)}}, {"name": 1, "stocks": 1, "_id": 0})
+        for doc in cursor:
+            codes = set()
+            for item in doc.get('stocks') or []:
+                code = self._extract_stock_code(item)
+                if code:
+                    codes.add(code)
+            sector_codes[doc['name']] = codes
+        return sector_codes
+    
+    def _set_stock_index_ready(self, ready: bool):
+        """更新本地缓存的反向索引就绪状态"""
+        self._stock_index_ready = ready
+        self._stock_index_checked_at = time.monotonic()
+    
+    def _is_stock_index_ready(self, refresh: bool = False) -> bool:
+        """
+        反向索引是否已构建
+        
+        就绪状态以统计信息文档是否存在为准（其他进程可能已重建或使其失效），
+        本地结果缓存 STOCK_INDEX_CHECK_INTERVAL 秒。
+        
+        Args:
+            refresh: 是否忽略本地缓存重新检查
+        """
+        if refresh or time.monotonic() - self._stock_index_checked_at > self.STOCK_INDEX_CHECK_INTERVAL:
+            self._set_stock_index_ready(self._load_statistics_doc() is not None)
+        return self._stock_index_ready
+    
+    def _invalidate_stock_sector_index(self):
+        """标记反向索引失效，下次统计时将全量重建"""
+        self._set_stock_index_ready(False)
+        if self.statistics_collection is not None:
+            try:
+                self.statistics_collection.delete_one({"_id": self.STATISTICS_DOC_ID})
+            except Exception as e:
+                logger.warning(f"⚠️ [板块管理] 清除板块统计信息失败: {e}")
+    
+    def _apply_stock_sector_changes(self, sector_type: str, old_codes: Dict[str, set],
+                                    new_codes: Dict[str, set], now: datetime):
+        """
+        将板块成分变化增量应用到反向索引和预计算统计信息
+        
+        只处理成分发生变化的股票：读取其当前归属，计算新归属后批量写回，
+        并根据归属由空变非空（或反之）的股票数量增量更新统计信息。
+        
+        Args:
+            sector_type: 板块类型（"概念" 或 "行业"）
+            old_codes: 变化板块写入前的成分 {板块名称: 股票代码集合}
+            new_codes: 变化板块写入后的成分 {板块名称: 股票代码集合}
+            now: 更新时间
+        """
+        if self.stock_sectors_collection is None:
+            return
+        if not self._is_stock_index_ready(refresh=True):
+            # 反向索引尚未构建（或读取状态失败），确保统计信息文档不存在，下次统计时全量重建
+            self._invalidate_stock_sector_index()
+            return
+        
+        field, sector_count_field, stock_count_field = self.SECTOR_INDEX_FIELDS[sector_type]
+        
+        try:
+            # 计算每只股票需要加入/移出的板块
+            additions: Dict[str, set] = {}
+            removals: Dict[str, set] = {}
+            for sector_name, codes in new_codes.items():
+                previous = old_codes.get(sector_name, set())
+                for code in codes - previous:
+                    additions.setdefault(code, set()).add(sector_name)
+                for code in previous - codes:
+                    removals.setdefault(code, set()).add(sector_name)
+            
+            affected = set(additions) | set(removals)
+            current = {}
+            if affected:
+                cursor = self.stock_sectors_collection.find(
+                    {"stock_code": {"$in": list(affected)}},
+                    {"stock_code": 1, field: 1, "_id": 0}
+                )
+                current = {doc['stock_code']: set(doc.get(field) or []) for doc in cursor}
+            
+            stock_delta = 0
+            operations = []
+            for code in affected:
+                before = current.get(code, set())
+                after = (before | additions.get(code, set())) - removals.get(code, set())
+                if bool(after) != bool(before):
+                    stock_delta += 1 if after else -1
+                operations.append(UpdateOne(
+                    {"stock_code": code},
+                    {
+                        "$set": {field: sorted(after), "updated_at": now},
+                        "$setOnInsert": {"created_at": now}
+                    },
+                    upsert=True
+                ))
+            
+            for start in range(0, len(operations), self.BULK_WRITE_BATCH_SIZE):
+                self.stock_sectors_collection.bulk_write(
+                    operations[start:start + self.BULK_WRITE_BATCH_SIZE], ordered=False
+                )
+            
+            sector_delta = sum(1 for name in new_codes if name not in old_codes)
+            self.statistics_collection.update_one(
+                {"_id": self.STATISTICS_DOC_ID},
+                {
+                    "$inc": {sector_count_field: sector_delta, stock_count_field: stock_delta},
+                    "$set": {"updated_at": now}
+                }
+            )
+            logger.debug(
+                f"✅ [板块管理] {sector_type}板块反向索引增量更新完成，"
+                f"涉及 {len(affected)} 只股票，新增板块 {sector_delta} 个"
+            )
+            
+        except Exception as e:
+            logger.warning(f"⚠️ [板块管理] 增量更新{sector_type}板块反向索引失败，将重建: {e}")
+            self._invalidate_stock_sector_index()
+    
+    def rebuild_stock_sector_index(self) -> Dict[str, Any]:
+        """
+        根据概念/行业板块集合全量重建股票→板块反向索引及统计信息
+        
+        Returns:
+            重建后的统计信息字典，格式同 get_statistics
+        """
+        stats = {
+            "concept_count": 0,
+            "industry_count": 0,
+            "total_concept_stocks": 0,
+            "total_industry_stocks": 0
+        }
+        
+        if not self.connected or self.stock_sectors_collection is None or self.statistics_collection is None:
+            logger.warning("⚠️ [板块管理] 未连接，无法重建反向索引")
+            return stats
+        
+        try:
+            logger.info("🔄 [板块管理] 开始重建股票板块反向索引...")
+            now = datetime.now()
+            
+            index: Dict[str, Dict[str, set]] = {}
+            for sector_type, collection in (("概念", self.concept_collection), ("行业", self.industry_collection)):
+                field, sector_count_field, stock_count_field = self.SECTOR_INDEX_FIELDS[sector_type]
+                sector_count = 0
+                for doc in collection.find({}, {"name": 1, "stocks": 1, "_id": 0}):
+                    sector_count += 1
+                    for item in doc.get('stocks') or []:
+                        code = self._extract_stock_code(item)
+                        if code:
+                            index.setdefault(code, {}).setdefault(field, set()).add(doc['name'])
+                stats[sector_count_field] = sector_count
+                stats[stock_count_field] = sum(1 for entry in index.values() if entry.get(field))
+            
+            operations = [
+                ReplaceOne(
+                    {"stock_code": code},
+                    {
+                        "stock_code": code,
+                        "concepts": sorted(entry.get("concepts", ())),
+                        "industries": sorted(entry.get("industries", ())),
+                        "created_at": now,
+                        "updated_at": now
+                    },
+                    upsert=True
+                )
+                for code, entry in index.items()
+            ]
+            for start in range(0, len(operations), self.BULK_WRITE_BATCH_SIZE):
+                self.stock_sectors_collection.bulk_write(
+                    operations[start:start + self.BULK_WRITE_BATCH_SIZE], ordered=False
+                )
+            
+            # 清理已不属于任何板块的股票
+            self.stock_sectors_collection.delete_many({"updated_at": {"$lt": now}})
+            
+            self.statistics_collection.replace_one(
+                {"_id": self.STATISTICS_DOC_ID},
+                {**stats, "updated_at": now},
+                upsert=True
+            )
+            self._set_stock_index_ready(True)
+            
+            logger.info(f"✅ [板块管理] 股票板块反向索引重建完成，共 {len(index)} 只股票")
+            return stats
+            
+        except Exception as e:
+            logger.error(f"❌ [板块管理] 重建股票板块反向索引失败: {e}")
+            self._set_stock_index_ready(False)
+            return stats
+    
     # ==================== 统计方法 ====================
     
     def count_concepts(self) -> int:
@@ -491,6 +798,9 @@ class SectorManager:
         """
         获取板块统计信息
         
+        统计信息在板块刷新时增量维护，这里只读取预计算结果；
+        尚未构建时会触发一次反向索引全量重建。
+        
         Returns:
             统计信息字典，包含：
             - concept_count: 概念板块数量
@@ -507,245 +817,299 @@ class SectorManager:
                 "total_industry_stocks": 0
             }
         
-        try:
-            concept_count = self.count_concepts()
-            industry_count = self.count_industries()
-            
-            # 统计概念板块关联的股票总数（去重）
-            concept_stocks_set = set()
-            for concept in self.concept_collection.find({}, {"stocks": 1}):
-                if 'stocks' in concept and isinstance(concept['stocks'], list):
-                    for item in concept['stocks']:
-                        if isinstance(item, str):
-                            concept_stocks_set.add(item)
-                        elif isinstance(item, dict):
-                            code = item.get('code') or item.get('股票代码') or item.get('symbol')
-                            if code:
-                                concept_stocks_set.add(str(code))
-            
-            # 统计行业板块关联的股票总数（去重）
-            industry_stocks_set = set()
-            for industry in self.industry_collection.find({}, {"stocks": 1}):
-                if 'stocks' in industry and isinstance(industry['stocks'], list):
-                    for item in industry['stocks']:
-                        if isinstance(item, str):
-                            industry_stocks_set.add(item)
-                        elif isinstance(item, dict):
-                            code = item.get('code') or item.get('股票代码') or item.get('symbol')
-                            if code:
-                                industry_stocks_set.add(str(code))
-            
-            stats = {
-                "concept_count": concept_count,
-                "industry_count": industry_count,
-                "total_concept_stocks": len(concept_stocks_set),
-                "total_industry_stocks": len(industry_stocks_set)
-            }
-            
-            logger.debug(f"✅ [板块管理] 统计信息获取成功: {stats}")
-            return stats
-                
-        except Exception as e:
-            logger.error(f"❌ [板块管理] 获取统计信息失败: {e}")
-            return {
-                "concept_count": 0,
-                "industry_count": 0,
-                "total_concept_stocks": 0,
-                "total_industry_stocks": 0
-            }
+        stats_doc = self._load_statistics_doc()
+        if stats_doc is None:
+            return self.rebuild_stock_sector_index()
+        
+        # 其他进程可能已完成重建
+        self._set_stock_index_ready(True)
+        
+        stats = {
+            "concept_count": stats_doc.get("concept_count", 0),
+            "industry_count": stats_doc.get("industry_count", 0),
+            "total_concept_stocks": stats_doc.get("total_concept_stocks", 0),
+            "total_industry_stocks": stats_doc.get("total_industry_stocks", 0)
+        }
+        logger.debug(f"✅ [板块管理] 统计信息获取成功: {stats}")
+        return stats
     
     # ==================== 数据更新方法 ====================
     
-    def _delay_for_period(self, min_delay: float = 2.0, max_delay: float = 5.0):
+    def _get_sector_source(self, sector_type: str):
         """
-        延时等待函数，避免请求过于频繁
+        获取板块类型对应的集合和成分股获取函数
         
         Args:
-            min_delay: 最小延时（秒）
-            max_delay: 最大延时（秒）
+            sector_type: 板块类型（"概念" 或 "行业"）
+        
+        Returns:
+            (MongoDB集合对象, akshare成分股获取函数)
         """
-        import random
-        delay = random.uniform(min_delay, max_delay)
-        time.sleep(delay)
+        if sector_type == "概念":
+            return self.concept_collection, ak.stock_board_concept_cons_em
+        return self.industry_collection, ak.stock_board_industry_cons_em
     
-    def _update_single_concept_sector(self, concept_name: str) -> tuple[bool, Optional[str], Optional[int]]:
+    @staticmethod
+    def _build_stock_list(stocks_df: pd.DataFrame) -> List[Dict[str, str]]:
         """
-        更新单个概念板块的内部函数
+        将akshare返回的成分股DataFrame转换为 [{'code': str, 'name': str}, ...]
         
         Args:
-            concept_name: 概念板块名称
+            stocks_df: 成分股DataFrame
+        
+        Returns:
+            按代码排序的股票列表
+        """
+        # 确定代码列和名称列
+        if '代码' in stocks_df.columns:
+            code_col = '代码'
+        elif '股票代码' in stocks_df.columns:
+            code_col = '股票代码'
+        else:
+            # 尝试第一列作为代码
+            code_col = stocks_df.columns[0]
+        
+        name_col = None
+        if '名称' in stocks_df.columns:
+            name_col = '名称'
+        elif '股票名称' in stocks_df.columns:
+            name_col = '股票名称'
+        elif len(stocks_df.columns) > 1:
+            # 尝试第二列作为名称
+            name_col = stocks_df.columns[1]
+        
+        # 只要有代码就保存，没有名称时使用空字符串
+        valid = stocks_df[stocks_df[code_col].notna()]
+        codes = valid[code_col].astype(str).str.zfill(6)
+        if name_col is not None:
+            names = valid[name_col].where(valid[name_col].notna(), '').astype(str)
+        else:
+            names = [''] * len(valid)
+        
+        stock_list = [{'code': code, 'name': name} for code, name in zip(codes, names)]
+        stock_list.sort(key=lambda item: item['code'])
+        return stock_list
+    
+    @staticmethod
+    def _compute_stocks_hash(stock_list: List[Dict[str, str]]) -> str:
+        """
+        计算成分股列表的指纹，用于判断板块成分是否发生变化
+        
+        Args:
+            stock_list: 股票列表（已按代码排序）
+        
+        Returns:
+            SHA1 十六进制摘要
+        """
+        digest = hashlib.sha1()
+        for item in stock_list:
+            digest.update(f"{item['code']}\t{item['name']}\n".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _fetch_sector_stocks(self, fetch_func, sector_name: str) -> List[Dict[str, str]]:
+        """
+        受令牌桶限流地获取单个板块的成分股
+        
+        Args:
+            fetch_func: akshare成分股获取函数
+            sector_name: 板块名称
         
         Returns:
-            (是否成功, 错误信息, 股票数量)
+            股票列表，无数据时返回空列表
+        """
+        self._fetch_bucket.acquire()
+        stocks_df = fetch_func(symbol=sector_name)
+        if stocks_df is None or stocks_df.empty:
+            return []
+        return self._build_stock_list(stocks_df)
+    
+    def _load_stocks_hashes(self, collection, sector_names: List[str]) -> Dict[str, Optional[str]]:
+        """
+        批量读取已保存板块的成分股指纹
+        
+        Args:
+            collection: MongoDB集合对象
+            sector_names: 板块名称列表
+        
+        Returns:
+            {板块名称: 指纹}，旧数据没有指纹时为 None
         """
         try:
-            # 获取概念板块中的股票列表
-            stocks_df = ak.stock_board_concept_cons_em(symbol=concept_name)
-            
-            if stocks_df is not None and not stocks_df.empty:
-                # 提取股票代码和名称，构建包含code和name的字典列表
-                stock_list = []
-                
-                # 确定代码列和名称列
-                code_col = None
-                name_col = None
-                
-                if '代码' in stocks_df.columns:
-                    code_col = '代码'
-                elif '股票代码' in stocks_df.columns:
-                    code_col = '股票代码'
-                else:
-                    # 尝试第一列作为代码
-                    code_col = stocks_df.columns[0]
-                
-                if '名称' in stocks_df.columns:
-                    name_col = '名称'
-                elif '股票名称' in stocks_df.columns:
-                    name_col = '股票名称'
-                elif len(stocks_df.columns) > 1:
-                    # 尝试第二列作为名称
-                    name_col = stocks_df.columns[1]
-                
-                # 构建股票列表
-                for _, row in stocks_df.iterrows():
-                    code = None
-                    name = None
-                    
-                    if code_col and code_col in row.index:
-                        code_val = row[code_col]
-                        if pd.notna(code_val):
-                            code = str(code_val).zfill(6)
-                    
-                    if name_col and name_col in row.index:
-                        name_val = row[name_col]
-                        if pd.notna(name_val):
-                            name = str(name_val)
-                    
-                    if code:  # 只要有代码就保存
-                        stock_list.append({
-                            'code': code,
-                            'name': name if name else ''  # 如果没有名称，使用空字符串
-                        })
-                
-                # 保存到数据库
-                self._save_sector(
-                    self.concept_collection,
-                    concept_name,
-                    stock_list,
-                    "概念"
-                )
-                
-                logger.info(f"✅ [板块管理] 概念板块 '{concept_name}' 更新成功，包含 {len(stock_list)} 只股票")
-                return True, None, len(stock_list)
-            else:
-                logger.warning(f"⚠️ [板块管理] 概念板块 '{concept_name}' 无股票数据")
-                return False, "无股票数据", None
-                
+            cursor = collection.find(
+                {"name": {"$in": list(sector_names)}},
+                {"name": 1, "stocks_hash": 1, "_id": 0}
+            )
+            return {doc['name']: doc.get('stocks_hash') for doc in cursor}
         except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ [板块管理] 更新概念板块 '{concept_name}' 失败: {e}")
-            return False, error_msg, None
+            logger.warning(f"⚠️ [板块管理] 读取板块指纹失败，将全量写入: {e}")
+            return {}
     
-    def _update_single_industry_sector(self, industry_name: str) -> tuple[bool, Optional[str], Optional[int]]:
+    def _build_sector_upsert(self, sector_name: str, stock_list: List[Dict[str, str]],
+                             stocks_hash: str, sector_type: str, now: datetime) -> "UpdateOne":
         """
-        更新单个行业板块的内部函数
+        构建单个板块的 upsert 操作
         
         Args:
-            industry_name: 行业板块名称
+            sector_name: 板块名称
+            stock_list: 股票列表，每个元素为 {'code': str, 'name': str}
+            stocks_hash: 成分股指纹
+            sector_type: 板块类型（"概念" 或 "行业"）
+            now: 更新时间
+        """
+        return UpdateOne(
+            {"name": sector_name},
+            {
+                "$set": {
+                    "name": sector_name,
+                    "stocks": stock_list,  # 保存包含code和name的字典列表
+                    "stock_count": len(stock_list),
+                    "stocks_hash": stocks_hash,
+                    "updated_at": now
+                },
+                "$setOnInsert": {
+                    "created_at": now,
+                    "sector_type": sector_type
+                }
+            },
+            upsert=True
+        )
+    
+    def _bulk_write_sectors(self, collection, operations: List["UpdateOne"], sector_type: str) -> int:
+        """
+        分批执行板块写入
+        
+        Args:
+            collection: MongoDB集合对象
+            operations: UpdateOne 操作列表
+            sector_type: 板块类型（"概念" 或 "行业"）
         
         Returns:
-            (是否成功, 错误信息, 股票数量)
+            写入（新增+修改）的板块数量
         """
-        try:
-            # 获取行业板块中的股票列表
-            stocks_df = ak.stock_board_industry_cons_em(symbol=industry_name)
-            
-            if stocks_df is not None and not stocks_df.empty:
-                # 提取股票代码和名称，构建包含code和name的字典列表
-                stock_list = []
+        written = 0
+        for start in range(0, len(operations), self.BULK_WRITE_BATCH_SIZE):
+            batch = operations[start:start + self.BULK_WRITE_BATCH_SIZE]
+            result = collection.bulk_write(batch, ordered=False)
+            written += result.upserted_count + result.modified_count
+        logger.debug(f"✅ [板块管理] 批量保存{sector_type}板块成功，写入 {written} 个")
+        return written
+    
+    def _refresh_sectors(self, sector_names: List[str], sector_type: str) -> Dict[str, Any]:
+        """
+        并发刷新一组板块的成分股，仅写入成分发生变化的板块
+        
+        成分股请求通过有界线程池并发执行，并由令牌桶统一限流；
+        成分股指纹与数据库中一致的板块直接跳过，其余板块通过一次 bulk_write 写入。
+        
+        Args:
+            sector_names: 板块名称列表
+            sector_type: 板块类型（"概念" 或 "行业"）
+        
+        Returns:
+            包含成功和失败板块信息的字典，额外包含 changed_count / unchanged_count
+        """
+        collection, fetch_func = self._get_sector_source(sector_type)
+        existing_hashes = self._load_stocks_hashes(collection, sector_names)
+        total = len(sector_names)
+        
+        success_list = []
+        failed_dict = {}
+        changed_names = []
+        changed_codes = {}
+        operations = []
+        now = datetime.now()
+        
+        with ThreadPoolExecutor(max_workers=self.update_workers,
+                                thread_name_prefix="sector-refresh") as executor:
+            future_to_name = {
+                executor.submit(self._fetch_sector_stocks, fetch_func, name): name
+                for name in sector_names
+            }
+            for idx, future in enumerate(as_completed(future_to_name), 1):
+                sector_name = future_to_name[future]
+                try:
+                    stock_list = future.result()
+                except Exception as e:
+                    logger.error(f"❌ [板块管理] 更新{sector_type}板块 '{sector_name}' 失败: {e}")
+                    failed_dict[sector_name] = str(e) or "未知错误"
+                    continue
                 
-                # 确定代码列和名称列
-                code_col = None
-                name_col = None
+                if not stock_list:
+                    logger.warning(f"⚠️ [板块管理] {sector_type}板块 '{sector_name}' 无股票数据")
+                    failed_dict[sector_name] = "无股票数据"
+                    continue
                 
-                if '代码' in stocks_df.columns:
-                    code_col = '代码'
-                elif '股票代码' in stocks_df.columns:
-                    code_col = '股票代码'
+                stocks_hash = self._compute_stocks_hash(stock_list)
+                if existing_hashes.get(sector_name) == stocks_hash:
+                    logger.debug(f"⏭️ [板块管理] {sector_type}板块 '{sector_name}' 成分未变化，跳过写入")
                 else:
-                    # 尝试第一列作为代码
-                    code_col = stocks_df.columns[0]
-                
-                if '名称' in stocks_df.columns:
-                    name_col = '名称'
-                elif '股票名称' in stocks_df.columns:
-                    name_col = '股票名称'
-                elif len(stocks_df.columns) > 1:
-                    # 尝试第二列作为名称
-                    name_col = stocks_df.columns[1]
-                
-                # 构建股票列表
-                for _, row in stocks_df.iterrows():
-                    code = None
-                    name = None
-                    
-                    if code_col and code_col in row.index:
-                        code_val = row[code_col]
-                        if pd.notna(code_val):
-                            code = str(code_val).zfill(6)
-                    
-                    if name_col and name_col in row.index:
-                        name_val = row[name_col]
-                        if pd.notna(name_val):
-                            name = str(name_val)
-                    
-                    if code:  # 只要有代码就保存
-                        stock_list.append({
-                            'code': code,
-                            'name': name if name else ''  # 如果没有名称，使用空字符串
-                        })
-                
-                # 保存到数据库
-                self._save_sector(
-                    self.industry_collection,
-                    industry_name,
-                    stock_list,
-                    "行业"
-                )
-                
-                logger.info(f"✅ [板块管理] 行业板块 '{industry_name}' 更新成功，包含 {len(stock_list)} 只股票")
-                return True, None, len(stock_list)
+                    changed_names.append(sector_name)
+                    changed_codes[sector_name] = {item['code'] for item in stock_list}
+                    operations.append(
+                        self._build_sector_upsert(sector_name, stock_list, stocks_hash, sector_type, now)
+                    )
+                success_list.append(sector_name)
+                logger.info(f"🔄 [板块管理] {sector_type}板块进度 {idx}/{total}: '{sector_name}' 包含 {len(stock_list)} 只股票")
+        
+        if operations:
+            # 写入前读取变化板块的旧成分，用于增量维护股票→板块反向索引
+            try:
+                old_codes = self._load_sector_codes(collection, changed_names)
+            except Exception as e:
+                logger.warning(f"⚠️ [板块管理] 读取{sector_type}板块旧成分失败，反向索引将重建: {e}")
+                old_codes = None
+            
+            try:
+                self._bulk_write_sectors(collection, operations, sector_type)
+            except Exception as e:
+                logger.error(f"❌ [板块管理] 批量保存{sector_type}板块失败: {e}")
+                changed_set = set(changed_names)
+                success_list = [name for name in success_list if name not in changed_set]
+                for name in changed_names:
+                    failed_dict[name] = f"保存失败: {e}"
+                changed_names = []
             else:
-                logger.warning(f"⚠️ [板块管理] 行业板块 '{industry_name}' 无股票数据")
-                return False, "无股票数据", None
-                
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ [板块管理] 更新行业板块 '{industry_name}' 失败: {e}")
-            return False, error_msg, None
+                if old_codes is None:
+                    self._invalidate_stock_sector_index()
+                else:
+                    self._apply_stock_sector_changes(sector_type, old_codes, changed_codes, now)
+        
+        # 保持与输入顺序一致
+        order = {name: idx for idx, name in enumerate(sector_names)}
+        success_list.sort(key=lambda name: order.get(name, total))
+        
+        return {
+            "success": success_list,
+            "failed": failed_dict,
+            "total": total,
+            "success_count": len(success_list),
+            "failed_count": len(failed_dict),
+            "changed_count": len(changed_names),
+            "unchanged_count": len(success_list) - len(changed_names)
+        }
     
-    def update_concept_sectors(self) -> Dict[str, Any]:
+    def _update_sectors(self, sector_type: str, sector_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        更新所有概念板块数据（从 akshare 获取）
+        更新板块数据的公共流程
+        
+        Args:
+            sector_type: 板块类型（"概念" 或 "行业"）
+            sector_names: 指定的板块名称列表，为 None 时从 akshare 获取全部板块
         
         Returns:
-            包含成功和失败板块信息的字典:
-            {
-                "success": ["板块1", "板块2", ...],
-                "failed": {"板块3": "错误信息", "板块4": "错误信息", ...},
-                "total": 总数量,
-                "success_count": 成功数量,
-                "failed_count": 失败数量
-            }
+            包含成功和失败板块信息的字典
         """
+        specified = sector_names is not None
+        expected_total = len(sector_names) if specified else 0
+        
         if not self.connected:
             logger.error("❌ [板块管理] MongoDB未连接")
             return {
                 "success": [],
                 "failed": {"整体更新": "MongoDB未连接"},
-                "total": 0,
+                "total": expected_total,
                 "success_count": 0,
-                "failed_count": 1
+                "failed_count": expected_total if specified else 1
             }
         
         if not AKSHARE_AVAILABLE:
@@ -753,83 +1117,67 @@ class SectorManager:
             return {
                 "success": [],
                 "failed": {"整体更新": "akshare库未安装"},
-                "total": 0,
+                "total": expected_total,
                 "success_count": 0,
-                "failed_count": 1
+                "failed_count": expected_total if specified else 1
             }
         
+        empty_result = {
+            "success": [],
+            "failed": {},
+            "total": 0,
+            "success_count": 0,
+            "failed_count": 0
+        }
+        
         try:
-            logger.info("🔄 [板块管理] 开始更新概念板块信息...")
-            
-            # 获取概念板块列表
-            concept_list = ak.stock_board_concept_name_em()
-            
-            if concept_list is None or concept_list.empty:
-                logger.warning("⚠️ [板块管理] 未获取到概念板块列表")
-                return {
-                    "success": [],
-                    "failed": {},
-                    "total": 0,
-                    "success_count": 0,
-                    "failed_count": 0
-                }
-            
-            concept_names = concept_list['板块名称'].tolist() if '板块名称' in concept_list.columns else []
-            
-            if not concept_names:
-                logger.warning("⚠️ [板块管理] 概念板块列表为空")
-                return {
-                    "success": [],
-                    "failed": {},
-                    "total": 0,
-                    "success_count": 0,
-                    "failed_count": 0
-                }
-            
-            logger.info(f"📊 [板块管理] 获取到 {len(concept_names)} 个概念板块")
-            
-            success_list = []
-            failed_dict = {}
-            
-            # 为每个概念板块获取并保存股票列表
-            for idx, concept_name in enumerate(concept_names, 1):
-                logger.info(f"🔄 [板块管理] 正在更新概念板块 {idx}/{len(concept_names)}: {concept_name}")
+            if specified:
+                if not sector_names:
+                    return empty_result
+                logger.info(f"🔄 [板块管理] 开始更新指定的 {len(sector_names)} 个{sector_type}板块...")
+            else:
+                logger.info(f"🔄 [板块管理] 开始更新{sector_type}板块信息...")
                 
-                # 延时避免请求过于频繁
-                if idx > 1:
-                    self._delay_for_period(2, 5)
+                # 获取板块列表
+                if sector_type == "概念":
+                    sector_df = ak.stock_board_concept_name_em()
+                else:
+                    sector_df = ak.stock_board_industry_name_em()
                 
-                success, error_msg, stock_count = self._update_single_concept_sector(concept_name)
+                if sector_df is None or sector_df.empty:
+                    logger.warning(f"⚠️ [板块管理] 未获取到{sector_type}板块列表")
+                    return empty_result
                 
-                if success:
-                    success_list.append(concept_name)
-                else:
-                    failed_dict[concept_name] = error_msg or "未知错误"
+                sector_names = sector_df['板块名称'].tolist() if '板块名称' in sector_df.columns else []
+                
+                if not sector_names:
+                    logger.warning(f"⚠️ [板块管理] {sector_type}板块列表为空")
+                    return empty_result
+                
+                logger.info(f"📊 [板块管理] 获取到 {len(sector_names)} 个{sector_type}板块")
             
-            result = {
-                "success": success_list,
-                "failed": failed_dict,
-                "total": len(concept_names),
-                "success_count": len(success_list),
-                "failed_count": len(failed_dict)
-            }
+            result = self._refresh_sectors(sector_names, sector_type)
             
-            logger.info(f"✅ [板块管理] 概念板块更新完成，成功 {len(success_list)} 个，失败 {len(failed_dict)} 个")
+            logger.info(
+                f"✅ [板块管理] {sector_type}板块更新完成，成功 {result['success_count']} 个"
+                f"（变化 {result['changed_count']} 个，未变化 {result['unchanged_count']} 个），"
+                f"失败 {result['failed_count']} 个"
+            )
             return result
             
         except Exception as e:
-            logger.error(f"❌ [板块管理] 更新概念板块失败: {e}", exc_info=True)
+            logger.error(f"❌ [板块管理] 更新{sector_type}板块失败: {e}", exc_info=True)
             return {
                 "success": [],
                 "failed": {"整体更新": str(e)},
-                "total": 0,
+                "total": expected_total,
                 "success_count": 0,
-                "failed_count": 1
+                "failed_count": expected_total if specified else 1
             }
     
-    def update_industry_sectors(self) -> Dict[str, Any]:
+    def update_concept_sectors(self) -> Dict[str, Any]:
         """
-        更新所有行业板块数据（从 akshare 获取）
+        更新所有概念板块数据（从 akshare 获取）
         
         Returns:
             包含成功和失败板块信息的字典:
@@ -838,97 +1186,21 @@ class SectorManager:
                 "failed": {"板块3": "错误信息", "板块4": "错误信息", ...},
                 "total": 总数量,
                 "success_count": 成功数量,
-                "failed_count": 失败数量
+                "failed_count": 失败数量,
+                "changed_count": 成分变化并写入的数量,
+                "unchanged_count": 成分未变化而跳过写入的数量
             }
         """
-        if not self.connected:
-            logger.error("❌ [板块管理] MongoDB未连接")
-            return {
-                "success": [],
-                "failed": {"整体更新": "MongoDB未连接"},
-                "total": 0,
-                "success_count": 0,
-                "failed_count": 1
-            }
-        
-        if not AKSHARE_AVAILABLE:
-            logger.error("❌ [板块管理] akshare库未安装")
-            return {
-                "success": [],
-                "failed": {"整体更新": "akshare库未安装"},
-                "total": 0,
-                "success_count": 0,
-                "failed_count": 1
-            }
+        return self._update_sectors("概念")
+    
+    def update_industry_sectors(self) -> Dict[str, Any]:
+        """
+        更新所有行业板块数据（从 akshare 获取）
         
-        try:
-            logger.info("🔄 [板块管理] 开始更新行业板块信息...")
-            
-            # 获取行业板块列表
-            industry_list = ak.stock_board_industry_name_em()
-            
-            if industry_list is None or industry_list.empty:
-                logger.warning("⚠️ [板块管理] 未获取到行业板块列表")
-                return {
-                    "success": [],
-                    "failed": {},
-                    "total": 0,
-                    "success_count": 0,
-                    "failed_count": 0
-                }
-            
-            industry_names = industry_list['板块名称'].tolist() if '板块名称' in industry_list.columns else []
-            
-            if not industry_names:
-                logger.warning("⚠️ [板块管理] 行业板块列表为空")
-                return {
-                    "success": [],
-                    "failed": {},
-                    "total": 0,
-                    "success_count": 0,
-                    "failed_count": 0
-                }
-            
-            logger.info(f"📊 [板块管理] 获取到 {len(industry_names)} 个行业板块")
-            
-            success_list = []
-            failed_dict = {}
-            
-            # 为每个行业板块获取并保存股票列表
-            for idx, industry_name in enumerate(industry_names, 1):
-                logger.info(f"🔄 [板块管理] 正在更新行业板块 {idx}/{len(industry_names)}: {industry_name}")
-                
-                # 延时避免请求过于频繁
-                if idx > 1:
-                    self._delay_for_period(2, 5)
-                
-                success, error_msg, stock_count = self._update_single_industry_sector(industry_name)
-                
-                if success:
-                    success_list.append(industry_name)
-                else:
-                    failed_dict[industry_name] = error_msg or "未知错误"
-            
-            result = {
-                "success": success_list,
-                "failed": failed_dict,
-                "total": len(industry_names),
-                "success_count": len(success_list),
-                "failed_count": len(failed_dict)
-            }
-            
-            logger.info(f"✅ [板块管理] 行业板块更新完成，成功 {len(success_list)} 个，失败 {len(failed_dict)} 个")
-            return result
-            
-        except Exception as e:
-            logger.error(f"❌ [板块管理] 更新行业板块失败: {e}", exc_info=True)
-            return {
-                "success": [],
-                "failed": {"整体更新": str(e)},
-                "total": 0,
-                "success_count": 0,
-                "failed_count": 1
-            }
+        Returns:
+            包含成功和失败板块信息的字典，格式同 update_concept_sectors
+        """
+        return self._update_sectors("行业")
     
     def update_specific_concept_sectors(self, concept_names: List[str]) -> Dict[str, Any]:
         """
@@ -940,64 +1212,7 @@ class SectorManager:
         Returns:
             包含成功和失败板块信息的字典
         """
-        if not self.connected:
-            logger.error("❌ [板块管理] MongoDB未连接")
-            return {
-                "success": [],
-                "failed": {"整体更新": "MongoDB未连接"},
-                "total": len(concept_names),
-                "success_count": 0,
-                "failed_count": len(concept_names)
-            }
-        
-        if not AKSHARE_AVAILABLE:
-            logger.error("❌ [板块管理] akshare库未安装")
-            return {
-                "success": [],
-                "failed": {"整体更新": "akshare库未安装"},
-                "total": len(concept_names),
-                "success_count": 0,
-                "failed_count": len(concept_names)
-            }
-        
-        if not concept_names:
-            return {
-                "success": [],
-                "failed": {},
-                "total": 0,
-                "success_count": 0,
-                "failed_count": 0
-            }
-        
-        logger.info(f"🔄 [板块管理] 开始更新指定的 {len(concept_names)} 个概念板块...")
-        
-        success_list = []
-        failed_dict = {}
-        
-        for idx, concept_name in enumerate(concept_names, 1):
-            logger.info(f"🔄 [板块管理] 正在更新概念板块 {idx}/{len(concept_names)}: {concept_name}")
-            
-            # 延时避免请求过于频繁
-            if idx > 1:
-                self._delay_for_period(2, 5)
-            
-            success, error_msg, stock_count = self._update_single_concept_sector(concept_name)
-            
-            if success:
-                success_list.append(concept_name)
-            else:
-                failed_dict[concept_name] = error_msg or "未知错误"
-        
-        result = {
-            "success": success_list,
-            "failed": failed_dict,
-            "total": len(concept_names),
-            "success_count": len(success_list),
-            "failed_count": len(failed_dict)
-        }
-        
-        logger.info(f"✅ [板块管理] 指定概念板块更新完成，成功 {len(success_list)} 个，失败 {len(failed_dict)} 个")
-        return result
+        return self._update_sectors("概念", concept_names)
     
     def update_specific_industry_sectors(self, industry_names: List[str]) -> Dict[str, Any]:
         """
@@ -1009,101 +1224,7 @@ class SectorManager:
         Returns:
             包含成功和失败板块信息的字典
         """
-        if not self.connected:
-            logger.error("❌ [板块管理] MongoDB未连接")
-            return {
-                "success": [],
-                "failed": {"整体更新": "MongoDB未连接"},
-                "total": len(industry_names),
-                "success_count": 0,
-                "failed_count": len(industry_names)
-            }
-        
-        if not AKSHARE_AVAILABLE:
-            logger.error("❌ [板块管理] akshare库未安装")
-            return {
-                "success": [],
-                "failed": {"整体更新": "akshare库未安装"},
-                "total": len(industry_names),
-                "success_count": 0,
-                "failed_count": len(industry_names)
-            }
-        
-        if not industry_names:
-            return {
-                "success": [],
-                "failed": {},
-                "total": 0,
-                "success_count": 0,
-                "failed_count": 0
-            }
-        
-        logger.info(f"🔄 [板块管理] 开始更新指定的 {len(industry_names)} 个行业板块...")
-        
-        success_list = []
-        failed_dict = {}
-        
-        for idx, industry_name in enumerate(industry_names, 1):
-            logger.info(f"🔄 [板块管理] 正在更新行业板块 {idx}/{len(industry_names)}: {industry_name}")
-            
-            # 延时避免请求过于频繁
-            if idx > 1:
-                self._delay_for_period(2, 5)
-            
-            success, error_msg, stock_count = self._update_single_industry_sector(industry_name)
-            
-            if success:
-                success_list.append(industry_name)
-            else:
-                failed_dict[industry_name] = error_msg or "未知错误"
-        
-        result = {
-            "success": success_list,
-            "failed": failed_dict,
-            "total": len(industry_names),
-            "success_count": len(success_list),
-            "failed_count": len(failed_dict)
-        }
-        
-        logger.info(f"✅ [板块管理] 指定行业板块更新完成，成功 {len(success_list)} 个，失败 {len(failed_dict)} 个")
-        return result
-    
-    def _save_sector(self, collection, sector_name: str, stock_list: List[Dict[str, str]], sector_type: str):
-        """
-        保存板块数据到数据库
-        
-        Args:
-            collection: MongoDB集合对象
-            sector_name: 板块名称
-            stock_list: 股票列表，每个元素为 {'code': str, 'name': str}
-            sector_type: 板块类型（"概念" 或 "行业"）
-        """
-        try:
-            now = datetime.now()
-            
-            # 使用 upsert 操作，如果存在则更新，不存在则插入
-            collection.update_one(
-                {"name": sector_name},
-                {
-                    "$set": {
-                        "name": sector_name,
-                        "stocks": stock_list,  # 保存包含code和name的字典列表
-                        "stock_count": len(stock_list),
-                        "updated_at": now
-                    },
-                    "$setOnInsert": {
-                        "created_at": now,
-                        "sector_type": sector_type
-                    }
-                },
-                upsert=True
-            )
-            
-            logger.debug(f"✅ [板块管理] 保存{sector_type}板块 '{sector_name}' 成功")
-            
-        except Exception as e:
-            logger.error(f"❌ [板块管理] 保存{sector_type}板块 '{sector_name}' 失败: {e}")
-            raise
+        return self._update_sectors("行业", industry_names)
 
 
 # 创建全局实例
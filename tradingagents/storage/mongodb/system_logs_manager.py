@@ -2,13 +2,27 @@
 """
 MongoDB系统日志管理器
 用于保存和读取系统日志到MongoDB数据库的trading_agents_logs集合
+
+查询优化：
+- 关键字搜索使用写入时生成的 search_tokens 字段（英文单词 + 中文单字和二元组），
+  先走多键索引缩小候选范围，再用原有的子串正则确认，不再对全集合做无锚点正则扫描；
+  缺少词元或词元版本过旧的历史日志仍按正则匹配，直到 backfill_search_tokens 补充完成
+- 关键字匹配语义：中文和其他字符仍为子串匹配；英文单词按前缀匹配（"analy" 命中
+  "analysis"，"lysis" 不再命中），单个英文字母或纯符号的关键字按正则扫描
+- 支持按 (timestamp, _id) 的游标分页，深分页不再依赖 skip
+- 总数统计支持 exact / capped / estimated 三种模式
+
+【配置】
+SYSTEM_LOGS_COUNT_CAP   capped/estimated 模式下计数的上限（默认 10000）
 """
 
 import os
 import re
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 
+from tradingagents.config.env_utils import parse_int_env
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('storage')
 
@@ -20,6 +34,60 @@ except ImportError:
     MONGODB_AVAILABLE = False
     logger.warning("pymongo未安装，MongoDB功能不可用")
 
+# 参与生成搜索词元的字段，以及每个字段参与分词的最大字符数
+SEARCH_FIELDS = ('message', 'module', 'function', 'logger')
+SEARCH_FIELD_MAX_CHARS = 2000
+
+COUNT_MODES = ('exact', 'capped', 'estimated')
+
+# 搜索词元规则版本（2: 中文同时保存单字），低于该版本的日志按正则匹配
+SEARCH_TOKENS_VERSION = 2
+_OUTDATED_TOKENS_FILTER = {'$or': [
+    {'search_tokens_version': {'$exists': False}},
+    {'search_tokens_version': {'$lt': SEARCH_TOKENS_VERSION}},
+]}
+
+# 是否仍有缺少 search_tokens 的历史日志，检查结果的缓存秒数
+UNTOKENIZED_CHECK_INTERVAL = 300
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]{2,}')
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]+')
+
+
+def tokenize_search_text(text: str, unigrams: bool = False) -> List[str]:
+    """
+    将文本切分为搜索词元
+
+    英文/数字按单词切分（忽略单字符），中文连续片段切分为二元组，
+    单个汉字的片段保留为单字。写入时 unigrams=True，额外保存每个汉字，
+    使单字关键字也能命中较长的中文片段。
+    """
+    if not text:
+        return []
+    text = text.lower()
+    tokens = _WORD_PATTERN.findall(text)
+    for run in _CJK_PATTERN.findall(text):
+        if len(run) == 1 or unigrams:
+            tokens.extend(run)
+        if len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def build_search_tokens(log_entry: Dict[str, Any]) -> List[str]:
+    """根据日志的 message / module / function / logger 字段生成去重后的搜索词元"""
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        value = log_entry.get(field)
+        if isinstance(value, str):
+            tokens.update(tokenize_search_text(value[:SEARCH_FIELD_MAX_CHARS], unigrams=True))
+    return sorted(tokens)
+
+
+def search_token_fields(log_entry: Dict[str, Any]) -> Dict[str, Any]:
+    """生成写入日志文档的搜索词元字段（词元及其规则版本）"""
+    return {'search_tokens': build_search_tokens(log_entry), 'search_tokens_version': SEARCH_TOKENS_VERSION}
+
 
 class SystemLogsManager:
     """MongoDB系统日志管理器"""
@@ -27,6 +95,8 @@ class SystemLogsManager:
     def __init__(self):
         self.collection = None
         self.connected = False
+        # (是否存在缺少 search_tokens 或词元版本过旧的日志, 检查时间)
+        self._untokenized_check: Optional[Tuple[bool, float]] = None
         
         if MONGODB_AVAILABLE:
             self._connect()
@@ -43,10 +113,11 @@ class SystemLogsManager:
                 self.connected = False
                 return
             
+            self.connected = True
+            
             # 创建索引
             self._create_indexes()
             
-            self.connected = True
             logger.info(f"✅ [MongoDB系统日志] 连接成功（使用统一连接管理）: trading_agents_logs")
             
         except Exception as e:
@@ -99,6 +170,31 @@ class SystemLogsManager:
             except Exception:
                 pass
             
+            # 创建 (timestamp, _id) 索引用于游标分页
+            try:
+                self.collection.create_index(
+                    [("timestamp", -1), ("_id", -1)],
+                    background=True,
+                    name="timestamp_id_idx"
+                )
+            except Exception:
+                pass
+            
+            # 创建搜索词元多键索引用于关键字搜索
+            try:
+                self.collection.create_index(
+                    [("search_tokens", 1), ("timestamp", -1)],
+                    background=True,
+                    name="search_tokens_idx"
+                )
+                self.collection.create_index(
+                    [("search_tokens_version", 1)],
+                    background=True,
+                    name="search_tokens_version_idx"
+                )
+            except Exception:
+                pass
+            
             logger.debug("✅ [MongoDB系统日志] 索引创建成功")
             
         except Exception as e:
@@ -154,6 +250,9 @@ class SystemLogsManager:
             else:
                 log_entry['timestamp'] = datetime.now()
             
+            # 生成关键字搜索词元
+            log_entry.update(search_token_fields(log_entry))
+            
             # 插入文档
             result = self.collection.insert_one(log_entry)
             
@@ -208,6 +307,9 @@ class SystemLogsManager:
                 else:
                     entry['timestamp'] = datetime.now()
                 
+                # 生成关键字搜索词元
+                entry.update(search_token_fields(entry))
+                
                 processed_entries.append(entry)
             
             # 批量插入
@@ -261,6 +363,14 @@ class SystemLogsManager:
                 logger.error(f"❌ [MongoDB系统日志] 无效的日志ID: {log_id}")
                 return False
             
+            # 搜索字段变化时重新生成搜索词元
+            if any(field in update_data for field in SEARCH_FIELDS):
+                current = self.collection.find_one(
+                    {"_id": object_id}, {field: 1 for field in SEARCH_FIELDS}
+                ) or {}
+                current.update(update_data)
+                update_data.update(search_token_fields(current))
+            
             # 更新文档
             result = self.collection.update_one(
                 {"_id": object_id},
@@ -273,7 +383,96 @@ class SystemLogsManager:
             logger.error(f"❌ [MongoDB系统日志] 更新日志失败: {e}")
             return False
     
-    def query_logs(
+    @staticmethod
+    def encode_cursor(timestamp: datetime, doc_id: Any) -> str:
+        """将 (timestamp, _id) 编码为分页游标"""
+        return f"{timestamp.isoformat()}|{doc_id}"
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+        """
+        解析分页游标
+        
+        Raises:
+            ValueError: 游标格式无效
+        """
+        from bson import ObjectId
+        
+        try:
+            timestamp_str, doc_id = cursor.rsplit('|', 1)
+            return datetime.fromisoformat(timestamp_str), ObjectId(doc_id)
+        except Exception as e:
+            raise ValueError(f"无效的分页游标: {cursor}") from e
+    
+    def _build_exact_filters(self, level: Optional[str], logger_name: Optional[str]) -> Dict[str, Any]:
+        """日志级别与 Logger 名称精确匹配（可走索引）"""
+        filters = {}
+        if level:
+            filters['level'] = self.clean_ansi_codes(level).strip().upper()
+        if logger_name:
+            filters['logger'] = logger_name.strip()
+        return filters
+    
+    def _build_keyword_filter(self, keyword: str) -> Dict[str, Any]:
+        """
+        构建关键字过滤条件
+        
+        中文词元要求全部命中 search_tokens，英文单词要求命中以其开头的词元，
+        由多键索引缩小候选范围后再用多字段子串正则确认。无法分词的关键字
+        （如单个英文字母、纯符号）只按正则匹配。仍有缺少词元或词元版本过旧的
+        历史日志时，这部分日志只按正则匹配。
+        """
+        keyword_clean = self.clean_ansi_codes(keyword).strip()
+        keyword_regex = {'$regex': re.escape(keyword_clean), '$options': 'i'}
+        regex_filter = {'$or': [{field: keyword_regex} for field in SEARCH_FIELDS]}
+        
+        keyword_lower = keyword_clean.lower()
+        words = set(_WORD_PATTERN.findall(keyword_lower))
+        cjk_tokens = sorted(set(tokenize_search_text(keyword_lower)) - words)
+        token_conditions = [{'search_tokens': {'$regex': f'^{re.escape(word)}'}} for word in sorted(words)]
+        if cjk_tokens:
+            token_conditions.append({'search_tokens': {'$all': cjk_tokens}})
+        if not token_conditions:
+            return regex_filter
+        
+        token_filter = token_conditions[0] if len(token_conditions) == 1 else {'$and': token_conditions}
+        if self._has_untokenized_logs():
+            token_filter = {'$or': [token_filter, _OUTDATED_TOKENS_FILTER]}
+        return {'$and': [token_filter, regex_filter]}
+    
+    def _has_untokenized_logs(self) -> bool:
+        """是否仍有缺少 search_tokens 或词元版本过旧的历史日志（结果缓存 UNTOKENIZED_CHECK_INTERVAL 秒）"""
+        now = time.time()
+        if self._untokenized_check and now - self._untokenized_check[1] < UNTOKENIZED_CHECK_INTERVAL:
+            return self._untokenized_check[0]
+        try:
+            exists = self.collection.find_one(_OUTDATED_TOKENS_FILTER, {'_id': 1}) is not None
+        except Exception as e:
+            logger.debug(f"📊 [MongoDB系统日志] 检查历史日志搜索词元失败: {e}")
+            exists = True
+        self._untokenized_check = (exists, now)
+        return exists
+    
+    def _count_logs(self, query: Dict[str, Any], count_mode: str) -> Tuple[int, bool]:
+        """
+        按模式统计记录数
+        
+        Returns:
+            (记录数, 是否为估算值)
+        """
+        count_cap = max(1, parse_int_env("SYSTEM_LOGS_COUNT_CAP", 10000))
+        
+        if count_mode == 'estimated' and not query:
+            # 无过滤条件时直接读取集合元数据
+            return self.collection.estimated_document_count(), True
+        
+        if count_mode in ('capped', 'estimated'):
+            count = self.collection.count_documents(query, limit=count_cap)
+            return count, count >= count_cap
+        
+        return self.collection.count_documents(query), False
+    
+    def query_logs_page(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -282,27 +481,42 @@ class SystemLogsManager:
         level: Optional[str] = None,
         logger_name: Optional[str] = None,
         limit: int = 1000,
-        skip: int = 0
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        skip: int = 0,
+        cursor: Optional[str] = None,
+        count_mode: str = 'exact'
+    ) -> Dict[str, Any]:
         """
-        查询日志记录
+        分页查询日志记录
         
         Args:
             start_date: 开始日期 (YYYY-MM-DD)
             end_date: 结束日期 (YYYY-MM-DD)
             days: 近N天
-            keyword: 关键字搜索（在 message, module, function, logger 字段中搜索）
-            level: 日志级别过滤 (INFO, WARNING, ERROR等)
-            logger_name: Logger名称过滤
+            keyword: 关键字搜索（子串匹配 message, module, function, logger 字段，
+                其中英文单词按前缀匹配）
+            level: 日志级别精确过滤 (INFO, WARNING, ERROR等)
+            logger_name: Logger名称精确过滤
             limit: 返回结果数量限制
-            skip: 跳过的记录数（用于分页）
+            skip: 跳过的记录数（提供 cursor 时忽略）
+            cursor: 上一页返回的 next_cursor，按 (timestamp, _id) 继续向后翻页
+            count_mode: 总数统计模式 exact（精确）/ capped（最多统计到上限）/
+                estimated（无过滤条件时读取集合元数据，否则同 capped）
             
         Returns:
-            (日志记录列表, 总记录数)
+            {"logs": 日志列表, "total": 总记录数, "total_is_estimate": 总数是否为估算/下限值,
+             "next_cursor": 下一页游标，没有更多数据时为 None}
+            
+        Raises:
+            ValueError: 游标或统计模式无效
         """
+        empty_page = {"logs": [], "total": 0, "total_is_estimate": False, "next_cursor": None}
         if not self.connected:
             logger.warning("⚠️ [MongoDB系统日志] MongoDB未连接，返回空结果")
-            return [], 0
+            return empty_page
+        
+        if count_mode not in COUNT_MODES:
+            raise ValueError(f"无效的统计模式: {count_mode}，可选值: {', '.join(COUNT_MODES)}")
+        cursor_position = self.decode_cursor(cursor) if cursor else None
         
         try:
             # 构建查询条件
@@ -338,40 +552,40 @@ class SystemLogsManager:
                 if date_query:
                     query['timestamp'] = date_query
             
-            # 日志级别过滤
-            if level:
-                # 清理 ANSI 代码后比较
-                level_upper = self.clean_ansi_codes(level).upper()
-                query['level'] = {'$regex': level_upper, '$options': 'i'}
-            
-            # Logger名称过滤
-            if logger_name:
-                query['logger'] = {'$regex': logger_name, '$options': 'i'}
-            
-            # 关键字搜索（在多个字段中搜索）
-            if keyword:
-                keyword_clean = self.clean_ansi_codes(keyword)
-                keyword_regex = {'$regex': keyword_clean, '$options': 'i'}
-                query['$or'] = [
-                    {'message': keyword_regex},
-                    {'module': keyword_regex},
-                    {'function': keyword_regex},
-                    {'logger': keyword_regex}
-                ]
-            
-            # 统计总记录数
-            total_count = self.collection.count_documents(query)
-            
-            # 查询记录，按时间倒序
-            cursor = (
-                self.collection.find(query)
-                .sort('timestamp', -1)
-                .skip(skip)
+            # 日志级别、Logger名称精确匹配
+            query.update(self._build_exact_filters(level, logger_name))
+            
+            # 关键字搜索
+            if keyword and keyword.strip():
+                query.update(self._build_keyword_filter(keyword))
+            
+            # 统计总记录数（不受游标影响）
+            total_count, total_is_estimate = self._count_logs(query, count_mode)
+            
+            # 游标分页：取排在游标之后的记录
+            page_query = query
+            if cursor_position:
+                cursor_ts, cursor_id = cursor_position
+                page_query = {'$and': [query, {'$or': [
+                    {'timestamp': {'$lt': cursor_ts}},
+                    {'timestamp': cursor_ts, '_id': {'$lt': cursor_id}}
+                ]}]}
+            
+            # 查询记录，按时间倒序（_id 保证同一时间戳内顺序稳定）
+            find_cursor = (
+                self.collection.find(page_query, {'search_tokens': 0})
+                .sort([('timestamp', -1), ('_id', -1)])
                 .limit(limit)
             )
+            if skip and not cursor_position:
+                find_cursor = find_cursor.skip(skip)
             
             logs = []
-            for doc in cursor:
+            last_position = None
+            for doc in find_cursor:
+                if isinstance(doc.get('timestamp'), datetime):
+                    last_position = (doc['timestamp'], doc['_id'])
+                
                 # 移除 _id 字段（转换为字符串）或保留
                 if '_id' in doc:
                     doc['_id'] = str(doc['_id'])
@@ -382,11 +596,92 @@ class SystemLogsManager:
                 
                 logs.append(doc)
             
-            return logs, total_count
+            next_cursor = None
+            if len(logs) >= limit and last_position:
+                next_cursor = self.encode_cursor(*last_position)
+            
+            return {
+                "logs": logs,
+                "total": total_count,
+                "total_is_estimate": total_is_estimate,
+                "next_cursor": next_cursor
+            }
             
         except Exception as e:
             logger.error(f"❌ [MongoDB系统日志] 查询日志失败: {e}")
-            return [], 0
+            return empty_page
+    
+    def query_logs(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        days: Optional[int] = None,
+        keyword: Optional[str] = None,
+        level: Optional[str] = None,
+        logger_name: Optional[str] = None,
+        limit: int = 1000,
+        skip: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        查询日志记录（精确计数 + skip 分页，参数含义同 query_logs_page）
+        
+        Returns:
+            (日志记录列表, 总记录数)
+        """
+        page = self.query_logs_page(
+            start_date=start_date,
+            end_date=end_date,
+            days=days,
+            keyword=keyword,
+            level=level,
+            logger_name=logger_name,
+            limit=limit,
+            skip=skip
+        )
+        return page["logs"], page["total"]
+    
+    def backfill_search_tokens(self, batch_size: int = 1000) -> int:
+        """
+        为缺少 search_tokens 字段或词元版本过旧的历史日志（重新）生成搜索词元
+        
+        Args:
+            batch_size: 每批更新的记录数
+            
+        Returns:
+            补充的记录数
+        """
+        if not self.connected:
+            logger.warning("⚠️ [MongoDB系统日志] MongoDB未连接，跳过搜索词元补充")
+            return 0
+        
+        from pymongo import UpdateOne
+        
+        projection = {field: 1 for field in SEARCH_FIELDS}
+        updated = 0
+        try:
+            while True:
+                docs = list(
+                    self.collection.find(_OUTDATED_TOKENS_FILTER, projection)
+                    .limit(batch_size)
+                )
+                if not docs:
+                    break
+                operations = [
+                    UpdateOne({'_id': doc['_id']}, {'$set': search_token_fields(doc)})
+                    for doc in docs
+                ]
+                result = self.collection.bulk_write(operations, ordered=False)
+                updated += result.modified_count
+                if len(docs) < batch_size:
+                    break
+            
+            self._untokenized_check = None
+            logger.info(f"✅ [MongoDB系统日志] 补充了 {updated} 条日志的搜索词元")
+            return updated
+            
+        except Exception as e:
+            logger.error(f"❌ [MongoDB系统日志] 补充搜索词元失败: {e}")
+            return updated
     
     def get_logs_stats(self) -> Dict[str, Any]:
         """
@@ -531,14 +826,8 @@ class SystemLogsManager:
                 if date_query:
                     query['timestamp'] = date_query
             
-            # 日志级别过滤
-            if level:
-                level_upper = self.clean_ansi_codes(level).upper()
-                query['level'] = {'$regex': level_upper, '$options': 'i'}
-            
-            # Logger名称过滤
-            if logger_name:
-                query['logger'] = {'$regex': logger_name, '$options': 'i'}
+            # 日志级别、Logger名称精确匹配
+            query.update(self._build_exact_filters(level, logger_name))
             
             # 执行删除
             result = self.collection.delete_many(query)
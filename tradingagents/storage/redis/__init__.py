@@ -3,12 +3,13 @@
 Redis 存储模块
 """
 
-from .connection import RedisConnection, get_redis_client
+from .connection import RedisConnection, get_redis_client, get_redis_binary_client
 from .cache_manager import RedisCacheManager, redis_cache_manager
 
 __all__ = [
     'RedisConnection',
     'get_redis_client',
+    'get_redis_binary_client',
     'RedisCacheManager',
     'redis_cache_manager',
 ]
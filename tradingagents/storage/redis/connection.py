@@ -25,6 +25,7 @@ class RedisConnection:
     
     _instance = None
     _client = None
+    _binary_client = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -99,6 +100,18 @@ class RedisConnection:
     def get_client(self) -> Optional[redis.Redis]:
         """获取 Redis 客户端"""
         return self._client if self._connected else None
+
+    def get_binary_client(self) -> Optional[redis.Redis]:
+        """获取不解码响应的 Redis 客户端（读写二进制值），连接参数与 get_client 相同"""
+        if not self._connected:
+            return None
+        if self._binary_client is None:
+            pool = self._client.connection_pool
+            connection_kwargs = dict(pool.connection_kwargs, decode_responses=False)
+            self._binary_client = redis.Redis(
+                connection_pool=redis.ConnectionPool(connection_class=pool.connection_class, **connection_kwargs)
+            )
+        return self._binary_client
     
     def is_connected(self) -> bool:
         """检查是否已连接"""
@@ -106,6 +119,9 @@ class RedisConnection:
     
     def close(self):
         """关闭连接"""
+        if self._binary_client is not None:
+            self._binary_client.close()
+            self._binary_client = None
         if self._client:
             self._client.close()
             self._connected = False
@@ -123,3 +139,10 @@ def get_redis_client() -> Optional[redis.Redis]:
         _connection = RedisConnection()
     return _connection.get_client()
 
+
+def get_redis_binary_client() -> Optional[redis.Redis]:
+    """获取不解码响应的 Redis 客户端（全局函数）"""
+    global _connection
+    if _connection is None:
+        _connection = RedisConnection()
+    return _connection.get_binary_client()
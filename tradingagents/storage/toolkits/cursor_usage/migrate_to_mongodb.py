@@ -211,9 +211,10 @@ class CursorUsageMigrator:
                     
                     # 当达到批量大小时，执行批量插入
                     if len(batch) >= self.batch_size:
-                        saved_count = self.manager.insert_many(batch, skip_duplicates=skip_duplicates)
-                        stats["saved"] += saved_count
-                        stats["skipped"] += len(batch) - saved_count
+                        counts = self.manager.bulk_import(batch, skip_duplicates=skip_duplicates)
+                        stats["saved"] += counts["inserted"]
+                        stats["skipped"] += counts["skipped"]
+                        stats["failed"] += counts["failed"]
                         batch = []
                         
                         if (i + 1) % (self.batch_size * 10) == 0:
@@ -221,9 +222,10 @@ class CursorUsageMigrator:
                 
                 # 处理剩余的记录
                 if batch:
-                    saved_count = self.manager.insert_many(batch, skip_duplicates=skip_duplicates)
-                    stats["saved"] += saved_count
-                    stats["skipped"] += len(batch) - saved_count
+                    counts = self.manager.bulk_import(batch, skip_duplicates=skip_duplicates)
+                    stats["saved"] += counts["inserted"]
+                    stats["skipped"] += counts["skipped"]
+                    stats["failed"] += counts["failed"]
                 
                 print(f"✅ 文件处理完成: 总计 {stats['total_records']} 条，已保存 {stats['saved']} 条，跳过 {stats['skipped']} 条")
             
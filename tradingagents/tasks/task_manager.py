@@ -305,16 +305,18 @@ class AnalysisTask(threading.Thread):
             if not analysis_date:
                 analysis_date = datetime.now().strftime('%Y-%m-%d')
 
-            # 执行分析
-            results = run_stock_analysis(
-                stock_symbol=stock_symbol,
-                analysis_date=analysis_date,
-                analysts=analysts,
-                research_depth=research_depth,
-                market_type=market_type,
-                progress_callback=progress_callback,
-                analysis_id=self.task_id
-            )
+            # 执行分析（标记当前任务，预取命中按任务统计）
+            from tradingagents.agents.utils.tool_prefetch import prefetch_task_context
+            with prefetch_task_context(self.task_id):
+                results = run_stock_analysis(
+                    stock_symbol=stock_symbol,
+                    analysis_date=analysis_date,
+                    analysts=analysts,
+                    research_depth=research_depth,
+                    market_type=market_type,
+                    progress_callback=progress_callback,
+                    analysis_id=self.task_id
+                )
             
             # 检查结果
             if results.get('success', False):
@@ -345,11 +347,23 @@ class AnalysisTask(threading.Thread):
                 'error': str(e),
             })
         finally:
+            self._record_prefetch_stats()
             logger.info(f"🏁 [任务结束] 任务线程退出: {self.task_id}")
             # 清理任务控制资源
             from tradingagents.tasks import get_task_manager
             get_task_manager().cleanup_task(self.task_id)
 
+    def _record_prefetch_stats(self):
+        """将数据预取命中情况写入任务记录"""
+        try:
+            from tradingagents.agents.utils.tool_prefetch import get_tool_prefetcher
+            stats = get_tool_prefetcher().finish(self.task_id)
+            if stats["planned"]:
+                self.state_machine.update_state({'prefetch': stats})
+                logger.info(f"⚡ [数据预取] 任务 {self.task_id} 预取命中 {stats['hits']}/{stats['planned']}")
+        except Exception as e:
+            logger.warning(f"⚠️ [数据预取] 记录预取统计失败: {e}")
+
 
 class TaskManager:
     """任务管理器"""
@@ -411,6 +425,13 @@ class TaskManager:
             logger.debug(f"✅ [结果复用配置] 已保存到任务状态: {cache_cfg}")
         except Exception as e:
             logger.warning(f"⚠️ [结果复用配置] 保存到任务状态失败（不影响主流程）: {e}")
+
+        # 按所选分析师并发预取预期的工具数据，与引擎初始化等准备步骤重叠
+        try:
+            from tradingagents.agents.utils.tool_prefetch import get_tool_prefetcher
+            get_tool_prefetcher().start(task_id, params)
+        except Exception as e:
+            logger.warning(f"⚠️ [数据预取] 提交预取失败（不影响主流程）: {e}")
         task.start()
         
         return task_id
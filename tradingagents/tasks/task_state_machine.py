@@ -213,7 +213,7 @@ class TaskStateMachine:
         now_timestamp = time.time()
         self.task_props['updated_at'] = now
         
-        # 1. 处理任务属性更新 (params, progress, status, result, error)
+        # 1. 处理任务属性更新 (params, progress, status, result, error, prefetch)
         old_status = self.task_props.get('status')
         new_status = updates.get('status', old_status)
         
@@ -231,6 +231,9 @@ class TaskStateMachine:
             
         if 'error' in updates:
             self.task_props['error'] = updates['error']
+
+        if 'prefetch' in updates:
+            self.task_props['prefetch'] = updates['prefetch']
             
         # 2. 处理步骤更新
         step_update_needed = False
@@ -444,10 +444,10 @@ def prepare_analysis_steps(
         return False, None, error_msg
     
     try:
-        from tradingagents.graph.trading_graph import TradingAgentsGraph
-        # 初始化分析引擎（TradingAgentsGraph）
-        graph = TradingAgentsGraph(analysts, config=config, debug=False)
-        _update_step_success("✅ 分析引擎初始化完成")
+        from tradingagents.graph.graph_pool import get_graph_pool
+        # 初始化分析引擎（TradingAgentsGraph），相同配置优先复用引擎池中已编译的实例
+        graph = get_graph_pool().acquire(analysts, config, debug=False)
+        _update_step_success(f"✅ 分析引擎初始化完成（耗时 {graph.init_seconds:.2f}秒）")
     except Exception as e:
         _update_step_error(f"⚠️ 分析引擎初始化失败：{str(e)}")
         raise
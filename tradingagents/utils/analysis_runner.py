@@ -306,6 +306,11 @@ def run_stock_analysis(stock_symbol, analysis_date, analysts, research_depth, ma
             'session_id': error_session_id if analysis_id else None
         }
 
+    finally:
+        # 归还分析引擎，供后续相同配置的任务复用
+        from tradingagents.graph.graph_pool import get_graph_pool
+        get_graph_pool().release(graph)
+
 def format_analysis_results(results):
     """格式化分析结果用于显示"""
     
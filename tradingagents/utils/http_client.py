@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+共享 HTTP 客户端
+新闻与数据提供器共用一个带连接池的 requests.Session，替代各处裸 requests.get：
+
+- 连接复用（keep-alive），避免每次请求重新进行 TCP+TLS 握手
+- 每个主机的连接数上限，超出时排队等待空闲连接
+- 默认连接/读取超时，挂起的接口不会无限期阻塞分析流程
+- 条件请求（ETag / If-Modified-Since），304 时直接返回缓存的响应
+- 按主机统计请求延迟直方图
+
+【使用方式】
+from tradingagents.utils.http_client import get_http_client
+client = get_http_client()
+response = client.get(url, params=params)                  # 使用默认超时
+response = client.get(url, params=params, conditional=True) # 启用条件请求
+
+测试时可直接构造独立实例指向本地桩服务：
+client = PooledHTTPClient(connect_timeout=1, read_timeout=2, max_retries=0)
+
+【配置】
+HTTP_CONNECT_TIMEOUT          连接超时秒数（默认 5）
+HTTP_READ_TIMEOUT             读取超时秒数（默认 30）
+HTTP_POOL_HOSTS               缓存连接池的主机数（默认 16）
+HTTP_POOL_MAX_PER_HOST        每个主机的最大连接数（默认 8）
+HTTP_MAX_RETRIES              连接失败及 502/503/504 的重试次数（默认 2）
+HTTP_CONDITIONAL_CACHE_SIZE   条件请求缓存的响应条数（默认 256）
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from tradingagents.config.env_utils import parse_float_env, parse_int_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+DEFAULT_USER_AGENT = 'TradingAgents-CN/1.0'
+
+# 延迟直方图的桶上界（毫秒），最后一个桶收纳其余请求
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+TimeoutType = Union[float, Tuple[float, float], None]
+
+
+class HostLatencyStats:
+    """单个主机的请求计数与延迟直方图（调用方需持有锁）"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.not_modified = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float):
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        elapsed_ms = seconds * 1000
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram[f"gt_{LATENCY_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "not_modified": self.not_modified,
+            "avg_ms": round(self.total_seconds * 1000 / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "histogram": histogram,
+        }
+
+
+class PooledHTTPClient:
+    """带连接池、默认超时、条件请求与延迟统计的 HTTP 客户端"""
+
+    def __init__(
+        self,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_hosts: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        conditional_cache_size: Optional[int] = None,
+    ):
+        """
+        初始化客户端，未指定的参数从环境变量读取
+
+        Args:
+            connect_timeout: 连接超时秒数
+            read_timeout: 读取超时秒数
+            pool_hosts: 缓存连接池的主机数
+            max_per_host: 每个主机的最大连接数
+            max_retries: 连接失败及 502/503/504 的重试次数
+            conditional_cache_size: 条件请求缓存的响应条数
+        """
+        if connect_timeout is None:
+            connect_timeout = parse_float_env("HTTP_CONNECT_TIMEOUT", 5.0)
+        if read_timeout is None:
+            read_timeout = parse_float_env("HTTP_READ_TIMEOUT", 30.0)
+        if pool_hosts is None:
+            pool_hosts = parse_int_env("HTTP_POOL_HOSTS", 16)
+        if max_per_host is None:
+            max_per_host = parse_int_env("HTTP_POOL_MAX_PER_HOST", 8)
+        if max_retries is None:
+            max_retries = parse_int_env("HTTP_MAX_RETRIES", 2)
+        if conditional_cache_size is None:
+            conditional_cache_size = parse_int_env("HTTP_CONDITIONAL_CACHE_SIZE", 256)
+
+        self.timeout = (max(connect_timeout, 0.1), max(read_timeout, 0.1))
+        self.pool_hosts = max(1, pool_hosts)
+        self.max_per_host = max(1, max_per_host)
+        self.max_retries = max(0, max_retries)
+        self.conditional_cache_size = max(0, conditional_cache_size)
+
+        retry = Retry(
+            total=self.max_retries,
+            read=False,  # 读取超时直接抛出 ReadTimeout，不重发可能已被处理的请求
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        # pool_block=True: 主机连接数达到上限时等待空闲连接，而不是临时新建连接
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_hosts,
+            pool_maxsize=self.max_per_host,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # 条件请求缓存: 完整URL -> 最近一次 200 响应
+        self._conditional_cache: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._host_stats: Dict[str, HostLatencyStats] = {}
+        self._lock = threading.Lock()
+        self._cache_hits = 0
+
+    def _cached_response(self, cache_key: str) -> Optional[requests.Response]:
+        with self._lock:
+            response = self._conditional_cache.get(cache_key)
+            if response is not None:
+                self._conditional_cache.move_to_end(cache_key)
+            return response
+
+    def _store_response(self, cache_key: str, response: requests.Response):
+        """缓存带 ETag 或 Last-Modified 的成功响应"""
+        if self.conditional_cache_size <= 0 or response.status_code != 200:
+            return
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return
+        # 读取响应体，保证缓存的响应可以被重复读取
+        response.content
+        with self._lock:
+            self._conditional_cache[cache_key] = response
+            self._conditional_cache.move_to_end(cache_key)
+            while len(self._conditional_cache) > self.conditional_cache_size:
+                self._conditional_cache.popitem(last=False)
+
+    def _stats_for(self, host: str) -> HostLatencyStats:
+        """获取主机统计对象（调用方需持有锁）"""
+        stats = self._host_stats.get(host)
+        if stats is None:
+            stats = self._host_stats[host] = HostLatencyStats()
+        return stats
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: TimeoutType = None,
+        conditional: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        发送请求
+
+        Args:
+            method: HTTP 方法
+            url: 请求地址
+            params: 查询参数
+            headers: 额外请求头
+            timeout: 超时秒数或 (连接, 读取) 元组，None 时使用默认超时
+            conditional: 是否启用条件请求，仅对 GET 生效
+            **kwargs: 透传给 requests.Session.request 的其他参数
+
+        Returns:
+            requests.Response；条件请求命中 304 时返回缓存的 200 响应，
+            其 from_cache 属性为 True
+
+        Raises:
+            requests.RequestException: 连接失败、超时等网络错误
+        """
+        method = method.upper()
+        request_headers = dict(headers or {})
+        conditional = conditional and method == 'GET'
+
+        cache_key = None
+        cached = None
+        if conditional:
+            cache_key = requests.Request(method, url, params=params).prepare().url
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                if cached.headers.get('ETag'):
+                    request_headers['If-None-Match'] = cached.headers['ETag']
+                if cached.headers.get('Last-Modified'):
+                    request_headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                url,
+                params=params,
+                headers=request_headers,
+                timeout=timeout if timeout is not None else self.timeout,
+                **kwargs,
+            )
+        except requests.Timeout:
+            with self._lock:
+                stats = self._stats_for(host)
+                stats.record(time.perf_counter() - start)
+                stats.errors += 1
+                stats.timeouts += 1
+            raise
+        except requests.RequestException:
+            with self._lock:
+                stats = self._stats_for(host)
+                stats.record(time.perf_counter() - start)
+                stats.errors += 1
+            raise
+
+        elapsed = time.perf_counter() - start
+        not_modified = cached is not None and response.status_code == 304
+        with self._lock:
+            stats = self._stats_for(host)
+            stats.record(elapsed)
+            if not_modified:
+                stats.not_modified += 1
+                self._cache_hits += 1
+            elif response.status_code >= 400:
+                stats.errors += 1
+
+        if not_modified:
+            response.close()
+            logger.debug(f"🌐 [HTTP] {host} 内容未变化，使用缓存响应")
+            # 返回副本，避免调用方修改共享的缓存响应
+            result = copy.copy(cached)
+            result.from_cache = True
+            return result
+
+        response.from_cache = False
+        if conditional:
+            self._store_response(cache_key, response)
+        return response
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """发送 GET 请求，参数同 request"""
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """发送 POST 请求，参数同 request"""
+        return self.request('POST', url, **kwargs)
+
+    def clear_cache(self):
+        """清空条件请求缓存"""
+        with self._lock:
+            self._conditional_cache.clear()
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取客户端配置与按主机的延迟统计"""
+        with self._lock:
+            hosts = {host: stats.to_dict() for host, stats in self._host_stats.items()}
+            cached_responses = len(self._conditional_cache)
+            cache_hits = self._cache_hits
+        return {
+            "connect_timeout": self.timeout[0],
+            "read_timeout": self.timeout[1],
+            "max_per_host": self.max_per_host,
+            "cached_responses": cached_responses,
+            "conditional_hits": cache_hits,
+            "hosts": hosts,
+        }
+
+
+http_client: Optional[PooledHTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """获取全局共享的 HTTP 客户端（懒加载单例）"""
+    global http_client
+    if http_client is None:
+        with _http_client_lock:
+            if http_client is None:
+                http_client = PooledHTTPClient()
+    return http_client
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """获取全局 HTTP 客户端统计，未初始化时返回空统计"""
+    if http_client is None:
+        return {"hosts": {}}
+    return http_client.get_stats()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+令牌桶限流器
+以固定速率补充令牌、允许一定突发量，替代各处固定 time.sleep 的限流方式
+
+进程内按数据源共享限流器：同一数据源的所有提供器实例、所有并发分析
+共用一个令牌桶，限流才能真正生效。
+
+【使用方式】
+from tradingagents.utils.rate_limiter import TokenBucket, rate_limit, rate_limit_async
+bucket = TokenBucket(rate=0.5, capacity=2)   # 平均每2秒1次，允许突发2次
+bucket.acquire()                             # 令牌不足时阻塞等待
+
+rate_limit("tushare")                        # 按数据源共享的令牌桶（同步）
+await rate_limit_async("finnhub")            # 异步等待，不阻塞事件循环
+
+【配置】
+各数据源默认速率见 DEFAULT_SOURCE_LIMITS，可通过环境变量覆盖：
+RATE_LIMIT_<SOURCE>_RATE   令牌补充速率（次/秒）
+RATE_LIMIT_<SOURCE>_BURST  允许的突发请求数
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_float_env
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 令牌补充速率（个/秒），必须大于0
+            capacity: 桶容量，即允许的最大突发请求数
+        """
+        if rate <= 0:
+            raise ValueError("rate 必须大于0")
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 等待时间统计
+        self._acquire_count = 0
+        self._waited_count = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeout_count = 0
+
+    def _refill(self, now: float):
+        """按流逝时间补充令牌（调用方需持有锁）"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        预留令牌并返回需要等待的秒数
+
+        令牌允许透支：先到的调用方先预留，后到的调用方等待时间顺延，
+        从而在多线程竞争时按到达顺序公平排队。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self._record_wait(wait)
+            return wait
+
+    def _record_wait(self, wait: float):
+        """记录一次获取的等待时间（调用方需持有锁）"""
+        self._acquire_count += 1
+        if wait > 0:
+            self._waited_count += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+    def _check_timeout(self, tokens: float, timeout: Optional[float]):
+        """预计等待时间超过 timeout 时抛出 TimeoutError"""
+        if timeout is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if wait > timeout:
+                self._timeout_count += 1
+                raise TimeoutError(f"等待令牌需要 {wait:.2f}s，超过超时时间 {timeout:.2f}s")
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        非阻塞获取令牌
+
+        Returns:
+            令牌充足时返回 True，否则返回 False（不消耗令牌）
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._record_wait(0.0)
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        阻塞获取令牌
+
+        Args:
+            tokens: 需要的令牌数
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            实际等待的秒数
+
+        Raises:
+            TimeoutError: 预计等待时间超过 timeout
+        """
+        self._check_timeout(tokens, timeout)
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        异步获取令牌，等待期间让出事件循环
+
+        参数、返回值与异常同 acquire
+        """
+        self._check_timeout(tokens, timeout)
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    @property
+    def available_tokens(self) -> float:
+        """当前可用令牌数（透支时为负数）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取限流配置与等待时间统计"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'available_tokens': round(self._tokens, 3),
+                'acquire_count': self._acquire_count,
+                'waited_count': self._waited_count,
+                'timeout_count': self._timeout_count,
+                'total_wait_seconds': round(self._total_wait, 3),
+                'avg_wait_seconds': round(self._total_wait / self._acquire_count, 3) if self._acquire_count else 0.0,
+                'max_wait_seconds': round(self._max_wait, 3),
+            }
+
+
+# 各数据源默认限流配置：(速率 次/秒, 突发数)
+DEFAULT_SOURCE_LIMITS: Dict[str, Tuple[float, float]] = {
+    'tushare': (2.0, 5),       # 原 0.5s 最小间隔
+    'akshare': (2.0, 4),
+    'baostock': (5.0, 10),
+    'finnhub': (1.0, 5),       # 免费版 60 次/分钟
+    'yfinance': (1.0, 2),      # 原 1s 最小间隔，频繁请求易触发 429
+    'yfinance_hk': (0.5, 1),   # 原港股 2s 最小间隔
+}
+_FALLBACK_LIMIT: Tuple[float, float] = (1.0, 2)
+
+
+class RateLimiterRegistry:
+    """按数据源共享令牌桶的注册表（进程内单例使用）"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve_limit(source: str, rate: Optional[float], capacity: Optional[float]) -> Tuple[float, float]:
+        """默认配置 < 调用方指定 < 环境变量"""
+        default_rate, default_capacity = DEFAULT_SOURCE_LIMITS.get(source, _FALLBACK_LIMIT)
+        if rate is not None:
+            default_rate = rate
+        if capacity is not None:
+            default_capacity = capacity
+        prefix = f"RATE_LIMIT_{source.upper()}"
+        return (parse_float_env(f"{prefix}_RATE", default_rate),
+                parse_float_env(f"{prefix}_BURST", default_capacity))
+
+    def get(self, source: str, rate: Optional[float] = None, capacity: Optional[float] = None) -> TokenBucket:
+        """
+        获取数据源的共享令牌桶，不存在时创建
+
+        Args:
+            source: 数据源名称（不区分大小写）
+            rate: 首次创建时使用的速率，覆盖默认配置
+            capacity: 首次创建时使用的突发数，覆盖默认配置
+        """
+        source = source.lower()
+        bucket = self._buckets.get(source)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(source)
+            if bucket is None:
+                bucket = TokenBucket(*self._resolve_limit(source, rate, capacity))
+                self._buckets[source] = bucket
+            return bucket
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取所有已创建令牌桶的统计"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {source: bucket.get_stats() for source, bucket in buckets.items()}
+
+
+rate_limiter_registry = RateLimiterRegistry()
+
+
+def get_rate_limiter(source: str, rate: Optional[float] = None, capacity: Optional[float] = None) -> TokenBucket:
+    """获取数据源的共享令牌桶"""
+    return rate_limiter_registry.get(source, rate, capacity)
+
+
+def rate_limit(source: str, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+    """按数据源阻塞限流，返回实际等待秒数"""
+    return rate_limiter_registry.get(source).acquire(tokens, timeout)
+
+
+async def rate_limit_async(source: str, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+    """按数据源异步限流，返回实际等待秒数"""
+    return await rate_limiter_registry.get(source).acquire_async(tokens, timeout)
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """获取各数据源限流等待统计"""
+    return rate_limiter_registry.get_stats()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+相同请求合并（single-flight）
+批量分析时多个任务并发分析重叠的股票、指数和行业数据，各线程在同一时刻缓存
+未命中，随后各自向 Tushare / AKShare 发出完全相同的请求，浪费配额并触发限流。
+
+本模块按 (数据源, 接口, 规范化参数) 合并进行中的相同请求：
+
+- 第一个调用方执行请求，其余并发调用方等待并共享同一结果
+- 请求抛出的异常同样传递给所有等待方
+- 只合并进行中的请求，不缓存结果；结果缓存仍由各数据源自身负责
+- 按数据源、接口统计合并次数
+
+【使用方式】
+from tradingagents.utils.single_flight import single_flight, get_single_flight
+
+class TushareProvider:
+    @single_flight("tushare", "index_daily")
+    def get_index_daily(self, symbol, start_date=None, end_date=None): ...
+
+result = get_single_flight().do(("akshare", "spot", ()), fetch_spot)
+
+【配置】
+SINGLE_FLIGHT_ENABLED   是否启用请求合并（默认 true）
+"""
+
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from tradingagents.config.env_utils import parse_bool_env
+from tradingagents.utils.logging_manager import get_logger
+
+logger = get_logger('agents')
+
+
+def _normalize_value(value: Any) -> Hashable:
+    """规范化参数值：字符串去空白，容器递归处理，其余取字符串表示"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize_value(v)) for k, v in value.items()))
+    return str(value)
+
+
+def make_flight_key(source: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """生成 (数据源, 接口, 规范化参数) 合并键"""
+    normalized = tuple(sorted((name, _normalize_value(value)) for name, value in (params or {}).items()))
+    return source, endpoint, normalized
+
+
+def _copy_result(result: Any) -> Any:
+    """等待方拿到结果副本（DataFrame / dict / list），避免调用方相互修改共享对象"""
+    copy_method = getattr(result, 'copy', None)
+    if callable(copy_method) and not isinstance(result, (str, bytes)):
+        try:
+            return copy_method()
+        except Exception:
+            return result
+    return result
+
+
+class _Call:
+    """一个进行中的请求"""
+
+    __slots__ = ('event', 'result', 'error', 'waiters', 'owner')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.owner = threading.get_ident()
+
+
+class SingleFlight:
+    """合并进行中的相同请求"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = parse_bool_env("SINGLE_FLIGHT_ENABLED", True)
+        self.enabled = enabled
+        self._calls: Dict[Tuple, _Call] = {}
+        self._lock = threading.Lock()
+        # (数据源, 接口) -> {"executed": 执行次数, "coalesced": 被合并的调用数, "errors": 失败次数}
+        self._stats: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def _count(self, key: Tuple, field: str):
+        """累加统计（调用方需持有锁）"""
+        stats = self._stats.setdefault((key[0], key[1]), {"executed": 0, "coalesced": 0, "errors": 0})
+        stats[field] += 1
+
+    def do(self, key: Tuple, fn: Callable[[], Any]) -> Any:
+        """
+        执行请求；相同 key 的请求正在进行时等待其结果
+
+        Args:
+            key: make_flight_key 生成的合并键
+            fn: 实际发起请求的无参函数
+
+        Returns:
+            请求结果（等待方得到结果副本）
+
+        Raises:
+            请求抛出的异常，所有等待方都会收到
+        """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.owner == threading.get_ident():
+                # 同一线程内的重入调用（如降级逻辑再次请求相同数据）直接执行，避免自我等待
+                leader = None
+            elif call is not None:
+                call.waiters += 1
+                self._count(key, "coalesced")
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._count(key, "executed")
+                leader = True
+
+        if leader is None:
+            return fn()
+
+        if not leader:
+            logger.debug(f"🔗 [请求合并] {key[0]}.{key[1]} 等待进行中的相同请求")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy_result(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._count(key, "errors")
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+        # 移出进行中列表后等待方数量不再变化；有等待方时发起方同样拿副本，原对象只供复制
+        if call.waiters:
+            logger.info(f"🔗 [请求合并] {key[0]}.{key[1]} 合并了 {call.waiters} 个相同请求")
+            return _copy_result(call.result)
+        return call.result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取按 数据源.接口 的执行与合并统计"""
+        with self._lock:
+            endpoints = {f"{source}.{endpoint}": dict(stats) for (source, endpoint), stats in self._stats.items()}
+            in_flight = len(self._calls)
+        return {
+            "enabled": self.enabled,
+            "in_flight": in_flight,
+            "executed": sum(stats["executed"] for stats in endpoints.values()),
+            "coalesced": sum(stats["coalesced"] for stats in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+
+single_flight_group: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """获取全局请求合并器（懒加载单例）"""
+    global single_flight_group
+    if single_flight_group is None:
+        with _single_flight_lock:
+            if single_flight_group is None:
+                single_flight_group = SingleFlight()
+    return single_flight_group
+
+
+def single_flight(source: str, endpoint: Optional[str] = None):
+    """
+    装饰器：按 (数据源, 接口, 规范化参数) 合并进行中的相同调用
+
+    参数按函数签名绑定并补齐默认值，位置参数与关键字参数的不同写法视为同一请求；
+    方法的 self / cls 不参与合并键，同一数据源的不同实例共享合并。
+
+    Args:
+        source: 数据源名称，如 "tushare"、"akshare"
+        endpoint: 接口名称，默认使用函数名
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = endpoint or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return func(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k not in ('self', 'cls')}
+            key = make_flight_key(source, name, params)
+            return get_single_flight().do(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    """获取全局请求合并统计，未初始化时返回空统计"""
+    if single_flight_group is None:
+        return {"executed": 0, "coalesced": 0, "endpoints": {}}
+    return single_flight_group.get_stats()